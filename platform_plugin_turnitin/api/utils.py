@@ -60,6 +60,20 @@ def api_error(error: str, status_code: int) -> Response:
     return Response(data={"error": error}, status=status_code)
 
 
+def file_error(turnitin_submission_id: str, error: Exception) -> dict:
+    """
+    Build the result of a file whose call to Turnitin failed.
+
+    Args:
+        turnitin_submission_id (str): The unique identifier for the submission in Turnitin.
+        error (Exception): The error of the call.
+
+    Returns:
+        dict: The Turnitin submission ID and the error.
+    """
+    return {"id": turnitin_submission_id, "error": str(error)}
+
+
 def validate_request(
     request, course_id: str, only_course: bool = False
 ) -> Optional[Response]:
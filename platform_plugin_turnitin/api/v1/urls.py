@@ -32,4 +32,14 @@ urlpatterns = [
         views.TurnitinViewerAPIView.as_view(),
         name="viewer-url",
     ),
+    path(
+        "submissions/",
+        views.TurnitinCourseSubmissionsAPIView.as_view(),
+        name="course-submissions",
+    ),
+    path(
+        "webhook/",
+        views.TurnitinWebhookAPIView.as_view(),
+        name="webhook",
+    ),
 ]
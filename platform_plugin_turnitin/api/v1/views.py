@@ -2,21 +2,52 @@
 
 from __future__ import annotations
 
+import math
 from logging import getLogger
 
 from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
 from django.db.models.query import QuerySet
 from edx_rest_framework_extensions.auth.session.authentication import SessionAuthenticationAllowInactiveUser
+from kombu.exceptions import OperationalError
+from opaque_keys.edx.keys import CourseKey
 from requests import Response as RequestsResponse
 from rest_framework import permissions, status
 from rest_framework.generics import GenericAPIView
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from platform_plugin_turnitin.api.utils import api_error, get_fullname, validate_request
+from platform_plugin_turnitin.api.utils import (
+    api_error,
+    api_field_errors,
+    file_error,
+    get_fullname,
+    validate_request,
+)
+from platform_plugin_turnitin.constants import (
+    EULA_CACHE_KEY,
+    EULA_VERSION,
+    SIMILARITY_REPORT_INFO,
+    STORED_INFO_REFRESH_KEY,
+    SUBMISSION_INFO,
+    WEBHOOK_EVENT_TYPE_HEADER,
+    WEBHOOK_SIGNATURE_HEADER,
+)
 from platform_plugin_turnitin.edxapp_wrapper import BearerAuthenticationAllowInactiveUser
-from platform_plugin_turnitin.models import TurnitinSubmission
+from platform_plugin_turnitin.models import TurnitinEulaAcceptance, TurnitinSubmission
+from platform_plugin_turnitin.pipeline import (
+    forget_similarity_report_info,
+    get_stored_info_ttl,
+    is_stored_info_fresh,
+    update_similarity_report_info,
+    update_submission_status,
+)
+from platform_plugin_turnitin.turnitin_client.concurrency import fan_out
+from platform_plugin_turnitin.turnitin_client.exceptions import TurnitinCircuitOpen, TurnitinRateLimited
 from platform_plugin_turnitin.turnitin_client.handlers import (
+    get_eula_acceptance_by_user,
     get_similarity_report_info,
     get_submission_info,
     post_accept_eula_version,
@@ -25,12 +56,40 @@ from platform_plugin_turnitin.turnitin_client.handlers import (
     put_generate_similarity_report,
     put_upload_submission_file_content,
 )
-from platform_plugin_turnitin.utils import get_current_datetime
+from platform_plugin_turnitin.utils import get_course_id, get_current_datetime
+from platform_plugin_turnitin.webhooks import (
+    process_webhook_event,
+    verify_webhook_signature,
+)
 
 log = getLogger(__name__)
 
 
-class TurnitinUploadFileAPIView(GenericAPIView):
+class TurnitinErrorsMixin:
+    """
+    Mixin translating the errors of the Turnitin client into API responses.
+    """
+
+    def handle_exception(self, exc: Exception) -> Response:
+        """
+        Return a response with a `Retry-After` header when a call was deferred.
+
+        A rate limited call returns a 429 and a call failing fast because Turnitin
+        is unavailable returns a 503.
+        """
+        if isinstance(exc, (TurnitinRateLimited, TurnitinCircuitOpen)):
+            status_code = (
+                status.HTTP_429_TOO_MANY_REQUESTS
+                if isinstance(exc, TurnitinRateLimited)
+                else status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+            response = api_error(str(exc), status_code)
+            response["Retry-After"] = str(math.ceil(exc.retry_after))
+            return response
+        return super().handle_exception(exc)
+
+
+class TurnitinUploadFileAPIView(TurnitinErrorsMixin, GenericAPIView):
     """
     API views providing functionality to upload files for plagiarism checking.
 
@@ -50,6 +109,10 @@ class TurnitinUploadFileAPIView(GenericAPIView):
 
             * 404: The course is not found.
 
+            * 429: The Turnitin rate limit was reached, retry after the `Retry-After` seconds.
+
+            * 503: Turnitin is unavailable, retry after the `Retry-After` seconds.
+
             * 200: The file was successfully uploaded to Turnitin.
     """
 
@@ -69,15 +132,17 @@ class TurnitinUploadFileAPIView(GenericAPIView):
             return response
 
         turnitin_client = TurnitinClient(request.user, request.FILES.get("file"))
-        agreement_response = turnitin_client.accept_eula_agreement()
 
-        if not agreement_response.ok:
-            return api_error(agreement_response.json(), agreement_response.status_code)
+        if not turnitin_client.is_eula_accepted():
+            agreement_response = turnitin_client.accept_eula_agreement()
+
+            if not agreement_response.ok:
+                return api_error(agreement_response.json(), agreement_response.status_code)
 
         return turnitin_client.upload_turnitin_submission_file(ora_submission_id)
 
 
-class TurnitinSubmissionAPIView(GenericAPIView):
+class TurnitinSubmissionAPIView(TurnitinErrorsMixin, GenericAPIView):
     """
     API views providing functionality to retrieve information related to a Turnitin submission.
 
@@ -102,6 +167,10 @@ class TurnitinSubmissionAPIView(GenericAPIView):
                 * The course is not found.
                 * The ORA submission is not found.
 
+            * 429: The Turnitin rate limit was reached, retry after the `Retry-After` seconds.
+
+            * 503: Turnitin is unavailable, retry after the `Retry-After` seconds.
+
             * 200: The submission information was successfully retrieved.
 
                 The response will contain a list with the following information:
@@ -135,7 +204,7 @@ class TurnitinSubmissionAPIView(GenericAPIView):
         return turnitin_client.get_submission_status(ora_submission_id)
 
 
-class TurnitinSimilarityReportAPIView(GenericAPIView):
+class TurnitinSimilarityReportAPIView(TurnitinErrorsMixin, GenericAPIView):
     """
     API views providing functionality to generate a similarity report for a Turnitin submission.
 
@@ -167,6 +236,10 @@ class TurnitinSimilarityReportAPIView(GenericAPIView):
                 * The course is not found.
                 * The ORA submission is not found.
 
+            * 429: The Turnitin rate limit was reached, retry after the `Retry-After` seconds.
+
+            * 503: Turnitin is unavailable, retry after the `Retry-After` seconds.
+
             * 200: The similarity report information was successfully retrieved.
 
                 The response will contain a list with the following information:
@@ -185,6 +258,10 @@ class TurnitinSimilarityReportAPIView(GenericAPIView):
                 * The course is not found.
                 * The ORA submission is not found.
 
+            * 429: The Turnitin rate limit was reached, retry after the `Retry-After` seconds.
+
+            * 503: Turnitin is unavailable, retry after the `Retry-After` seconds.
+
             * 200: The similarity report was successfully generated.
 
                 The response will contain a list with the following information:
@@ -219,7 +296,7 @@ class TurnitinSimilarityReportAPIView(GenericAPIView):
         return turnitin_client.generate_similarity_report(ora_submission_id)
 
 
-class TurnitinViewerAPIView(GenericAPIView):
+class TurnitinViewerAPIView(TurnitinErrorsMixin, GenericAPIView):
     """
     API views providing functionality to create a Turnitin similarity viewer.
 
@@ -244,6 +321,10 @@ class TurnitinViewerAPIView(GenericAPIView):
                 * The course is not found.
                 * The ORA submission is not found.
 
+            * 429: The Turnitin rate limit was reached, retry after the `Retry-After` seconds.
+
+            * 503: Turnitin is unavailable, retry after the `Retry-After` seconds.
+
             * 200: The similarity viewer was successfully created.
 
                 The response will contain a list with the following information:
@@ -269,6 +350,184 @@ class TurnitinViewerAPIView(GenericAPIView):
         return turnitin_client.create_similarity_viewer(ora_submission_id)
 
 
+class TurnitinCourseSubmissionsPagination(PageNumberPagination):
+    """
+    Pagination of the ORA submissions of a course.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class TurnitinCourseSubmissionsAPIView(GenericAPIView):
+    """
+    API views providing the Turnitin status of all the ORA submissions of a course.
+
+    `Example Requests`:
+
+        * GET platform-plugin-turnitin/{course_id}/api/v1/submissions/
+
+            * Path Parameters:
+
+                * course_id (str): The unique identifier for the course (required).
+
+            * Query Parameters:
+
+                * ora_block_id (str): The usage key of an ORA block of the course.
+                * page (int): The page number.
+                * page_size (int): The number of ORA submissions per page.
+
+    `Example Response`:
+
+        * GET platform-plugin-turnitin/{course_id}/api/v1/submissions/
+
+            * 400:
+                * The supplied course_id key is not valid.
+                * The supplied ora_block_id key is not valid or not in the course.
+
+            * 403: The user does not have permission to access the submissions.
+
+            * 404:
+                * The course is not found.
+                * The page is not found.
+
+            * 200: The paginated ORA submissions, newest first.
+
+                Each result contains the following information:
+
+                * ora_submission_id (str): The ORA submission ID.
+                * ora_block_id (str): The usage key of the ORA block.
+                * username (str): The username of the learner.
+                * submitted_at (str): When the last file was sent to Turnitin.
+                * files (list): The file_name, status and similarity_score of
+                  each Turnitin submission.
+    """
+
+    authentication_classes = (
+        BearerAuthenticationAllowInactiveUser,
+        SessionAuthenticationAllowInactiveUser,
+    )
+    permission_classes = (permissions.IsAuthenticated,)
+    pagination_class = TurnitinCourseSubmissionsPagination
+
+    def get(self, request: Request, course_id: str) -> Response:
+        """
+        Return a page of the ORA submissions of the course from the database.
+
+        The page takes three queries whatever its size: the count, the ORA
+        submission IDs of the page and their Turnitin submissions.
+        """
+        if response := validate_request(request, course_id):
+            return response
+
+        course_id = str(CourseKey.from_string(course_id))
+        ora_block_id = request.query_params.get("ora_block_id")
+        submissions = TurnitinSubmission.objects.filter(course_id=course_id)
+
+        if ora_block_id:
+            if get_course_id(ora_block_id) != course_id:
+                return api_field_errors(
+                    {"ora_block_id": f"The supplied {ora_block_id=} is not valid."},
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                )
+            submissions = submissions.filter(ora_block_id=ora_block_id)
+
+        ora_submissions = self.paginate_queryset(
+            submissions.exclude(ora_submission_id__isnull=True)
+            .values("ora_submission_id")
+            .annotate(submitted_at=Max("created_at"))
+            .order_by("-submitted_at", "ora_submission_id")
+        )
+
+        files = {}
+        for submission in (
+            TurnitinSubmission.objects.filter(
+                ora_submission_id__in=[
+                    ora_submission["ora_submission_id"]
+                    for ora_submission in ora_submissions
+                ]
+            )
+            .select_related("user")
+            .order_by("created_at")
+        ):
+            files.setdefault(submission.ora_submission_id, []).append(submission)
+
+        results = []
+        for ora_submission in ora_submissions:
+            ora_submission_files = files[ora_submission["ora_submission_id"]]
+            results.append(
+                {
+                    "ora_submission_id": ora_submission["ora_submission_id"],
+                    "ora_block_id": ora_submission_files[0].ora_block_id,
+                    "username": ora_submission_files[0].user.username,
+                    "submitted_at": ora_submission["submitted_at"],
+                    "files": [
+                        {
+                            "file_name": submission.file_name,
+                            "status": submission.status,
+                            "similarity_score": submission.similarity_score,
+                        }
+                        for submission in ora_submission_files
+                    ],
+                }
+            )
+
+        return self.get_paginated_response(results)
+
+
+class TurnitinWebhookAPIView(GenericAPIView):
+    """
+    API view receiving the webhook callbacks sent by Turnitin.
+
+    `Example Requests`:
+
+        * POST platform-plugin-turnitin/{course_id}/api/v1/webhook/
+
+            * Path Parameters:
+                * course_id (str): Any course identifier, it is not used (required by the plugin URLs).
+
+            * Headers:
+                * X-Turnitin-Signature (str): HMAC-SHA256 hex digest of the body (required).
+                * X-Turnitin-EventType (str): The type of the event, e.g. SUBMISSION_COMPLETE (required).
+
+    `Example Response`:
+
+        * POST platform-plugin-turnitin/{course_id}/api/v1/webhook/
+
+            * 403: The signature of the request is not valid.
+
+            * 202: The event was accepted and will be processed.
+
+            * 200: The task queue is unavailable and the event was processed in the request.
+    """
+
+    authentication_classes = ()
+    permission_classes = (permissions.AllowAny,)
+
+    def post(self, request: Request, **kwargs) -> Response:
+        """
+        Handle a webhook callback sent by Turnitin.
+        """
+        # Imported here to avoid a circular import, as the tasks use the TurnitinClient.
+        from platform_plugin_turnitin.tasks import (  # pylint: disable=import-outside-toplevel
+            process_webhook_event_task,
+        )
+
+        if not verify_webhook_signature(request.body, request.META.get(WEBHOOK_SIGNATURE_HEADER)):
+            return api_error("The signature of the request is not valid.", status.HTTP_403_FORBIDDEN)
+
+        event_type = request.META.get(WEBHOOK_EVENT_TYPE_HEADER)
+        try:
+            process_webhook_event_task.delay(event_type, request.data)
+        except OperationalError:
+            log.exception(f"Failed to queue the Turnitin webhook event [{event_type}].")
+            process_webhook_event(event_type, request.data)
+            return Response(status=status.HTTP_200_OK)
+
+        return Response(status=status.HTTP_202_ACCEPTED)
+
+
 class TurnitinClient:
     """
     A client class for interacting with Turnitin API.
@@ -276,14 +535,18 @@ class TurnitinClient:
     Args:
         user: The user object representing the current user.
         file: The file to be uploaded to Turnitin (optional).
+        file_name: The name of the file, defaults to the name of the file object (optional).
 
     Attributes:
         user: The user object representing the current user.
         file: The file to be uploaded to Turnitin.
+        file_name: The name of the file uploaded to Turnitin.
         first_name: The first name of the user extracted from the user profile.
         last_name: The last name of the user extracted from the user profile.
 
     Methods:
+        is_eula_accepted():
+            Check if the current user has already accepted the End-User License Agreement (EULA).
         accept_eula_agreement():
             Submit acceptance of the End-User License Agreement (EULA) for the current user.
         upload_turnitin_submission_file(ora_submission_id: str):
@@ -300,11 +563,37 @@ class TurnitinClient:
             Create a Turnitin similarity viewer for the user's latest submission.
     """
 
-    def __init__(self, user, file=None) -> None:
+    def __init__(self, user, file=None, file_name: str | None = None) -> None:
         self.user = user
         self.file = file
+        self.file_name = file_name or getattr(file, "name", None)
         self.first_name, self.last_name = get_fullname(self.user.profile.name)
 
+    def is_eula_accepted(self) -> bool:
+        """
+        Check if the current user has already accepted the EULA.
+
+        The acceptance is looked up in the shared cache first, then in the database,
+        and only on a miss in Turnitin. Acceptances found in Turnitin are stored locally.
+
+        Returns:
+            bool: True if the user has accepted the current EULA version, False otherwise.
+        """
+        cache_key = EULA_CACHE_KEY.format(version=EULA_VERSION, user_id=self.user.id)
+        if cache.get(cache_key):
+            return True
+
+        if TurnitinEulaAcceptance.objects.filter(user=self.user, eula_version=EULA_VERSION).exists():
+            cache.set(cache_key, True, getattr(settings, "TURNITIN_EULA_CACHE_TIMEOUT", 86400))
+            return True
+
+        response = get_eula_acceptance_by_user(self.user.id)
+        if response.ok and any(acceptance.get("version") == EULA_VERSION for acceptance in response.json()):
+            self.remember_eula_acceptance()
+            return True
+
+        return False
+
     def accept_eula_agreement(self) -> RequestsResponse:
         """
         Submit acceptance of the EULA for the current user.
@@ -317,37 +606,72 @@ class TurnitinClient:
             "accepted_timestamp": get_current_datetime(),
             "language": "en-US",
         }
-        return post_accept_eula_version(payload)
+        response = post_accept_eula_version(payload)
+        if response.ok:
+            self.remember_eula_acceptance()
+        return response
 
-    def upload_turnitin_submission_file(self, ora_submission_id: str) -> Response:
+    def remember_eula_acceptance(self) -> None:
+        """
+        Store the acceptance of the current EULA version in the database and the shared cache.
+        """
+        TurnitinEulaAcceptance.objects.get_or_create(user=self.user, eula_version=EULA_VERSION)
+        cache.set(
+            EULA_CACHE_KEY.format(version=EULA_VERSION, user_id=self.user.id),
+            True,
+            getattr(settings, "TURNITIN_EULA_CACHE_TIMEOUT", 86400),
+        )
+
+    def upload_turnitin_submission_file(
+        self,
+        ora_submission_id: str,
+        ora_block_id: str | None = None,
+        content_hash: str | None = None,
+        submission: TurnitinSubmission | None = None,
+    ) -> Response:
         """
         Handle the upload of the user's file to Turnitin.
 
         Args:
             ora_submission_id (str): The unique identifier for the submission in
                 the Open Response Assessment (ORA) system.
+            ora_block_id (str, optional): The usage key of the ORA block.
+            content_hash (str, optional): The SHA-256 hex digest of the file content.
+            submission (TurnitinSubmission, optional): An already claimed row to
+                fill in instead of creating a new one. If it already has a Turnitin
+                submission, only the file content is uploaded again.
 
         Returns:
             Response: The response after uploading the file to Turnitin.
         """
-        turnitin_submission = self.create_turnitin_submission_object()
+        if submission is not None and submission.turnitin_submission_id:
+            turnitin_submission_id = submission.turnitin_submission_id
+        else:
+            turnitin_submission = self.create_turnitin_submission_object()
+
+            if turnitin_submission.status_code != status.HTTP_201_CREATED:
+                return Response(turnitin_submission.json())
 
-        if turnitin_submission.status_code == status.HTTP_201_CREATED:
             turnitin_submission_id = turnitin_submission.json()["id"]
-            submission = TurnitinSubmission(
-                user=self.user,
-                ora_submission_id=ora_submission_id,
-                turnitin_submission_id=turnitin_submission_id,
-                file_name=self.file.name,
-            )
+            if submission is None:
+                submission = TurnitinSubmission(
+                    user=self.user,
+                    ora_submission_id=ora_submission_id,
+                    turnitin_submission_id=turnitin_submission_id,
+                    file_name=self.file_name,
+                    ora_block_id=ora_block_id,
+                    course_id=get_course_id(ora_block_id),
+                    content_hash=content_hash,
+                )
+            else:
+                submission.turnitin_submission_id = turnitin_submission_id
+                submission.content_hash = content_hash
             submission.save()
-            return Response(
-                put_upload_submission_file_content(
-                    turnitin_submission_id, self.file
-                ).json()
-            )
 
-        return Response(turnitin_submission.json())
+        response = put_upload_submission_file_content(turnitin_submission_id, self.file, self.file_name)
+        if response.ok:
+            submission.set_status(TurnitinSubmission.Status.UPLOADED)
+        return Response(response.json())
 
     def create_turnitin_submission_object(self) -> RequestsResponse:
         """
@@ -358,7 +682,7 @@ class TurnitinClient:
         """
         payload = {
             "owner": self.user.id,
-            "title": f"{self.file.name}-{self.user.username}",
+            "title": f"{self.file_name}-{self.user.username}",
             "submitter": self.user.id,
             "owner_default_permission_set": "LEARNER",
             "submitter_default_permission_set": "INSTRUCTOR",
@@ -398,12 +722,7 @@ class TurnitinClient:
         if isinstance(submissions, Response):
             return submissions
 
-        response_list = []
-        for submission in submissions:
-            response = get_submission_info(submission.turnitin_submission_id)
-            response_list.append(response.json())
-
-        return Response(response_list)
+        return Response(self.read_through_info(submissions, SUBMISSION_INFO))
 
     def generate_similarity_report(self, ora_submission_id: str) -> Response:
         """
@@ -421,13 +740,17 @@ class TurnitinClient:
             return submissions
 
         payload = getattr(settings, "TURNITIN_SIMILARITY_REPORT_PAYLOAD", None)
-        response_list = []
-        for submission in submissions:
-            response = put_generate_similarity_report(
-                submission.turnitin_submission_id, payload
-            )
-            response_list.append(response.json())
-
+        turnitin_submission_ids = [
+            submission.turnitin_submission_id for submission in submissions
+        ]
+        response_list = fan_out(
+            lambda turnitin_submission_id: put_generate_similarity_report(
+                turnitin_submission_id, payload
+            ).json(),
+            turnitin_submission_ids,
+            on_error=file_error,
+        )
+        forget_similarity_report_info(turnitin_submission_ids)
         return Response(response_list)
 
     def get_similarity_report_status(self, ora_submission_id: str) -> Response:
@@ -445,12 +768,7 @@ class TurnitinClient:
         if isinstance(submissions, Response):
             return submissions
 
-        response_list = []
-        for submission in submissions:
-            response = get_similarity_report_info(submission.turnitin_submission_id)
-            response_list.append(response.json())
-
-        return Response(response_list)
+        return Response(self.read_through_info(submissions, SIMILARITY_REPORT_INFO))
 
     def create_similarity_viewer(self, ora_submission_id: str) -> Response:
         """
@@ -487,11 +805,16 @@ class TurnitinClient:
             },
             "sidebar": {"default_mode": "similarity"},
         }
+        submissions = list(submissions)
+        responses = fan_out(
+            lambda turnitin_submission_id: post_create_viewer_launch_url(
+                turnitin_submission_id, payload
+            ).json(),
+            [submission.turnitin_submission_id for submission in submissions],
+            on_error=file_error,
+        )
         response_list = []
-        for submission in submissions:
-            response = post_create_viewer_launch_url(
-                submission.turnitin_submission_id, payload
-            ).json()
+        for submission, response in zip(submissions, responses):
             if "viewer_url" not in response:
                 log.info(
                     f"Failed to create viewer URL for submission [{submission.turnitin_submission_id}]. \
@@ -507,6 +830,86 @@ class TurnitinClient:
 
         return Response(response_list)
 
+    @staticmethod
+    def read_through_info(submissions: QuerySet, kind: str) -> list:
+        """
+        Return the Turnitin information of the submissions, stored when possible.
+
+        Stored information in a terminal state is always served from the database,
+        and any other is served while it is fresh. Stale information is served too,
+        but refreshed in the background. Only the submissions never fetched are
+        queried in Turnitin, concurrently, and their information is stored.
+
+        Args:
+            submissions (QuerySet): The Turnitin submissions.
+            kind (str): SUBMISSION_INFO or SIMILARITY_REPORT_INFO.
+
+        Returns:
+            list: The information of each submission, in order.
+        """
+        from platform_plugin_turnitin.tasks import (  # pylint: disable=import-outside-toplevel
+            refresh_stored_info_task,
+        )
+
+        if kind == SUBMISSION_INFO:
+            fetch, store = get_submission_info, update_submission_status
+        else:
+            fetch, store = get_similarity_report_info, update_similarity_report_info
+
+        def fetch_info(turnitin_submission_id: str) -> tuple:
+            response = fetch(turnitin_submission_id)
+            return response.json(), response.ok
+
+        submissions = list(submissions)
+        missing = list(
+            dict.fromkeys(
+                submission.turnitin_submission_id
+                for submission in submissions
+                if getattr(submission, kind) is None
+            )
+        )
+        fetched = {}
+        results = fan_out(
+            fetch_info,
+            missing,
+            on_error=lambda turnitin_submission_id, error: (
+                file_error(turnitin_submission_id, error),
+                False,
+            ),
+        )
+        for turnitin_submission_id, (info, ok) in zip(missing, results):
+            if ok:
+                store(turnitin_submission_id, info)
+            fetched[turnitin_submission_id] = info
+
+        stale = [
+            submission.turnitin_submission_id
+            for submission in submissions
+            if getattr(submission, kind) is not None
+            and not is_stored_info_fresh(
+                kind,
+                getattr(submission, kind),
+                getattr(submission, f"{kind}_updated_at"),
+            )
+            and cache.add(
+                STORED_INFO_REFRESH_KEY.format(
+                    kind=kind, turnitin_submission_id=submission.turnitin_submission_id
+                ),
+                True,
+                get_stored_info_ttl(kind),
+            )
+        ]
+        if stale:
+            try:
+                refresh_stored_info_task.delay(kind, stale)
+            except OperationalError:
+                log.exception(f"Failed to schedule the refresh of {kind} {stale}.")
+
+        return [
+            fetched.get(submission.turnitin_submission_id, getattr(submission, kind))
+            for submission in submissions
+        ]
+
     @staticmethod
     def get_submissions(ora_submission_id: str) -> QuerySet | Response:
         """
@@ -520,7 +923,7 @@ class TurnitinClient:
             list: The list of Turnitin submissions for the user.
         """
         submissions = TurnitinSubmission.objects.filter(
-            ora_submission_id=ora_submission_id
+            ora_submission_id=ora_submission_id, turnitin_submission_id__isnull=False
         )
         if not submissions:
             return api_error(
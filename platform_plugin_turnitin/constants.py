@@ -1,6 +1,36 @@
 """This module contains constants used in the Turnitin plugin."""
 
 ALLOWED_FILE_EXTENSIONS = ["doc", "docx", "pdf", "txt"]
-MAX_REQUEST_RETRIES = 25
-SECONDS_TO_WAIT_BETWEEN_RETRIES = 5
 REQUEST_TIMEOUT = 5
+UPLOAD_MAX_RETRIES = 3
+IDEMPOTENCY_CLAIM_TIMEOUT = 600
+POLLING_LOCK_KEY = "turnitin:polling:lock"
+POLLING_LOCK_TIMEOUT = 600
+POLLING_BYTES_PER_STEP = 500_000
+POLLING_PAGES_PER_STEP = 10
+POLLING_WORDS_PER_STEP = 5_000
+POLLING_BEAT_SCHEDULE_NAME = "platform-plugin-turnitin-poll-pending-submissions"
+WEBHOOK_EVENT_TYPES = ["SUBMISSION_COMPLETE", "SIMILARITY_COMPLETE"]
+WEBHOOK_SIGNATURE_HEADER = "HTTP_X_TURNITIN_SIGNATURE"
+WEBHOOK_EVENT_TYPE_HEADER = "HTTP_X_TURNITIN_EVENTTYPE"
+EULA_VERSION = "v1beta"
+EULA_CACHE_KEY = "turnitin:eula:{version}:{user_id}"
+RATE_LIMIT_CACHE_KEY = "turnitin:rate_limit:{bucket}:{window}"
+CIRCUIT_BREAKER_CACHE_KEY = "turnitin:circuit_breaker:{family}:{name}"
+CIRCUIT_BREAKER_FAILURE_STATUS_CODES = (500, 502, 503, 504)
+OUTBOX_LOCK_KEY = "turnitin:outbox:lock"
+OUTBOX_LOCK_TIMEOUT = 600
+OUTBOX_BEAT_SCHEDULE_NAME = "platform-plugin-turnitin-drain-outbox"
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+SUBMISSION_INFO = "submission_info"
+SIMILARITY_REPORT_INFO = "similarity_report_info"
+STORED_INFO_TERMINAL_STATUSES = {SUBMISSION_INFO: ("COMPLETE", "ERROR"), SIMILARITY_REPORT_INFO: ("COMPLETE",)}
+STORED_INFO_REFRESH_KEY = "turnitin:refresh:{kind}:{turnitin_submission_id}"
+RESPONSE_CACHE_KEY = "turnitin:response_cache:{endpoint}:{submission_id}:{name}"
+RESPONSE_CACHE_STATS_KEY = "turnitin:response_cache:{endpoint}:stats:{name}"
+RESPONSE_CACHE_GENERATION_TIMEOUT = 86400
+RESPONSE_CACHE_STATS_TIMEOUT = 86400
+VIEWER_URL = "viewer_url"
+VIEWER_URL_CACHE_KEY = "turnitin:viewer_url:{submission_id}:{digest}"
+VIEWER_URL_LOCK_POLL_INTERVAL = 0.05
+VIEWER_URL_LOCK_WAIT = 2.5
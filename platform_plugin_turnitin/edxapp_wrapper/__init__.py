@@ -3,3 +3,4 @@
 from platform_plugin_turnitin.edxapp_wrapper.authentication import BearerAuthenticationAllowInactiveUser
 from platform_plugin_turnitin.edxapp_wrapper.course_overviews import get_course_overview_or_none
 from platform_plugin_turnitin.edxapp_wrapper.student import CourseInstructorRole, CourseStaffRole, user_by_anonymous_id
+from platform_plugin_turnitin.edxapp_wrapper.submissions import get_submission_and_student
@@ -0,0 +1,5 @@
+"""
+Submissions definitions for Open edX Quince release.
+"""
+
+from submissions.api import get_submission_and_student  # noqa pylint: disable=import-error, unused-import
@@ -0,0 +1,5 @@
+"""
+Submissions test definitions for Open edX Quince release.
+"""
+
+get_submission_and_student = object
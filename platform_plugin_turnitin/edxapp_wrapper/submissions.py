@@ -0,0 +1,17 @@
+"""
+Wrapper methods of the submissions API of edx-submissions.
+"""
+
+from importlib import import_module
+
+from django.conf import settings
+
+
+def get_submission_and_student(*args, **kwargs):
+    """
+    Wrapper method of `submissions.api.get_submission_and_student` in edx-submissions.
+    """
+    backend_function = settings.PLATFORM_PLUGIN_TURNITIN_SUBMISSIONS_BACKEND
+    backend = import_module(backend_function)
+
+    return backend.get_submission_and_student(*args, **kwargs)
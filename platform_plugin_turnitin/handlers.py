@@ -1,10 +1,18 @@
 """Event handlers for the Turnitin plugin."""
 
+from datetime import timedelta
+from logging import getLogger
+
 from django.conf import settings
+from django.utils import timezone
+from kombu.exceptions import OperationalError
 
-from platform_plugin_turnitin.tasks import ora_submission_created_task
+from platform_plugin_turnitin.models import TurnitinOutboxEntry
+from platform_plugin_turnitin.tasks import get_outbox_retry_delay, ora_submission_created_task
 from platform_plugin_turnitin.utils import enabled_in_course
 
+log = getLogger(__name__)
+
 
 def ora_submission_created(submission, **kwargs):
     """
@@ -13,14 +21,35 @@ def ora_submission_created(submission, **kwargs):
     If the Turnitin feature is enabled globally or in the course, create a new task to
     send the ORA submission data to Turnitin.
 
+    The submission is also written to the outbox first, so `drain_outbox_task` sends
+    it again if the task is lost or Turnitin is down.
+
     Args:
         submission (ORASubmissionData): The ORA submission data.
     """
-    if settings.ENABLE_TURNITIN_SUBMISSION or enabled_in_course(submission.location):
+    if not (settings.ENABLE_TURNITIN_SUBMISSION or enabled_in_course(submission.location)):
+        return
+
+    TurnitinOutboxEntry.objects.get_or_create(
+        ora_submission_id=submission.uuid,
+        defaults={
+            "anonymous_user_id": submission.anonymous_user_id,
+            "ora_block_id": submission.location,
+            "parts": submission.answer.parts,
+            "file_names": submission.answer.file_names,
+            "file_urls": submission.answer.file_urls,
+            "next_attempt_at": timezone.now() + timedelta(seconds=get_outbox_retry_delay()),
+        },
+    )
+
+    try:
         ora_submission_created_task.delay(
             submission.uuid,
             submission.anonymous_user_id,
             submission.answer.parts,
             submission.answer.file_names,
             submission.answer.file_urls,
+            submission.location,
         )
+    except OperationalError:
+        log.exception(f"Failed to queue the submission [{submission.uuid}], the Turnitin outbox will send it later.")
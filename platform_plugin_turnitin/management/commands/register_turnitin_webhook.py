@@ -0,0 +1,42 @@
+"""
+Management command to register the webhook receiver of the plugin in Turnitin.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from platform_plugin_turnitin.webhooks import register_webhook, webhooks_enabled
+
+
+class Command(BaseCommand):
+    """
+    Register the Turnitin webhook receiver.
+
+    Example:
+        ./manage.py lms register_turnitin_webhook \
+            --url https://<lms_host>/platform-plugin-turnitin/<course_id>/api/v1/webhook/
+    """
+
+    help = "Register the webhook receiver of the plugin in Turnitin."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            default=getattr(settings, "TURNITIN_WEBHOOK_URL", None),
+            help="Absolute URL of the webhook receiver. Defaults to TURNITIN_WEBHOOK_URL.",
+        )
+
+    def handle(self, *args, **options):
+        if not webhooks_enabled():
+            raise CommandError("TURNITIN_WEBHOOK_SIGNING_SECRET must be configured to register the webhook.")
+        if not options["url"]:
+            raise CommandError("A webhook URL must be provided with --url or TURNITIN_WEBHOOK_URL.")
+
+        response = register_webhook(options["url"])
+
+        if response is None:
+            self.stdout.write("The webhook is already registered.")
+        elif response.ok:
+            self.stdout.write(self.style.SUCCESS(f"Webhook registered with id {response.json().get('id')}."))
+        else:
+            raise CommandError(f"Failed to register the webhook: {response.text}")
@@ -0,0 +1,43 @@
+"""
+Management command to show the hits and misses of the Turnitin response cache.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from platform_plugin_turnitin.turnitin_client.response_cache import get_response_cache_stats, reset_response_cache_stats
+
+
+class Command(BaseCommand):
+    """
+    Show the hits and misses of the Turnitin response cache.
+
+    Example:
+        ./manage.py lms turnitin_response_cache_stats --reset
+    """
+
+    help = "Show the hits and misses of the Turnitin response cache, shared by all the workers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Set the counters back to zero after showing them.",
+        )
+
+    def handle(self, *args, **options):
+        stats = get_response_cache_stats()
+        if not stats:
+            self.stdout.write("The Turnitin response cache is disabled.")
+        elif not getattr(settings, "TURNITIN_RESPONSE_CACHE_STATS", False):
+            self.stdout.write("The hits and misses are not counted, set TURNITIN_RESPONSE_CACHE_STATS to count them.")
+
+        for endpoint, counters in stats.items():
+            total = counters["hits"] + counters["misses"]
+            hit_rate = counters["hits"] / total if total else 0
+            self.stdout.write(
+                f"{endpoint}: {counters['hits']} hits, {counters['misses']} misses ({hit_rate:.1%} hit rate)"
+            )
+
+        if options["reset"]:
+            reset_response_cache_stats()
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("platform_plugin_turnitin", "0005_turnitineulaacceptance"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="turnitinsubmission",
+            name="content_hash",
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name="turnitinsubmission",
+            name="ora_block_id",
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("platform_plugin_turnitin", "0006_turnitinsubmission_content_hash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="turnitinsubmission",
+            name="claimed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="turnitinsubmission",
+            name="idempotency_key",
+            field=models.CharField(blank=True, max_length=255, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:01
+
+from django.db import migrations, models
+
+
+def mark_existing_submissions(apps, schema_editor):
+    """
+    Mark the submissions sent before the pipeline state existed as already reported.
+
+    The previous pipeline requested the similarity report right after the upload,
+    so these rows must not be picked up again, neither to request the report nor
+    to poll it.
+    """
+    TurnitinSubmission = apps.get_model(
+        "platform_plugin_turnitin", "TurnitinSubmission"
+    )
+    TurnitinSubmission.objects.filter(turnitin_submission_id__isnull=False).update(
+        status="REPORT_READY"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("platform_plugin_turnitin", "0007_turnitinsubmission_idempotency_key"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="turnitinsubmission",
+            name="error_message",
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="turnitinsubmission",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("CREATED", "Created"),
+                    ("UPLOADED", "Uploaded"),
+                    ("PROCESSING", "Processing"),
+                    ("COMPLETE", "Complete"),
+                    ("REPORT_REQUESTED", "Report requested"),
+                    ("REPORT_READY", "Report ready"),
+                    ("ERROR", "Error"),
+                ],
+                db_index=True,
+                default="CREATED",
+                max_length=32,
+            ),
+        ),
+        migrations.AddField(
+            model_name="turnitinsubmission",
+            name="status_updated_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="turnitinsubmission",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(mark_existing_submissions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("platform_plugin_turnitin", "0008_turnitinsubmission_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="turnitinsubmission",
+            name="file_size",
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="turnitinsubmission",
+            name="next_poll_at",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="turnitinsubmission",
+            name="page_count",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="turnitinsubmission",
+            name="poll_attempts",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="turnitinsubmission",
+            name="word_count",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
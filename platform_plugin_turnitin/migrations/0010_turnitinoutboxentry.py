@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("platform_plugin_turnitin", "0009_turnitinsubmission_polling_schedule"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TurnitinOutboxEntry",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("ora_submission_id", models.CharField(max_length=255, unique=True)),
+                ("anonymous_user_id", models.CharField(max_length=255)),
+                (
+                    "ora_block_id",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                ("parts", models.JSONField(default=list)),
+                ("file_names", models.JSONField(default=list)),
+                ("file_urls", models.JSONField(default=list)),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("next_attempt_at", models.DateTimeField(db_index=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
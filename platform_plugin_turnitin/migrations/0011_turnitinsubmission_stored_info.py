@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("platform_plugin_turnitin", "0010_turnitinoutboxentry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="turnitinsubmission",
+            name="report_status",
+            field=models.CharField(blank=True, max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name="turnitinsubmission",
+            name="similarity_report_info",
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="turnitinsubmission",
+            name="similarity_report_info_updated_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="turnitinsubmission",
+            name="similarity_score",
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="turnitinsubmission",
+            name="submission_info",
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="turnitinsubmission",
+            name="submission_info_updated_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
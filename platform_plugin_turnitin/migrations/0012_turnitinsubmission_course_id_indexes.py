@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("platform_plugin_turnitin", "0011_turnitinsubmission_stored_info"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="turnitinsubmission",
+            name="course_id",
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="turnitinsubmission",
+            index=models.Index(
+                fields=["ora_submission_id"], name="turnitin_ora_submission_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="turnitinsubmission",
+            index=models.Index(
+                fields=["course_id", "created_at"], name="turnitin_course_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="turnitinsubmission",
+            index=models.Index(
+                fields=["user", "ora_block_id"], name="turnitin_user_ora_block_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:52
+
+from django.db import migrations
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import UsageKey
+
+BATCH_SIZE = 1000
+
+
+def get_student_item(ora_submission_id):
+    """
+    Return the student item of an ORA submission, or None if it cannot be read.
+    """
+    # pylint: disable=import-outside-toplevel
+    from platform_plugin_turnitin.edxapp_wrapper import get_submission_and_student
+
+    try:
+        return get_submission_and_student(ora_submission_id)["student_item"]
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+
+def backfill_course_id(apps, schema_editor):
+    """
+    Fill in the course of the submissions created before the column existed.
+
+    The course is taken from the usage key of the ORA block. The rows created before
+    the ORA block was stored take both from the student item of their ORA submission,
+    read once per ORA submission. The rows are updated in batches, each in its own
+    transaction, so large tables are not locked for the whole migration. Rows whose
+    course cannot be found are left without course.
+    """
+    TurnitinSubmission = apps.get_model(
+        "platform_plugin_turnitin", "TurnitinSubmission"
+    )
+    last_id = 0
+    while True:
+        submissions = list(
+            TurnitinSubmission.objects.filter(id__gt=last_id, course_id__isnull=True)
+            .only("id", "ora_block_id", "ora_submission_id")
+            .order_by("id")[:BATCH_SIZE]
+        )
+        if not submissions:
+            return
+
+        student_items = {}
+        for submission in submissions:
+            if submission.ora_block_id:
+                try:
+                    submission.course_id = str(
+                        UsageKey.from_string(submission.ora_block_id).course_key
+                    )
+                except InvalidKeyError:
+                    pass
+            elif submission.ora_submission_id:
+                if submission.ora_submission_id not in student_items:
+                    student_items[submission.ora_submission_id] = get_student_item(
+                        submission.ora_submission_id
+                    )
+                student_item = student_items[submission.ora_submission_id]
+                if student_item:
+                    submission.course_id = student_item["course_id"]
+                    submission.ora_block_id = student_item["item_id"]
+        TurnitinSubmission.objects.bulk_update(
+            [submission for submission in submissions if submission.course_id],
+            ["course_id", "ora_block_id"],
+        )
+        last_id = submissions[-1].id
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("platform_plugin_turnitin", "0012_turnitinsubmission_course_id_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_course_id, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("platform_plugin_turnitin", "0013_backfill_turnitinsubmission_course_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="turnitinsubmission",
+            name="report_attempts",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
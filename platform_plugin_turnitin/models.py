@@ -2,8 +2,11 @@
 Database models for platform_plugin_turnitin.
 """
 
+from typing import Optional
+
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -15,18 +18,172 @@ class TurnitinSubmission(models.Model):
     Attributes:
     - user (User): The user who made the submission.
     - ora_submission_id (str): The unique identifier for the submission in the Open Response Assessment (ORA) system.
+    - ora_block_id (str): The usage key of the ORA block the submission belongs to.
+    - course_id (str): The key of the course of the ORA block.
+    - file_name (str): The name of the file sent to Turnitin.
+    - content_hash (str): The SHA-256 hex digest of the content sent to Turnitin.
     - turnitin_submission_id (str): The unique identifier for the submission in Turnitin.
     - turnitin_submission_pdf_id (str): The unique identifier for the PDF version of the submission in Turnitin.
+    - idempotency_key (str): The key identifying the ORA submission part or file across task deliveries.
+    - claimed_at (datetime): The date and time when a worker claimed the part or file for uploading.
+    - status (str): The step of the Turnitin pipeline the submission reached.
+    - status_updated_at (datetime): The date and time when the status last changed.
+    - error_message (str): The reason of the last failure of the pipeline.
+    - file_size (int): The size in bytes of the content sent to Turnitin.
+    - page_count (int): The number of pages reported by Turnitin.
+    - word_count (int): The number of words reported by Turnitin.
+    - poll_attempts (int): The number of times the status was polled from Turnitin.
+    - next_poll_at (datetime): The date and time when the status must be polled again.
+    - report_attempts (int): The number of failed requests of the similarity report.
+    - submission_info (dict): The last submission information reported by Turnitin.
+    - submission_info_updated_at (datetime): The date and time when the submission information was stored.
+    - similarity_report_info (dict): The last similarity report information reported by Turnitin.
+    - similarity_report_info_updated_at (datetime): The date and time when the report information was stored.
+    - similarity_score (int): The overall match percentage of the similarity report.
+    - report_status (str): The status of the similarity report reported by Turnitin.
     - created_at (datetime): The date and time when the submission was created.
+    - updated_at (datetime): The date and time when the submission was last modified.
 
     .. no_pii:
     """
 
+    class Status(models.TextChoices):
+        """
+        Steps of the Turnitin pipeline.
+
+        A submission goes CREATED -> UPLOADED -> PROCESSING -> COMPLETE ->
+        REPORT_REQUESTED -> REPORT_READY, or to ERROR if Turnitin fails to process it.
+        """
+
+        CREATED = "CREATED", "Created"
+        UPLOADED = "UPLOADED", "Uploaded"
+        PROCESSING = "PROCESSING", "Processing"
+        COMPLETE = "COMPLETE", "Complete"
+        REPORT_REQUESTED = "REPORT_REQUESTED", "Report requested"
+        REPORT_READY = "REPORT_READY", "Report ready"
+        ERROR = "ERROR", "Error"
+
     user = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="turnitin_submissions"
     )
     ora_submission_id = models.CharField(max_length=255, blank=True, null=True)
+    ora_block_id = models.CharField(max_length=255, blank=True, null=True)
+    course_id = models.CharField(max_length=255, blank=True, null=True)
     file_name = models.CharField(max_length=255, blank=True, null=True)
+    content_hash = models.CharField(max_length=64, blank=True, null=True, db_index=True)
     turnitin_submission_id = models.CharField(max_length=255, blank=True, null=True)
     turnitin_submission_pdf_id = models.CharField(max_length=255, blank=True, null=True)
+    idempotency_key = models.CharField(max_length=255, unique=True, blank=True, null=True)
+    claimed_at = models.DateTimeField(blank=True, null=True)
+    status = models.CharField(
+        max_length=32, choices=Status.choices, default=Status.CREATED, db_index=True
+    )
+    status_updated_at = models.DateTimeField(blank=True, null=True)
+    error_message = models.TextField(blank=True, null=True)
+    file_size = models.PositiveBigIntegerField(blank=True, null=True)
+    page_count = models.PositiveIntegerField(blank=True, null=True)
+    word_count = models.PositiveIntegerField(blank=True, null=True)
+    poll_attempts = models.PositiveIntegerField(default=0)
+    next_poll_at = models.DateTimeField(blank=True, null=True, db_index=True)
+    report_attempts = models.PositiveIntegerField(default=0)
+    submission_info = models.JSONField(blank=True, null=True)
+    submission_info_updated_at = models.DateTimeField(blank=True, null=True)
+    similarity_report_info = models.JSONField(blank=True, null=True)
+    similarity_report_info_updated_at = models.DateTimeField(blank=True, null=True)
+    similarity_score = models.PositiveSmallIntegerField(blank=True, null=True)
+    report_status = models.CharField(max_length=32, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """Model options."""
+
+        indexes = [
+            models.Index(
+                fields=["ora_submission_id"], name="turnitin_ora_submission_idx"
+            ),
+            models.Index(
+                fields=["course_id", "created_at"], name="turnitin_course_created_idx"
+            ),
+            models.Index(
+                fields=["user", "ora_block_id"], name="turnitin_user_ora_block_idx"
+            ),
+        ]
+
+    def set_status(self, status: str, error_message: Optional[str] = None) -> None:
+        """
+        Move the submission to another step of the Turnitin pipeline.
+
+        Args:
+            status (str): The new status.
+            error_message (str, optional): The reason of the failure, if any.
+        """
+        self.status = status
+        self.status_updated_at = timezone.now()
+        self.error_message = error_message
+        self.save()
+
+
+class TurnitinEulaAcceptance(models.Model):
+    """
+    Represents the acceptance of a Turnitin EULA version by a user.
+
+    Attributes:
+    - user (User): The user who accepted the EULA.
+    - eula_version (str): The version of the EULA accepted by the user.
+    - accepted_at (datetime): The date and time when the acceptance was recorded.
+
+    .. no_pii:
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="turnitin_eula_acceptances"
+    )
+    eula_version = models.CharField(max_length=32)
+    accepted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        """Model options."""
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "eula_version"], name="unique_turnitin_eula_acceptance"
+            ),
+        ]
+
+
+class TurnitinOutboxEntry(models.Model):
+    """
+    Represents an ORA submission waiting to be fully sent to Turnitin.
+
+    The entry is written when the submission is created and deleted once all its
+    parts and files are uploaded, so a submission is never lost while Turnitin or
+    the workers are down.
+
+    Attributes:
+    - ora_submission_id (str): The unique identifier for the submission in the Open Response Assessment (ORA) system.
+    - anonymous_user_id (str): The anonymous ID of the user who made the submission.
+    - ora_block_id (str): The usage key of the ORA block the submission belongs to.
+    - parts (list): The parts of the submission with the answers.
+    - file_names (list): The names of the files uploaded to the submission.
+    - file_urls (list): The URLs of the files uploaded to the submission.
+    - attempts (int): The number of times the submission was sent again from the outbox.
+    - next_attempt_at (datetime): The date and time when the submission must be checked again.
+    - created_at (datetime): The date and time when the entry was created.
+    - updated_at (datetime): The date and time when the entry was last modified.
+
+    .. pii: The answers of the learner, kept until they are sent to Turnitin.
+    .. pii_types: other
+    .. pii_retirement: retained
+    """
+
+    ora_submission_id = models.CharField(max_length=255, unique=True)
+    anonymous_user_id = models.CharField(max_length=255)
+    ora_block_id = models.CharField(max_length=255, blank=True, null=True)
+    parts = models.JSONField(default=list)
+    file_names = models.JSONField(default=list)
+    file_urls = models.JSONField(default=list)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
@@ -0,0 +1,450 @@
+"""State transitions of the Turnitin pipeline for the Turnitin plugin."""
+
+import random
+from datetime import timedelta
+from logging import getLogger
+from typing import List, Optional
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from platform_plugin_turnitin.constants import (
+    POLLING_BYTES_PER_STEP,
+    POLLING_PAGES_PER_STEP,
+    POLLING_WORDS_PER_STEP,
+    SIMILARITY_REPORT_INFO,
+    STORED_INFO_TERMINAL_STATUSES,
+    SUBMISSION_INFO,
+)
+from platform_plugin_turnitin.models import TurnitinSubmission
+from platform_plugin_turnitin.turnitin_client.exceptions import TurnitinClientError
+from platform_plugin_turnitin.turnitin_client.handlers import (
+    get_similarity_report_info,
+    get_submission_info,
+    put_generate_similarity_report,
+)
+from platform_plugin_turnitin.turnitin_client.rate_limit import rate_limit_max_wait
+
+log = getLogger(__name__)
+
+Status = TurnitinSubmission.Status
+
+IN_PROGRESS_STATUSES = [Status.CREATED, Status.UPLOADED, Status.PROCESSING]
+RETRYABLE_CLIENT_ERROR_STATUS_CODES = (408, 409, 429)
+
+
+def update_submission_status(turnitin_submission_id: str, submission_info: dict) -> int:
+    """
+    Update the rows of a Turnitin submission from the information reported by Turnitin.
+
+    Only rows still in progress change their status, so a late or repeated status
+    never moves a submission backwards. The information is stored as is, to be
+    served without calling Turnitin, and the page and word counts are stored when
+    Turnitin reports them.
+
+    Args:
+        turnitin_submission_id (str): The unique identifier for the submission in Turnitin.
+        submission_info (dict): The submission information reported by Turnitin.
+
+    Returns:
+        int: The number of rows whose status changed.
+    """
+    submissions = TurnitinSubmission.objects.filter(turnitin_submission_id=turnitin_submission_id)
+    counts = {
+        field: submission_info[field]
+        for field in ("page_count", "word_count")
+        if submission_info.get(field) is not None
+    }
+    submissions.update(submission_info=submission_info, submission_info_updated_at=timezone.now(), **counts)
+
+    turnitin_status = submission_info.get("status")
+    if turnitin_status == "PROCESSING":
+        new_status, previous_statuses = Status.PROCESSING, [Status.CREATED, Status.UPLOADED]
+    elif turnitin_status in (Status.COMPLETE, Status.ERROR):
+        new_status, previous_statuses = turnitin_status, IN_PROGRESS_STATUSES
+    else:
+        return 0
+
+    return submissions.filter(status__in=previous_statuses).update(
+        status=new_status,
+        status_updated_at=timezone.now(),
+        error_message=submission_info.get("error_code"),
+    )
+
+
+def fetch_submission_info(turnitin_submission_id: str) -> Optional[dict]:
+    """
+    Fetch the information of a Turnitin submission.
+
+    It does not touch the database, so it can run in a thread pool. It does not wait
+    for the rate limiter either: the caller decides when a deferred check is retried.
+
+    Args:
+        turnitin_submission_id (str): The unique identifier for the submission in Turnitin.
+
+    Returns:
+        Optional[dict]: The submission information, or None if the request failed.
+
+    Raises:
+    - TurnitinCircuitOpen: If the check fails fast because Turnitin is unavailable.
+    - TurnitinRateLimited: If the check is deferred by the rate limiter.
+    """
+    with rate_limit_max_wait(0):
+        response = get_submission_info(turnitin_submission_id)
+
+    if not response.ok:
+        log.info(f"Failed to get the status of Turnitin submission [{turnitin_submission_id}].")
+        return None
+
+    return response.json()
+
+
+def update_similarity_report_info(turnitin_submission_id: str, report_info: dict) -> int:
+    """
+    Store the similarity report information reported by Turnitin.
+
+    The information is stored as is, to be served without calling Turnitin, along
+    with the overall match percentage and the report status. A complete report also
+    marks the rows as REPORT_READY.
+
+    Args:
+        turnitin_submission_id (str): The unique identifier for the submission in Turnitin.
+        report_info (dict): The similarity report information reported by Turnitin.
+
+    Returns:
+        int: The number of rows marked as REPORT_READY.
+    """
+    TurnitinSubmission.objects.filter(turnitin_submission_id=turnitin_submission_id).update(
+        similarity_report_info=report_info,
+        similarity_report_info_updated_at=timezone.now(),
+        similarity_score=report_info.get("overall_match_percentage"),
+        report_status=report_info.get("status"),
+    )
+    if report_info.get("status") == "COMPLETE":
+        return mark_report_ready(turnitin_submission_id)
+    return 0
+
+
+def fetch_similarity_report_info(turnitin_submission_id: str) -> Optional[dict]:
+    """
+    Fetch the similarity report information of a Turnitin submission.
+
+    Like `fetch_submission_info`, it does not touch the database nor wait for the
+    rate limiter.
+
+    Args:
+        turnitin_submission_id (str): The unique identifier for the submission in Turnitin.
+
+    Returns:
+        Optional[dict]: The similarity report information, or None if the request failed.
+
+    Raises:
+    - TurnitinCircuitOpen: If the check fails fast because Turnitin is unavailable.
+    - TurnitinRateLimited: If the check is deferred by the rate limiter.
+    """
+    with rate_limit_max_wait(0):
+        response = get_similarity_report_info(turnitin_submission_id)
+
+    if not response.ok:
+        log.info(f"Failed to get the similarity report of Turnitin submission [{turnitin_submission_id}].")
+        return None
+
+    return response.json()
+
+
+def is_stored_info_fresh(kind: str, info: dict, updated_at) -> bool:
+    """
+    Check if the stored Turnitin information of a submission can be served as is.
+
+    Information in a terminal state never changes again, so it is always fresh.
+    Otherwise, it is fresh for `TURNITIN_SUBMISSION_INFO_TTL` or
+    `TURNITIN_SIMILARITY_REPORT_INFO_TTL` seconds.
+
+    Args:
+        kind (str): SUBMISSION_INFO or SIMILARITY_REPORT_INFO.
+        info (dict): The stored information.
+        updated_at (datetime): The date and time when the information was stored.
+
+    Returns:
+        bool: True if the information is fresh, False if it must be refreshed.
+    """
+    if info.get("status") in STORED_INFO_TERMINAL_STATUSES[kind]:
+        return True
+
+    return updated_at is not None and timezone.now() - updated_at < timedelta(seconds=get_stored_info_ttl(kind))
+
+
+def get_stored_info_ttl(kind: str) -> int:
+    """
+    Return the seconds the stored Turnitin information of a submission is fresh.
+
+    Args:
+        kind (str): SUBMISSION_INFO or SIMILARITY_REPORT_INFO.
+
+    Returns:
+        int: `TURNITIN_SUBMISSION_INFO_TTL` or `TURNITIN_SIMILARITY_REPORT_INFO_TTL`.
+    """
+    if kind == SUBMISSION_INFO:
+        return getattr(settings, "TURNITIN_SUBMISSION_INFO_TTL", 60)
+    return getattr(settings, "TURNITIN_SIMILARITY_REPORT_INFO_TTL", 60)
+
+
+def forget_similarity_report_info(turnitin_submission_ids: List[str]) -> int:
+    """
+    Drop the stored similarity report information, e.g. after a new report was requested.
+
+    The score and the status of the report are dropped as well, and the submissions
+    whose report was already requested are moved back to REPORT_REQUESTED so the new
+    report is polled from scratch.
+
+    Args:
+        turnitin_submission_ids (List[str]): The unique identifiers for the submissions in Turnitin.
+
+    Returns:
+        int: The number of updated rows.
+    """
+    submissions = TurnitinSubmission.objects.filter(turnitin_submission_id__in=turnitin_submission_ids)
+    submissions.filter(
+        status__in=[
+            TurnitinSubmission.Status.COMPLETE,
+            TurnitinSubmission.Status.REPORT_REQUESTED,
+            TurnitinSubmission.Status.REPORT_READY,
+        ]
+    ).update(
+        status=TurnitinSubmission.Status.REPORT_REQUESTED,
+        status_updated_at=timezone.now(),
+        poll_attempts=0,
+        next_poll_at=None,
+    )
+    return submissions.update(
+        similarity_report_info=None,
+        similarity_report_info_updated_at=None,
+        similarity_score=None,
+        report_status=None,
+    )
+
+
+def refresh_stored_info(kind: str, turnitin_submission_ids: List[str]) -> int:
+    """
+    Fetch and store the Turnitin information of submissions again.
+
+    Args:
+        kind (str): SUBMISSION_INFO or SIMILARITY_REPORT_INFO.
+        turnitin_submission_ids (List[str]): The unique identifiers for the submissions in Turnitin.
+
+    Returns:
+        int: The number of submissions refreshed.
+    """
+    if kind == SIMILARITY_REPORT_INFO:
+        fetch, store = fetch_similarity_report_info, update_similarity_report_info
+    else:
+        fetch, store = fetch_submission_info, update_submission_status
+
+    refreshed = 0
+    for turnitin_submission_id in turnitin_submission_ids:
+        try:
+            info = fetch(turnitin_submission_id)
+        except TurnitinClientError as error:
+            log.info(f"Deferred the {kind} refresh of Turnitin submission [{turnitin_submission_id}]: {error}")
+            continue
+        if info is not None:
+            store(turnitin_submission_id, info)
+            refreshed += 1
+    return refreshed
+
+
+def get_poll_delay(submission: TurnitinSubmission, min_delay: float = 0, attempts: Optional[int] = None) -> float:
+    """
+    Return the seconds to wait before polling the status of a submission again.
+
+    The delay grows exponentially with the number of attempts, starting from
+    `TURNITIN_POLLING_BASE_DELAY` seconds scaled by the size of the document, so
+    short answers are checked soon and long documents are not checked too often.
+    It is capped by `TURNITIN_POLLING_MAX_DELAY` and randomized to spread the
+    requests of submissions uploaded at the same time.
+
+    Args:
+        submission (TurnitinSubmission): The submission to poll.
+        min_delay (float): The minimum delay in seconds.
+        attempts (int, optional): The number of attempts, defaults to the status polls of the submission.
+
+    Returns:
+        float: The delay in seconds.
+    """
+    if attempts is None:
+        attempts = submission.poll_attempts
+    base_delay = getattr(settings, "TURNITIN_POLLING_BASE_DELAY", 15)
+    max_delay = getattr(settings, "TURNITIN_POLLING_MAX_DELAY", 900)
+
+    size_factor = max(
+        1,
+        (submission.file_size or 0) / POLLING_BYTES_PER_STEP,
+        (submission.page_count or 0) / POLLING_PAGES_PER_STEP,
+        (submission.word_count or 0) / POLLING_WORDS_PER_STEP,
+    )
+    delay = min(max_delay, base_delay * size_factor * 2**attempts)
+    return max(min_delay, random.uniform(delay / 2, delay))
+
+
+def schedule_next_poll(turnitin_submission_id: str, min_delay: float = 0, attempted: bool = True) -> None:
+    """
+    Schedule the next status check of a Turnitin submission or report still being processed.
+
+    If the submission was polled and is still in the same step
+    `TURNITIN_POLLING_DEADLINE` seconds after reaching it, polling stops and the
+    submission is marked as ERROR with the reason. A submission never polled is
+    never given up on. A check deferred by the rate limiter or the circuit breaker
+    did not reach Turnitin, so it is not counted as an attempt nor given up on.
+
+    Args:
+        turnitin_submission_id (str): The unique identifier for the submission in Turnitin.
+        min_delay (float): The minimum delay in seconds before the next check.
+        attempted (bool): Whether the check reached Turnitin.
+    """
+    submissions = TurnitinSubmission.objects.filter(
+        turnitin_submission_id=turnitin_submission_id,
+        status__in=[Status.UPLOADED, Status.PROCESSING, Status.REPORT_REQUESTED],
+    )
+    submission = submissions.order_by("created_at").first()
+    if submission is None:
+        return
+
+    now = timezone.now()
+    deadline = getattr(settings, "TURNITIN_POLLING_DEADLINE", 86400)
+
+    started_at = submission.status_updated_at or submission.created_at
+
+    if attempted and submission.poll_attempts and now - started_at > timedelta(seconds=deadline):
+        error_message = (
+            f"Gave up polling after {submission.poll_attempts} attempts because Turnitin did not process "
+            f"the submission within {deadline} seconds."
+        )
+        log.warning(f"Turnitin submission [{turnitin_submission_id}]: {error_message}")
+        submissions.update(status=Status.ERROR, status_updated_at=now, next_poll_at=None, error_message=error_message)
+        return
+
+    submissions.update(
+        poll_attempts=F("poll_attempts") + int(attempted),
+        next_poll_at=now + timedelta(seconds=get_poll_delay(submission, min_delay)),
+    )
+
+
+def request_similarity_report(turnitin_submission_id: str) -> bool:
+    """
+    Request the similarity report of a complete Turnitin submission.
+
+    The rows are moved to REPORT_REQUESTED before calling Turnitin, so concurrent
+    callers (e.g. the webhook and the poller) request the report only once, and the
+    stored report information is dropped, so a new report is not served stale. The
+    polling schedule starts over, so the poller checks the new report soon. If the
+    request fails or is deferred, the rows go back to COMPLETE and the next request
+    is scheduled by `defer_similarity_report_request`, unless Turnitin rejected it
+    with a client error that would fail again, which moves the rows to ERROR.
+
+    Args:
+        turnitin_submission_id (str): The unique identifier for the submission in Turnitin.
+
+    Returns:
+        bool: True if the report was requested, False otherwise.
+    """
+    submissions = TurnitinSubmission.objects.filter(turnitin_submission_id=turnitin_submission_id)
+
+    if not submissions.filter(status=Status.COMPLETE).update(
+        status=Status.REPORT_REQUESTED,
+        status_updated_at=timezone.now(),
+        similarity_report_info=None,
+        poll_attempts=0,
+        next_poll_at=None,
+    ):
+        return False
+
+    payload = getattr(settings, "TURNITIN_SIMILARITY_REPORT_PAYLOAD", None)
+    try:
+        with rate_limit_max_wait(0):
+            response = put_generate_similarity_report(turnitin_submission_id, payload)
+    except TurnitinClientError as error:
+        # Deferred by the rate limiter or the circuit breaker: Turnitin was not called.
+        defer_similarity_report_request(
+            turnitin_submission_id, str(error), failed=False, min_delay=getattr(error, "retry_after", 0)
+        )
+        return False
+
+    if response.ok:
+        return True
+
+    error_message = f"Failed to request the similarity report: {response.status_code}"
+    if 400 <= response.status_code < 500 and response.status_code not in RETRYABLE_CLIENT_ERROR_STATUS_CODES:
+        log.warning(f"Turnitin submission [{turnitin_submission_id}]: {error_message}")
+        submissions.filter(status=Status.REPORT_REQUESTED).update(
+            status=Status.ERROR, status_updated_at=timezone.now(), error_message=error_message
+        )
+        return False
+
+    defer_similarity_report_request(turnitin_submission_id, error_message)
+    return False
+
+
+def defer_similarity_report_request(
+    turnitin_submission_id: str, error_message: str, failed: bool = True, min_delay: float = 0
+) -> None:
+    """
+    Move a Turnitin submission back to COMPLETE to request its similarity report later.
+
+    The next request is scheduled in `next_poll_at` with the delay of `get_poll_delay`,
+    which doubles with every failed request. After
+    `TURNITIN_SIMILARITY_REPORT_MAX_ATTEMPTS` failed requests, the submission is
+    marked as ERROR instead.
+
+    Args:
+        turnitin_submission_id (str): The unique identifier for the submission in Turnitin.
+        error_message (str): The reason why the report was not requested.
+        failed (bool): Whether Turnitin failed the request, or it was only deferred.
+        min_delay (float): The minimum delay in seconds before the next request.
+    """
+    submissions = TurnitinSubmission.objects.filter(
+        turnitin_submission_id=turnitin_submission_id, status=Status.REPORT_REQUESTED
+    )
+    submission = submissions.order_by("created_at").first()
+    if submission is None:
+        return
+
+    now = timezone.now()
+    attempts = submission.report_attempts + int(failed)
+    max_attempts = getattr(settings, "TURNITIN_SIMILARITY_REPORT_MAX_ATTEMPTS", 5)
+
+    if attempts >= max_attempts:
+        error_message = f"Gave up requesting the similarity report after {attempts} attempts. {error_message}"
+        log.warning(f"Turnitin submission [{turnitin_submission_id}]: {error_message}")
+        submissions.update(
+            status=Status.ERROR,
+            status_updated_at=now,
+            report_attempts=attempts,
+            next_poll_at=None,
+            error_message=error_message,
+        )
+        return
+
+    submissions.update(
+        status=Status.COMPLETE,
+        status_updated_at=now,
+        report_attempts=attempts,
+        next_poll_at=now + timedelta(seconds=get_poll_delay(submission, min_delay, attempts)),
+        error_message=error_message,
+    )
+
+
+def mark_report_ready(turnitin_submission_id: str) -> int:
+    """
+    Mark the similarity report of a Turnitin submission as ready.
+
+    Args:
+        turnitin_submission_id (str): The unique identifier for the submission in Turnitin.
+
+    Returns:
+        int: The number of updated rows.
+    """
+    return TurnitinSubmission.objects.filter(
+        turnitin_submission_id=turnitin_submission_id,
+        status__in=[Status.COMPLETE, Status.REPORT_REQUESTED],
+    ).update(status=Status.REPORT_READY, status_updated_at=timezone.now())
@@ -7,6 +7,7 @@ https://docs.djangoproject.com/en/2.22/ref/settings/
 """
 
 from platform_plugin_turnitin import ROOT_DIRECTORY
+from platform_plugin_turnitin.constants import OUTBOX_BEAT_SCHEDULE_NAME, POLLING_BEAT_SCHEDULE_NAME
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/2.22/howto/deployment/checklist/
@@ -75,6 +76,54 @@ def plugin_settings(settings):
     }
     # Backend settings
     settings.TURNITIN_API_TIMEOUT = 30
+    settings.TURNITIN_API_POOL_CONNECTIONS = 10
+    settings.TURNITIN_API_POOL_MAXSIZE = 10
+    settings.TURNITIN_API_POOL_BLOCK = False
+    settings.TURNITIN_API_CONCURRENCY = 5
+    settings.TURNITIN_CONCURRENCY_BACKEND = "thread"
+    settings.TURNITIN_API_THREAD_POOL_SIZE = 10
+    settings.TURNITIN_SUBMISSION_INFO_TTL = 60
+    settings.TURNITIN_SIMILARITY_REPORT_INFO_TTL = 60
+    settings.TURNITIN_RESPONSE_CACHE_ALIAS = "default"
+    settings.TURNITIN_RESPONSE_CACHE_TIMEOUTS = {"submission_info": 10, "similarity_report_info": 30}
+    settings.TURNITIN_RESPONSE_CACHE_STATS = False
+    settings.TURNITIN_VIEWER_URL_EXPIRY = 60
+    settings.TURNITIN_VIEWER_URL_EXPIRY_MARGIN = 10
+    settings.TURNITIN_API_MAX_RETRIES = 3
+    settings.TURNITIN_API_RETRY_BACKOFF = 0.5
+    settings.TURNITIN_API_RETRY_MAX_DELAY = 10
+    settings.TURNITIN_API_RETRY_BUDGET_RATIO = 0.2
+    settings.TURNITIN_API_RETRY_BUDGET_RESERVE = 10
+    settings.TURNITIN_RATE_LIMITS = {"upload": 60, "status": 300, "report": 60, "viewer": 120}
+    settings.TURNITIN_RATE_LIMIT_PERIOD = 60
+    settings.TURNITIN_RATE_LIMIT_MAX_WAIT = 5
+    settings.TURNITIN_CIRCUIT_BREAKER_WINDOW = 60
+    settings.TURNITIN_CIRCUIT_BREAKER_MIN_CALLS = 10
+    settings.TURNITIN_CIRCUIT_BREAKER_FAILURE_RATE = 0.5
+    settings.TURNITIN_CIRCUIT_BREAKER_SLOW_CALL = 10
+    settings.TURNITIN_CIRCUIT_BREAKER_OPEN_TIMEOUT = 30
+    settings.TURNITIN_CIRCUIT_BREAKER_HALF_OPEN_PROBES = 3
+    settings.TURNITIN_EULA_CACHE_TIMEOUT = 86400
+    settings.TURNITIN_WEBHOOK_URL = None
+    settings.TURNITIN_WEBHOOK_SIGNING_SECRET = None
+    settings.TURNITIN_WEBHOOK_FALLBACK_POLLING_INTERVAL = 300
+    settings.TURNITIN_POLLING_INTERVAL = 60
+    settings.TURNITIN_POLLING_BATCH_SIZE = 100
+    settings.TURNITIN_POLLING_MAX_WORKERS = 4
+    settings.TURNITIN_POLLING_BASE_DELAY = 15
+    settings.TURNITIN_POLLING_MAX_DELAY = 900
+    settings.TURNITIN_POLLING_DEADLINE = 86400
+    settings.TURNITIN_SIMILARITY_REPORT_MAX_ATTEMPTS = 5
+    settings.TURNITIN_OUTBOX_DRAIN_INTERVAL = 60
+    settings.TURNITIN_OUTBOX_DRAIN_BATCH_SIZE = 20
+    settings.TURNITIN_OUTBOX_RETRY_DELAY = 300
+    settings.TURNITIN_OUTBOX_MAX_DELAY = 3600
+    settings.TURNITIN_MAX_FILE_SIZE = 100 * 1024 * 1024
+    settings.TURNITIN_UPLOAD_MAX_MEMORY_SIZE = 2621440
+    settings.TURNITIN_FILE_STORAGE_CLASS = None
+    settings.TURNITIN_FILE_STORAGE_OPTIONS = {}
+    # Matched against the path of the file URLs, "/" for the presigned URLs of an S3 bucket.
+    settings.TURNITIN_FILE_STORAGE_URL_PREFIX = "/openassessment/storage/"
     settings.PLATFORM_PLUGIN_TURNITIN_AUTHENTICATION_BACKEND = (
         "platform_plugin_turnitin.edxapp_wrapper.backends.authentication_q_v1"
     )
@@ -85,5 +134,18 @@ def plugin_settings(settings):
     settings.PLATFORM_PLUGIN_TURNITIN_MODULESTORE_BACKEND = (
         "platform_plugin_turnitin.edxapp_wrapper.backends.modulestore_q_v1"
     )
+    settings.PLATFORM_PLUGIN_TURNITIN_SUBMISSIONS_BACKEND = (
+        "platform_plugin_turnitin.edxapp_wrapper.backends.submissions_q_v1"
+    )
+    # Celery settings
+    settings.CELERYBEAT_SCHEDULE = getattr(settings, "CELERYBEAT_SCHEDULE", {})
+    settings.CELERYBEAT_SCHEDULE[POLLING_BEAT_SCHEDULE_NAME] = {
+        "task": "platform_plugin_turnitin.tasks.poll_pending_submissions_task",
+        "schedule": settings.TURNITIN_POLLING_INTERVAL,
+    }
+    settings.CELERYBEAT_SCHEDULE[OUTBOX_BEAT_SCHEDULE_NAME] = {
+        "task": "platform_plugin_turnitin.tasks.drain_outbox_task",
+        "schedule": settings.TURNITIN_OUTBOX_DRAIN_INTERVAL,
+    }
     # Template settings
     settings.MAKO_TEMPLATE_DIRS_BASE.append(ROOT_DIRECTORY / "templates/turnitin")
@@ -3,6 +3,7 @@ Production Django settings for platform_plugin_turnitin project.
 """
 
 from platform_plugin_turnitin import ROOT_DIRECTORY
+from platform_plugin_turnitin.constants import OUTBOX_BEAT_SCHEDULE_NAME, POLLING_BEAT_SCHEDULE_NAME
 
 
 def plugin_settings(settings):
@@ -37,6 +38,149 @@ def plugin_settings(settings):
     settings.TURNITIN_API_TIMEOUT = getattr(settings, "ENV_TOKENS", {}).get(
         "TURNITIN_API_TIMEOUT", settings.TURNITIN_API_TIMEOUT
     )
+    settings.TURNITIN_API_POOL_CONNECTIONS = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_API_POOL_CONNECTIONS", settings.TURNITIN_API_POOL_CONNECTIONS
+    )
+    settings.TURNITIN_API_POOL_MAXSIZE = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_API_POOL_MAXSIZE", settings.TURNITIN_API_POOL_MAXSIZE
+    )
+    settings.TURNITIN_API_POOL_BLOCK = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_API_POOL_BLOCK", settings.TURNITIN_API_POOL_BLOCK
+    )
+    settings.TURNITIN_API_CONCURRENCY = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_API_CONCURRENCY", settings.TURNITIN_API_CONCURRENCY
+    )
+    settings.TURNITIN_CONCURRENCY_BACKEND = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_CONCURRENCY_BACKEND", settings.TURNITIN_CONCURRENCY_BACKEND
+    )
+    settings.TURNITIN_API_THREAD_POOL_SIZE = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_API_THREAD_POOL_SIZE", settings.TURNITIN_API_THREAD_POOL_SIZE
+    )
+    settings.TURNITIN_SUBMISSION_INFO_TTL = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_SUBMISSION_INFO_TTL", settings.TURNITIN_SUBMISSION_INFO_TTL
+    )
+    settings.TURNITIN_SIMILARITY_REPORT_INFO_TTL = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_SIMILARITY_REPORT_INFO_TTL", settings.TURNITIN_SIMILARITY_REPORT_INFO_TTL
+    )
+    settings.TURNITIN_RESPONSE_CACHE_ALIAS = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_RESPONSE_CACHE_ALIAS", settings.TURNITIN_RESPONSE_CACHE_ALIAS
+    )
+    settings.TURNITIN_RESPONSE_CACHE_TIMEOUTS = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_RESPONSE_CACHE_TIMEOUTS", settings.TURNITIN_RESPONSE_CACHE_TIMEOUTS
+    )
+    settings.TURNITIN_RESPONSE_CACHE_STATS = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_RESPONSE_CACHE_STATS", settings.TURNITIN_RESPONSE_CACHE_STATS
+    )
+    settings.TURNITIN_VIEWER_URL_EXPIRY = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_VIEWER_URL_EXPIRY", settings.TURNITIN_VIEWER_URL_EXPIRY
+    )
+    settings.TURNITIN_VIEWER_URL_EXPIRY_MARGIN = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_VIEWER_URL_EXPIRY_MARGIN", settings.TURNITIN_VIEWER_URL_EXPIRY_MARGIN
+    )
+    settings.TURNITIN_API_MAX_RETRIES = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_API_MAX_RETRIES", settings.TURNITIN_API_MAX_RETRIES
+    )
+    settings.TURNITIN_API_RETRY_BACKOFF = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_API_RETRY_BACKOFF", settings.TURNITIN_API_RETRY_BACKOFF
+    )
+    settings.TURNITIN_API_RETRY_MAX_DELAY = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_API_RETRY_MAX_DELAY", settings.TURNITIN_API_RETRY_MAX_DELAY
+    )
+    settings.TURNITIN_API_RETRY_BUDGET_RATIO = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_API_RETRY_BUDGET_RATIO", settings.TURNITIN_API_RETRY_BUDGET_RATIO
+    )
+    settings.TURNITIN_API_RETRY_BUDGET_RESERVE = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_API_RETRY_BUDGET_RESERVE", settings.TURNITIN_API_RETRY_BUDGET_RESERVE
+    )
+    settings.TURNITIN_RATE_LIMITS = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_RATE_LIMITS", settings.TURNITIN_RATE_LIMITS
+    )
+    settings.TURNITIN_RATE_LIMIT_PERIOD = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_RATE_LIMIT_PERIOD", settings.TURNITIN_RATE_LIMIT_PERIOD
+    )
+    settings.TURNITIN_RATE_LIMIT_MAX_WAIT = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_RATE_LIMIT_MAX_WAIT", settings.TURNITIN_RATE_LIMIT_MAX_WAIT
+    )
+    settings.TURNITIN_CIRCUIT_BREAKER_WINDOW = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_CIRCUIT_BREAKER_WINDOW", settings.TURNITIN_CIRCUIT_BREAKER_WINDOW
+    )
+    settings.TURNITIN_CIRCUIT_BREAKER_MIN_CALLS = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_CIRCUIT_BREAKER_MIN_CALLS", settings.TURNITIN_CIRCUIT_BREAKER_MIN_CALLS
+    )
+    settings.TURNITIN_CIRCUIT_BREAKER_FAILURE_RATE = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_CIRCUIT_BREAKER_FAILURE_RATE", settings.TURNITIN_CIRCUIT_BREAKER_FAILURE_RATE
+    )
+    settings.TURNITIN_CIRCUIT_BREAKER_SLOW_CALL = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_CIRCUIT_BREAKER_SLOW_CALL", settings.TURNITIN_CIRCUIT_BREAKER_SLOW_CALL
+    )
+    settings.TURNITIN_CIRCUIT_BREAKER_OPEN_TIMEOUT = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_CIRCUIT_BREAKER_OPEN_TIMEOUT", settings.TURNITIN_CIRCUIT_BREAKER_OPEN_TIMEOUT
+    )
+    settings.TURNITIN_CIRCUIT_BREAKER_HALF_OPEN_PROBES = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_CIRCUIT_BREAKER_HALF_OPEN_PROBES", settings.TURNITIN_CIRCUIT_BREAKER_HALF_OPEN_PROBES
+    )
+    settings.TURNITIN_EULA_CACHE_TIMEOUT = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_EULA_CACHE_TIMEOUT", settings.TURNITIN_EULA_CACHE_TIMEOUT
+    )
+    settings.TURNITIN_WEBHOOK_URL = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_WEBHOOK_URL", settings.TURNITIN_WEBHOOK_URL
+    )
+    settings.TURNITIN_WEBHOOK_SIGNING_SECRET = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_WEBHOOK_SIGNING_SECRET", settings.TURNITIN_WEBHOOK_SIGNING_SECRET
+    )
+    settings.TURNITIN_WEBHOOK_FALLBACK_POLLING_INTERVAL = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_WEBHOOK_FALLBACK_POLLING_INTERVAL", settings.TURNITIN_WEBHOOK_FALLBACK_POLLING_INTERVAL
+    )
+    settings.TURNITIN_POLLING_INTERVAL = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_POLLING_INTERVAL", settings.TURNITIN_POLLING_INTERVAL
+    )
+    settings.TURNITIN_POLLING_BATCH_SIZE = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_POLLING_BATCH_SIZE", settings.TURNITIN_POLLING_BATCH_SIZE
+    )
+    settings.TURNITIN_POLLING_MAX_WORKERS = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_POLLING_MAX_WORKERS", settings.TURNITIN_POLLING_MAX_WORKERS
+    )
+    settings.TURNITIN_POLLING_BASE_DELAY = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_POLLING_BASE_DELAY", settings.TURNITIN_POLLING_BASE_DELAY
+    )
+    settings.TURNITIN_POLLING_MAX_DELAY = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_POLLING_MAX_DELAY", settings.TURNITIN_POLLING_MAX_DELAY
+    )
+    settings.TURNITIN_POLLING_DEADLINE = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_POLLING_DEADLINE", settings.TURNITIN_POLLING_DEADLINE
+    )
+    settings.TURNITIN_SIMILARITY_REPORT_MAX_ATTEMPTS = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_SIMILARITY_REPORT_MAX_ATTEMPTS", settings.TURNITIN_SIMILARITY_REPORT_MAX_ATTEMPTS
+    )
+    settings.TURNITIN_OUTBOX_DRAIN_INTERVAL = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_OUTBOX_DRAIN_INTERVAL", settings.TURNITIN_OUTBOX_DRAIN_INTERVAL
+    )
+    settings.TURNITIN_OUTBOX_DRAIN_BATCH_SIZE = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_OUTBOX_DRAIN_BATCH_SIZE", settings.TURNITIN_OUTBOX_DRAIN_BATCH_SIZE
+    )
+    settings.TURNITIN_OUTBOX_RETRY_DELAY = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_OUTBOX_RETRY_DELAY", settings.TURNITIN_OUTBOX_RETRY_DELAY
+    )
+    settings.TURNITIN_OUTBOX_MAX_DELAY = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_OUTBOX_MAX_DELAY", settings.TURNITIN_OUTBOX_MAX_DELAY
+    )
+    settings.TURNITIN_MAX_FILE_SIZE = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_MAX_FILE_SIZE", settings.TURNITIN_MAX_FILE_SIZE
+    )
+    settings.TURNITIN_UPLOAD_MAX_MEMORY_SIZE = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_UPLOAD_MAX_MEMORY_SIZE", settings.TURNITIN_UPLOAD_MAX_MEMORY_SIZE
+    )
+    settings.TURNITIN_FILE_STORAGE_CLASS = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_FILE_STORAGE_CLASS", settings.TURNITIN_FILE_STORAGE_CLASS
+    )
+    settings.TURNITIN_FILE_STORAGE_OPTIONS = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_FILE_STORAGE_OPTIONS", settings.TURNITIN_FILE_STORAGE_OPTIONS
+    )
+    settings.TURNITIN_FILE_STORAGE_URL_PREFIX = getattr(settings, "ENV_TOKENS", {}).get(
+        "TURNITIN_FILE_STORAGE_URL_PREFIX", settings.TURNITIN_FILE_STORAGE_URL_PREFIX
+    )
+    settings.CELERYBEAT_SCHEDULE[POLLING_BEAT_SCHEDULE_NAME]["schedule"] = settings.TURNITIN_POLLING_INTERVAL
+    settings.CELERYBEAT_SCHEDULE[OUTBOX_BEAT_SCHEDULE_NAME]["schedule"] = settings.TURNITIN_OUTBOX_DRAIN_INTERVAL
     settings.PLATFORM_PLUGIN_TURNITIN_AUTHENTICATION_BACKEND = getattr(settings, "ENV_TOKENS", {}).get(
         "PLATFORM_PLUGIN_TURNITIN_AUTHENTICATION_BACKEND",
         settings.PLATFORM_PLUGIN_TURNITIN_AUTHENTICATION_BACKEND,
@@ -53,4 +197,8 @@ def plugin_settings(settings):
         "PLATFORM_PLUGIN_TURNITIN_MODULESTORE_BACKEND",
         settings.PLATFORM_PLUGIN_TURNITIN_MODULESTORE_BACKEND,
     )
+    settings.PLATFORM_PLUGIN_TURNITIN_SUBMISSIONS_BACKEND = getattr(settings, "ENV_TOKENS", {}).get(
+        "PLATFORM_PLUGIN_TURNITIN_SUBMISSIONS_BACKEND",
+        settings.PLATFORM_PLUGIN_TURNITIN_SUBMISSIONS_BACKEND,
+    )
     settings.MAKO_TEMPLATE_DIRS_BASE.append(ROOT_DIRECTORY / "templates/turnitin")
@@ -0,0 +1,79 @@
+"""
+Access to the files uploaded to ORA submissions through a Django storage backend.
+
+By default the files are downloaded from the LMS. When `TURNITIN_FILE_STORAGE_CLASS`
+is set, the URLs whose path starts with `TURNITIN_FILE_STORAGE_URL_PREFIX` are
+resolved to keys of that storage (e.g. the local filesystem or an S3 bucket) and
+read from it. Only the path is matched, so relative URLs of the LMS and absolute
+presigned URLs of a bucket are both supported.
+"""
+
+from logging import getLogger
+from typing import Optional
+from urllib.parse import unquote, urlparse
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import Storage
+from django.utils.module_loading import import_string
+
+log = getLogger(__name__)
+
+
+def get_file_storage() -> Optional[Storage]:
+    """
+    Return the storage backend holding the files uploaded to ORA submissions.
+
+    Returns:
+        Optional[Storage]: The storage built from `TURNITIN_FILE_STORAGE_CLASS` and
+            `TURNITIN_FILE_STORAGE_OPTIONS`, or None if it is not configured.
+    """
+    storage_class = getattr(settings, "TURNITIN_FILE_STORAGE_CLASS", None)
+    if not storage_class:
+        return None
+    return import_string(storage_class)(**getattr(settings, "TURNITIN_FILE_STORAGE_OPTIONS", {}))
+
+
+def get_file_key(file_url: str) -> Optional[str]:
+    """
+    Return the storage key of the file behind an ORA file URL.
+
+    Example:
+        >>> get_file_key("/openassessment/storage/student%2Fcourse%2Fblock?token=abc")
+        'student/course/block'
+
+    Args:
+        file_url (str): The URL of the file.
+
+    Returns:
+        Optional[str]: The key, or None if the path of the URL does not start with
+            `TURNITIN_FILE_STORAGE_URL_PREFIX`.
+    """
+    prefix = getattr(settings, "TURNITIN_FILE_STORAGE_URL_PREFIX", "")
+    path = urlparse(file_url).path
+    if not path.startswith(prefix):
+        return None
+    key_start = len(prefix)
+    return unquote(path[key_start:])
+
+
+def open_stored_file(file_url: str) -> Optional[File]:
+    """
+    Open the file behind an ORA file URL from the storage backend.
+
+    Args:
+        file_url (str): The URL of the file.
+
+    Returns:
+        Optional[File]: The file opened in binary mode, or None if it must be downloaded instead.
+    """
+    storage = get_file_storage()
+    if storage is None:
+        return None
+
+    key = get_file_key(file_url)
+    if not key or not storage.exists(key):
+        log.info(f"File [{file_url}] is not in the storage backend, downloading it instead.")
+        return None
+
+    return storage.open(key, "rb")
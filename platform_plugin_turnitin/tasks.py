@@ -1,25 +1,52 @@
 """This module contains the tasks that will be run by celery."""
 
+import hashlib
+import io
+import os
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from datetime import timedelta
 from logging import getLogger
-from time import sleep
-from typing import List
+from typing import IO, Iterable, Iterator, List, Optional, Tuple, Union
 from urllib.parse import urljoin
 
 import requests
-from celery import shared_task
+from celery import group, shared_task
 from django.conf import settings
-from rest_framework import status
-from rest_framework.response import Response
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
 
 from platform_plugin_turnitin.api.v1.views import TurnitinClient
 from platform_plugin_turnitin.constants import (
     ALLOWED_FILE_EXTENSIONS,
-    MAX_REQUEST_RETRIES,
+    DOWNLOAD_CHUNK_SIZE,
+    IDEMPOTENCY_CLAIM_TIMEOUT,
+    OUTBOX_LOCK_KEY,
+    OUTBOX_LOCK_TIMEOUT,
+    POLLING_LOCK_KEY,
+    POLLING_LOCK_TIMEOUT,
     REQUEST_TIMEOUT,
-    SECONDS_TO_WAIT_BETWEEN_RETRIES,
+    UPLOAD_MAX_RETRIES,
 )
 from platform_plugin_turnitin.edxapp_wrapper import user_by_anonymous_id
+from platform_plugin_turnitin.models import TurnitinOutboxEntry, TurnitinSubmission
+from platform_plugin_turnitin.pipeline import (
+    fetch_similarity_report_info,
+    fetch_submission_info,
+    refresh_stored_info,
+    request_similarity_report,
+    schedule_next_poll,
+    update_similarity_report_info,
+    update_submission_status,
+)
+from platform_plugin_turnitin.storage import open_stored_file
+from platform_plugin_turnitin.turnitin_client.circuit_breaker import is_circuit_open
+from platform_plugin_turnitin.turnitin_client.exceptions import TurnitinClientError
+from platform_plugin_turnitin.utils import get_course_id
+from platform_plugin_turnitin.webhooks import process_webhook_event, webhooks_enabled
 
 log = getLogger(__name__)
 
@@ -31,161 +58,873 @@ def ora_submission_created_task(
     parts: List[dict],
     file_names: List[str],
     file_urls: List[str],
+    ora_block_id: Optional[str] = None,
 ) -> None:
     """
     Task to handle the creation of a new ora submission.
 
+    Each text part and each uploaded file is sent to Turnitin by its own subtask,
+    so they are uploaded in parallel. Once uploaded, `poll_pending_submissions_task`
+    follows them until their similarity reports are requested.
+
+    Every part and file gets an idempotency key, so a redelivered event is a no-op
+    and concurrent workers never upload the same unit twice. Units already uploaded
+    are skipped, so a retried submission only redoes the units that failed.
+
     Args:
         submission_uuid (str): The ORA submission UUID.
         anonymous_user_id (str): The anonymous user ID.
         parts (List[dict]): The parts of the submission with the answers.
         file_names (List[str]): The list of file names.
         file_urls (List[str]): The list of file URLs.
+        ora_block_id (str, optional): The usage key of the ORA block.
+    """
+    pending_tasks = get_pending_upload_tasks(
+        submission_uuid, anonymous_user_id, parts, file_names, file_urls, ora_block_id
+    )
+
+    if pending_tasks:
+        group(pending_tasks).apply_async()
+
+
+@shared_task(autoretry_for=(Exception,), retry_backoff=True, max_retries=UPLOAD_MAX_RETRIES)
+def send_text_part_to_turnitin_task(
+    submission_uuid: str,
+    anonymous_user_id: str,
+    text: str,
+    idx: int,
+    ora_block_id: Optional[str] = None,
+    idempotency_key: Optional[str] = None,
+) -> None:
+    """
+    Task to send a text part of an ORA submission to Turnitin.
+
+    Args:
+        submission_uuid (str): The ORA submission UUID.
+        anonymous_user_id (str): The anonymous user ID.
+        text (str): The answer of the part.
+        idx (int): The position of the part in the submission, starting from 1.
+        ora_block_id (str, optional): The usage key of the ORA block.
+        idempotency_key (str, optional): The key identifying the part across deliveries.
     """
     user = user_by_anonymous_id(anonymous_user_id)
+    send_text_part_to_turnitin(submission_uuid, user, text, idx, ora_block_id, idempotency_key)
 
-    send_text_to_turnitin(submission_uuid, user, parts)
-    send_uploaded_files_to_turnitin(submission_uuid, user, file_names, file_urls)
 
-    for _ in range(MAX_REQUEST_RETRIES):
-        if is_submission_complete(submission_uuid, user):
-            generate_similarity_report(submission_uuid, user)
-            break
-        sleep(SECONDS_TO_WAIT_BETWEEN_RETRIES)
+@shared_task(autoretry_for=(Exception,), retry_backoff=True, max_retries=UPLOAD_MAX_RETRIES)
+def send_uploaded_file_to_turnitin_task(
+    submission_uuid: str,
+    anonymous_user_id: str,
+    file_name: str,
+    file_url: str,
+    ora_block_id: Optional[str] = None,
+    idempotency_key: Optional[str] = None,
+) -> None:
+    """
+    Task to send a file uploaded to an ORA submission to Turnitin.
+
+    Args:
+        submission_uuid (str): The ORA submission UUID.
+        anonymous_user_id (str): The anonymous user ID.
+        file_name (str): The name of the file.
+        file_url (str): The URL of the file.
+        ora_block_id (str, optional): The usage key of the ORA block.
+        idempotency_key (str, optional): The key identifying the file across deliveries.
+    """
+    user = user_by_anonymous_id(anonymous_user_id)
+    send_uploaded_file_to_turnitin(submission_uuid, user, file_name, file_url, ora_block_id, idempotency_key)
+
+
+@shared_task
+def poll_pending_submissions_task() -> None:
+    """
+    Periodic task to advance every Turnitin submission still being processed.
+
+    A single run checks all the pending submissions in batches with bounded
+    concurrency, so polling costs a handful of worker slots whatever the number
+    of submissions in flight. Runs never overlap: a run started while another one
+    holds the lock does nothing.
+    """
+    if not cache.add(POLLING_LOCK_KEY, True, POLLING_LOCK_TIMEOUT):
+        log.info("Skipping the Turnitin polling because another run is in progress.")
+        return
+
+    try:
+        polled = poll_pending_submissions()
+        requested = request_pending_similarity_reports()
+        log.info(f"Polled {polled} Turnitin submissions and requested {requested} similarity reports.")
+    finally:
+        cache.delete(POLLING_LOCK_KEY)
 
 
-def send_text_to_turnitin(ora_submission_uuid: str, user, parts: List[dict]) -> None:
+@shared_task
+def process_webhook_event_task(event_type: str, payload: dict) -> None:
     """
-    Task to send text to Turnitin.
+    Task to advance the Turnitin pipeline from a webhook event.
 
     Args:
-        ora_submission_uuid (str): The ORA submission UUID.
-        user (User): The user who made the submission.
-        parts (List[dict]): The answer of the submission.
+        event_type (str): The type of the event, e.g. SUBMISSION_COMPLETE.
+        payload (dict): The body of the webhook request.
     """
-    for idx, part in enumerate(parts, 1):
-        text_content = part.get("text").encode("utf-8")
-        send_file_to_turnitin(ora_submission_uuid, user, text_content, f"Student's Text Response Part {idx}.txt")
+    process_webhook_event(event_type, payload)
 
 
-def send_uploaded_files_to_turnitin(
-    ora_submission_uuid: str, user, file_names: List[str], file_urls: List[str]
-) -> None:
+@shared_task
+def refresh_stored_info_task(kind: str, turnitin_submission_ids: List[str]) -> None:
     """
-    Task to send uploaded files to Turnitin.
+    Task to refresh the stored Turnitin information served stale by the API.
 
     Args:
-        ora_submission_uuid (str): The ORA submission UUID.
-        user (User): The user who made the submission.
-        file_names (List[str]): The list of file names.
-        file_urls (List[str]): The list of file URLs.
+        kind (str): SUBMISSION_INFO or SIMILARITY_REPORT_INFO.
+        turnitin_submission_ids (List[str]): The unique identifiers for the submissions in Turnitin.
+    """
+    refreshed = refresh_stored_info(kind, turnitin_submission_ids)
+    log.info(f"Refreshed the {kind} of {refreshed} of {len(turnitin_submission_ids)} Turnitin submissions.")
+
+
+@shared_task
+def drain_outbox_task() -> None:
+    """
+    Periodic task to send again the ORA submissions of the outbox not fully uploaded.
+
+    Runs never overlap: a run started while another one holds the lock does nothing.
     """
-    base_url = getattr(settings, "LMS_ROOT_URL", "")
+    if not cache.add(OUTBOX_LOCK_KEY, True, OUTBOX_LOCK_TIMEOUT):
+        log.info("Skipping the Turnitin outbox because another run is in progress.")
+        return
+
+    try:
+        sent = drain_outbox()
+        log.info(f"Sent {sent} ORA submissions again from the Turnitin outbox.")
+    finally:
+        cache.delete(OUTBOX_LOCK_KEY)
+
 
-    for file_name, file_url in zip(file_names, file_urls):
-        file_extension = file_name.split(".")[-1]
+def get_pending_upload_tasks(
+    submission_uuid: str,
+    anonymous_user_id: str,
+    parts: List[dict],
+    file_names: List[str],
+    file_urls: List[str],
+    ora_block_id: Optional[str] = None,
+) -> list:
+    """
+    Return the upload subtasks of the parts and files of a submission not uploaded yet.
 
-        if file_extension in ALLOWED_FILE_EXTENSIONS:
-            file_link = urljoin(base_url, file_url)
-            response = requests.get(file_link, timeout=REQUEST_TIMEOUT)
+    Args:
+        submission_uuid (str): The ORA submission UUID.
+        anonymous_user_id (str): The anonymous user ID.
+        parts (List[dict]): The parts of the submission with the answers.
+        file_names (List[str]): The list of file names.
+        file_urls (List[str]): The list of file URLs.
+        ora_block_id (str, optional): The usage key of the ORA block.
 
-            if response.ok:
-                send_file_to_turnitin(ora_submission_uuid, user, response.content, file_name)
-            else:
-                raise Exception(f"Failed to download file from {file_link}")
+    Returns:
+        list: The signatures of the subtasks, empty if everything was uploaded.
+    """
+    upload_tasks = {
+        get_idempotency_key(submission_uuid, "part", idx): send_text_part_to_turnitin_task.si(
+            submission_uuid,
+            anonymous_user_id,
+            part.get("text"),
+            idx,
+            ora_block_id,
+            get_idempotency_key(submission_uuid, "part", idx),
+        )
+        for idx, part in enumerate(parts, 1)
+    }
+
+    for idx, (file_name, file_url) in enumerate(zip(file_names, file_urls), 1):
+        if is_allowed_file(file_name):
+            upload_tasks[get_idempotency_key(submission_uuid, "file", idx)] = send_uploaded_file_to_turnitin_task.si(
+                submission_uuid,
+                anonymous_user_id,
+                file_name,
+                file_url,
+                ora_block_id,
+                get_idempotency_key(submission_uuid, "file", idx),
+            )
         else:
             log.info(f"Skipping uploading file [{file_name}] because it has not an allowed extension.")
 
+    if not upload_tasks:
+        log.info(f"Submission [{submission_uuid}] has nothing to send to Turnitin.")
+        return []
+
+    uploaded_keys = set(
+        TurnitinSubmission.objects.filter(idempotency_key__in=upload_tasks.keys())
+        .exclude(status=TurnitinSubmission.Status.CREATED)
+        .values_list("idempotency_key", flat=True)
+    )
+    pending_tasks = [task for key, task in upload_tasks.items() if key not in uploaded_keys]
 
-def send_file_to_turnitin(submission_id: str, user, file_content: bytes, filename: str) -> None:
+    if not pending_tasks:
+        log.info(f"Submission [{submission_uuid}] was already sent to Turnitin.")
+
+    return pending_tasks
+
+
+def get_idempotency_key(ora_submission_uuid: str, unit: str, idx: int) -> str:
     """
-    Send a file to Turnitin.
+    Return the idempotency key of a part or file of an ORA submission.
 
-    Create a temporary file with the content and upload it to Turnitin
-    creating a new submission.
+    Args:
+        ora_submission_uuid (str): The ORA submission UUID.
+        unit (str): The kind of unit, either "part" or "file".
+        idx (int): The position of the unit in the submission, starting from 1.
+
+    Returns:
+        str: The idempotency key.
+    """
+    return f"{ora_submission_uuid}:{unit}:{idx}"
+
+
+def is_allowed_file(file_name: str) -> bool:
+    """
+    Check if the file can be sent to Turnitin according to its extension.
 
     Args:
-        submission_id (str): The ORA submission UUID.
-        user (User): The user who made the submission.
-        file_content (bytes): The content of the file.
-        filename (str): The name of the file.
+        file_name (str): The name of the file.
+
+    Returns:
+        bool: True if the extension of the file is allowed, False otherwise.
     """
-    with tempfile.NamedTemporaryFile() as temp_file:
-        temp_file.write(file_content)
-        temp_file.seek(0)
-        temp_file.name = filename
-        upload_turnitin_submission(submission_id, user, temp_file)
+    return file_name.split(".")[-1] in ALLOWED_FILE_EXTENSIONS
 
 
-def upload_turnitin_submission(ora_submission_uuid: str, user, file) -> None:
+def send_text_part_to_turnitin(
+    ora_submission_uuid: str,
+    user,
+    text: str,
+    idx: int,
+    ora_block_id: Optional[str] = None,
+    idempotency_key: Optional[str] = None,
+) -> None:
     """
-    Create a new submission in Turnitin.
+    Send a text part of the submission to Turnitin.
 
-    First, the user must accept the EULA agreement. Then, the file is uploaded to Turnitin.
+    Args:
+        ora_submission_uuid (str): The ORA submission UUID.
+        user (User): The user who made the submission.
+        text (str): The answer of the part.
+        idx (int): The position of the part in the submission, starting from 1.
+        ora_block_id (str, optional): The usage key of the ORA block.
+        idempotency_key (str, optional): The key identifying the part across deliveries.
+    """
+    send_file_to_turnitin(
+        ora_submission_uuid,
+        user,
+        text.encode("utf-8"),
+        f"Student's Text Response Part {idx}.txt",
+        ora_block_id,
+        idempotency_key,
+    )
+
+
+def send_uploaded_file_to_turnitin(
+    ora_submission_uuid: str,
+    user,
+    file_name: str,
+    file_url: str,
+    ora_block_id: Optional[str] = None,
+    idempotency_key: Optional[str] = None,
+) -> None:
+    """
+    Download a file uploaded to the submission and send it to Turnitin.
+
+    The file is read from the storage backend if it is configured, or downloaded from
+    the LMS otherwise. It is streamed in chunks and hashed on the fly. A file announcing
+    a size up to `TURNITIN_UPLOAD_MAX_MEMORY_SIZE` bytes is kept in memory, so it never
+    touches the disk, while any other file is spooled to an anonymous temporary file.
+    A file larger than `TURNITIN_MAX_FILE_SIZE` bytes is not sent: the download is aborted
+    and the unit is marked as ERROR. A file already sent or claimed by another worker is
+    not downloaded at all.
 
     Args:
         ora_submission_uuid (str): The ORA submission UUID.
         user (User): The user who made the submission.
-        file (File): The file to upload.
+        file_name (str): The name of the file.
+        file_url (str): The URL of the file.
+        ora_block_id (str, optional): The usage key of the ORA block.
+        idempotency_key (str, optional): The key identifying the file across deliveries.
+    """
+    if idempotency_key and is_turnitin_submission_claimed(idempotency_key):
+        log.info(f"Skipping file [{file_name}] of submission [{ora_submission_uuid}] because it was already claimed.")
+        return
+
+    with ExitStack() as stack:
+        with open_uploaded_file(file_url) as (chunks, expected_size):
+            spool_file = stack.enter_context(create_spool_file(expected_size))
+            content_hash = write_chunks(chunks, spool_file, expected_size)
+
+        if content_hash is None:
+            reject_file(ora_submission_uuid, user, file_name, ora_block_id, idempotency_key)
+            return
+
+        send_file_to_turnitin(
+            ora_submission_uuid, user, spool_file, file_name, ora_block_id, idempotency_key, content_hash
+        )
+
+
+@contextmanager
+def open_uploaded_file(file_url: str) -> Iterator[Tuple[Iterable[bytes], int]]:
+    """
+    Open a file uploaded to a submission for streaming.
+
+    Args:
+        file_url (str): The URL of the file, relative to the LMS.
+
+    Yields:
+        Tuple[Iterable[bytes], int]: The chunks of the content and the size announced by
+            the source, 0 if unknown.
+    """
+    stored_file = open_stored_file(file_url)
+    if stored_file is not None:
+        with stored_file:
+            yield stored_file.chunks(DOWNLOAD_CHUNK_SIZE), stored_file.size
+        return
+
+    file_link = urljoin(getattr(settings, "LMS_ROOT_URL", ""), file_url)
+    with requests.get(file_link, stream=True, timeout=REQUEST_TIMEOUT) as response:
+        if not response.ok:
+            raise Exception(f"Failed to download file from {file_link}")
+
+        yield (
+            response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE),
+            int(response.headers.get("Content-Length") or 0),
+        )
+
+
+def create_spool_file(expected_size: int = 0) -> IO[bytes]:
     """
-    turnitin_client = TurnitinClient(user, file)
+    Return an empty binary file to spool a download to.
+
+    Args:
+        expected_size (int): The size announced by the source, 0 if unknown.
 
-    agreement_response = turnitin_client.accept_eula_agreement()
+    Returns:
+        IO[bytes]: An in-memory buffer if the size is known and at most
+            `TURNITIN_UPLOAD_MAX_MEMORY_SIZE` bytes, an anonymous temporary file otherwise.
+    """
+    max_memory_size = getattr(settings, "TURNITIN_UPLOAD_MAX_MEMORY_SIZE", 2621440)
+    if 0 < expected_size <= max_memory_size:
+        return io.BytesIO()
+    return tempfile.TemporaryFile()
 
-    if not agreement_response.ok:
-        raise Exception("Failed to accept the EULA agreement.")
 
-    turnitin_client.upload_turnitin_submission_file(ora_submission_uuid)
+def write_chunks(chunks: Iterable[bytes], file: IO[bytes], expected_size: int = 0) -> Optional[str]:
+    """
+    Write chunks of content to a binary file, hashing them on the fly.
 
+    Args:
+        chunks (Iterable[bytes]): The content.
+        file (IO[bytes]): The file to write the content to, rewound at the end.
+        expected_size (int): The size announced by the source, 0 if unknown.
 
-def is_submission_complete(ora_submission_uuid: str, user) -> bool:
+    Returns:
+        Optional[str]: The SHA-256 hex digest of the content, or None as soon as the content is
+            known to be larger than `TURNITIN_MAX_FILE_SIZE` bytes.
+    """
+    max_size = getattr(settings, "TURNITIN_MAX_FILE_SIZE", 100 * 1024 * 1024)
+    if expected_size > max_size:
+        return None
+
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        if size > max_size:
+            return None
+        digest.update(chunk)
+        file.write(chunk)
+
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def reject_file(
+    ora_submission_uuid: str,
+    user,
+    file_name: str,
+    ora_block_id: Optional[str] = None,
+    idempotency_key: Optional[str] = None,
+) -> None:
     """
-    Check if the submission is complete.
+    Mark a file too large for Turnitin as ERROR, so it is not downloaded again.
 
     Args:
         ora_submission_uuid (str): The ORA submission UUID.
         user (User): The user who made the submission.
+        file_name (str): The name of the file.
+        ora_block_id (str, optional): The usage key of the ORA block.
+        idempotency_key (str, optional): The key identifying the file across deliveries.
+    """
+    max_size = getattr(settings, "TURNITIN_MAX_FILE_SIZE", 100 * 1024 * 1024)
+    error_message = f"The file is larger than the maximum of {max_size} bytes."
+    log.warning(f"Skipping file [{file_name}] of submission [{ora_submission_uuid}]: {error_message}")
+
+    if idempotency_key:
+        claimed_submission = claim_turnitin_submission(
+            idempotency_key, user, ora_submission_uuid, file_name, ora_block_id
+        )
+        if claimed_submission is not None:
+            claimed_submission.set_status(TurnitinSubmission.Status.ERROR, error_message)
+
+
+def send_file_to_turnitin(
+    submission_id: str,
+    user,
+    file_content: Union[bytes, IO[bytes]],
+    filename: str,
+    ora_block_id: Optional[str] = None,
+    idempotency_key: Optional[str] = None,
+    content_hash: Optional[str] = None,
+) -> None:
+    """
+    Send a file to Turnitin.
+
+    If an idempotency key is given, the unit is claimed first and nothing is done
+    if it was already sent or another worker is sending it. On failure the claim is
+    released but the row is kept, so a retry resumes from the last checkpoint
+    instead of creating another Turnitin submission. If the user already sent
+    the same content to Turnitin for the same ORA block, the existing Turnitin
+    submission is reused. Otherwise, upload the content to Turnitin creating a new
+    submission. A binary file is uploaded as is, while bytes are wrapped in an
+    in-memory buffer, so text parts never touch the disk.
+
+    Args:
+        submission_id (str): The ORA submission UUID.
+        user (User): The user who made the submission.
+        file_content (Union[bytes, IO[bytes]]): The content of the file, or a binary file
+            positioned at its start.
+        filename (str): The name of the file.
+        ora_block_id (str, optional): The usage key of the ORA block.
+        idempotency_key (str, optional): The key identifying the unit across deliveries.
+        content_hash (str, optional): The SHA-256 hex digest of the content, if already known.
+    """
+    if isinstance(file_content, bytes):
+        file_size = len(file_content)
+        content_hash = content_hash or hashlib.sha256(file_content).hexdigest()
+    else:
+        file_size = file_content.seek(0, os.SEEK_END)
+        file_content.seek(0)
+        content_hash = content_hash or hash_file(file_content)
+    claimed_submission = None
+
+    if idempotency_key:
+        claimed_submission = claim_turnitin_submission(
+            idempotency_key, user, submission_id, filename, ora_block_id, file_size
+        )
+        if claimed_submission is None:
+            log.info(f"Skipping file [{filename}] of submission [{submission_id}] because it was already claimed.")
+            return
+
+    try:
+        if reuse_turnitin_submission(submission_id, user, filename, ora_block_id, content_hash, claimed_submission):
+            return
+
+        if isinstance(file_content, bytes):
+            file_content = io.BytesIO(file_content)
+
+        upload_turnitin_submission(
+            submission_id, user, file_content, ora_block_id, content_hash, claimed_submission, filename
+        )
+    except Exception as error:
+        if claimed_submission is not None:
+            TurnitinSubmission.objects.filter(pk=claimed_submission.pk).update(
+                claimed_at=None, error_message=str(error)
+            )
+        raise
+
+
+def hash_file(file: IO[bytes]) -> str:
+    """
+    Return the SHA-256 hex digest of a binary file, read in chunks.
+
+    Args:
+        file (IO[bytes]): The file, rewound at the end.
 
     Returns:
-        bool: True if the submission is complete, False otherwise.
+        str: The hex digest of the content.
     """
-    submission_response = get_submission_status(ora_submission_uuid, user)
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: file.read(DOWNLOAD_CHUNK_SIZE), b""):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
 
-    if submission_response.status_code != status.HTTP_200_OK:
-        return False
 
-    is_complete = all(submission.get("status") in ["COMPLETE", "ERROR"] for submission in submission_response.data)
+def is_turnitin_submission_claimed(idempotency_key: str) -> bool:
+    """
+    Check if a part or file of an ORA submission is already sent or claimed by another worker.
 
-    if is_complete:
-        log.info(f"Submission [{ora_submission_uuid}] is complete.")
-        return True
+    This is a cheap read to skip the download of a file before claiming it; only
+    `claim_turnitin_submission` makes the atomic claim.
 
-    log.info(f"Submission [{ora_submission_uuid}] is not complete. Checking again...")
-    return False
+    Args:
+        idempotency_key (str): The key identifying the unit across deliveries.
 
+    Returns:
+        bool: True if `claim_turnitin_submission` would not claim the unit now.
+    """
+    stale_claimed_at = timezone.now() - timedelta(seconds=IDEMPOTENCY_CLAIM_TIMEOUT)
+    return (
+        TurnitinSubmission.objects.filter(idempotency_key=idempotency_key)
+        .exclude(
+            Q(status=TurnitinSubmission.Status.CREATED)
+            & (Q(claimed_at__isnull=True) | Q(claimed_at__lt=stale_claimed_at))
+        )
+        .exists()
+    )
+
+
+def claim_turnitin_submission(
+    idempotency_key: str,
+    user,
+    ora_submission_uuid: str,
+    file_name: str,
+    ora_block_id: Optional[str],
+    file_size: Optional[int] = None,
+) -> Optional[TurnitinSubmission]:
+    """
+    Atomically claim a part or file of an ORA submission for the current worker.
+
+    The claim is a `TurnitinSubmission` row with a unique idempotency key. A row
+    that was not uploaded yet can be claimed again once it was released by a failed
+    attempt, or after `IDEMPOTENCY_CLAIM_TIMEOUT` seconds if its worker died.
+
+    Args:
+        idempotency_key (str): The key identifying the unit across deliveries.
+        user (User): The user who made the submission.
+        ora_submission_uuid (str): The ORA submission UUID.
+        file_name (str): The name of the file.
+        ora_block_id (str, optional): The usage key of the ORA block.
+        file_size (int, optional): The size in bytes of the content.
 
-def get_submission_status(ora_submission_uuid: str, user) -> Response:
+    Returns:
+        Optional[TurnitinSubmission]: The claimed row, or None if the unit is
+            already sent or claimed by another worker.
+    """
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            return TurnitinSubmission.objects.create(
+                user=user,
+                ora_submission_id=ora_submission_uuid,
+                ora_block_id=ora_block_id,
+                course_id=get_course_id(ora_block_id),
+                file_name=file_name,
+                file_size=file_size,
+                idempotency_key=idempotency_key,
+                claimed_at=now,
+            )
+    except IntegrityError:
+        pass
+
+    taken_over = (
+        TurnitinSubmission.objects.filter(idempotency_key=idempotency_key, status=TurnitinSubmission.Status.CREATED)
+        .filter(Q(claimed_at__isnull=True) | Q(claimed_at__lt=now - timedelta(seconds=IDEMPOTENCY_CLAIM_TIMEOUT)))
+        .update(claimed_at=now)
+    )
+
+    if taken_over:
+        return TurnitinSubmission.objects.get(idempotency_key=idempotency_key)
+    return None
+
+
+def reuse_turnitin_submission(
+    ora_submission_uuid: str,
+    user,
+    file_name: str,
+    ora_block_id: Optional[str],
+    content_hash: str,
+    claimed_submission: Optional[TurnitinSubmission] = None,
+) -> bool:
     """
-    Handle the retrieval of the submission information for a Turnitin submission.
+    Link the ORA submission to an existing Turnitin submission with the same content.
+
+    Only Turnitin submissions that were uploaded and did not fail are reused, and
+    the new row starts from the same step of the pipeline with the information
+    already stored about the Turnitin submission and its similarity report.
 
     Args:
         ora_submission_uuid (str): The ORA submission UUID.
         user (User): The user who made the submission.
+        file_name (str): The name of the file.
+        ora_block_id (str, optional): The usage key of the ORA block.
+        content_hash (str): The SHA-256 hex digest of the content.
+        claimed_submission (TurnitinSubmission, optional): The row claimed for this unit.
 
     Returns:
-        Response: The response from the Turnitin API.
+        bool: True if an existing Turnitin submission was reused, False otherwise.
     """
-    turnitin_client = TurnitinClient(user)
-    return turnitin_client.get_submission_status(ora_submission_uuid)
+    if not ora_block_id:
+        return False
 
+    existing_submission = (
+        TurnitinSubmission.objects.filter(user=user, ora_block_id=ora_block_id, content_hash=content_hash)
+        .exclude(turnitin_submission_id__isnull=True)
+        .exclude(status__in=[TurnitinSubmission.Status.CREATED, TurnitinSubmission.Status.ERROR])
+        .order_by("-created_at")
+        .first()
+    )
+    if existing_submission is None:
+        return False
 
-def generate_similarity_report(ora_submission_uuid: str, user) -> None:
+    reused_fields = {
+        field: getattr(existing_submission, field)
+        for field in (
+            "turnitin_submission_pdf_id",
+            "file_size",
+            "page_count",
+            "word_count",
+            "submission_info",
+            "submission_info_updated_at",
+            "similarity_report_info",
+            "similarity_report_info_updated_at",
+            "similarity_score",
+            "report_status",
+        )
+    }
+    if claimed_submission is not None:
+        claimed_submission.turnitin_submission_id = existing_submission.turnitin_submission_id
+        claimed_submission.content_hash = content_hash
+        for field, value in reused_fields.items():
+            setattr(claimed_submission, field, value)
+        claimed_submission.set_status(existing_submission.status)
+    else:
+        TurnitinSubmission.objects.get_or_create(
+            user=user,
+            ora_submission_id=ora_submission_uuid,
+            turnitin_submission_id=existing_submission.turnitin_submission_id,
+            defaults={
+                "file_name": file_name,
+                "ora_block_id": ora_block_id,
+                "course_id": get_course_id(ora_block_id),
+                "content_hash": content_hash,
+                "status": existing_submission.status,
+                "status_updated_at": timezone.now(),
+                **reused_fields,
+            },
+        )
+    log.info(
+        f"Reusing Turnitin submission [{existing_submission.turnitin_submission_id}] for file [{file_name}] "
+        f"of submission [{ora_submission_uuid}] because its content was already sent."
+    )
+    return True
+
+
+def upload_turnitin_submission(
+    ora_submission_uuid: str,
+    user,
+    file,
+    ora_block_id: Optional[str] = None,
+    content_hash: Optional[str] = None,
+    claimed_submission: Optional[TurnitinSubmission] = None,
+    file_name: Optional[str] = None,
+) -> None:
     """
-    Generate the similarity report for a submission.
+    Create a new submission in Turnitin.
+
+    First, the user must accept the EULA agreement, unless it was already accepted.
+    Then, the file is uploaded to Turnitin. If the claimed row did not reach the
+    UPLOADED step, an exception is raised so the task is retried from there.
 
     Args:
         ora_submission_uuid (str): The ORA submission UUID.
         user (User): The user who made the submission.
+        file (File): The file to upload.
+        ora_block_id (str, optional): The usage key of the ORA block.
+        content_hash (str, optional): The SHA-256 hex digest of the file content.
+        claimed_submission (TurnitinSubmission, optional): The row claimed for this file.
+        file_name (str, optional): The name of the file, if the file object is not named after it.
+    """
+    turnitin_client = TurnitinClient(user, file, file_name)
+
+    if not turnitin_client.is_eula_accepted():
+        agreement_response = turnitin_client.accept_eula_agreement()
+
+        if not agreement_response.ok:
+            raise Exception("Failed to accept the EULA agreement.")
+
+    turnitin_client.upload_turnitin_submission_file(
+        ora_submission_uuid, ora_block_id=ora_block_id, content_hash=content_hash, submission=claimed_submission
+    )
+
+    if claimed_submission is not None and claimed_submission.status != TurnitinSubmission.Status.UPLOADED:
+        raise Exception("Failed to upload the file to Turnitin.")
+
+
+def poll_pending_submissions() -> int:
+    """
+    Fetch and store the status of the Turnitin submissions and reports being processed.
+
+    The uploaded and processing submissions are checked for their status, and the
+    ones with a requested report for the status of the similarity report, which marks
+    them as REPORT_READY once it is complete. The Turnitin submissions are read in
+    batches of `TURNITIN_POLLING_BATCH_SIZE` and fetched by at most
+    `TURNITIN_POLLING_MAX_WORKERS` threads, while the database is only updated from
+    the calling thread. Only the submissions due for a check are polled, and the next
+    check of the ones still pending is scheduled from their size and number of
+    attempts. A check deferred by the rate limiter or the circuit breaker is not
+    counted and waits at least until they let it through. When webhooks are
+    configured, polling is a fallback, so checks are at least
+    `TURNITIN_WEBHOOK_FALLBACK_POLLING_INTERVAL` seconds apart.
+
+    Returns:
+        int: The number of Turnitin submissions polled.
+    """
+    batch_size = getattr(settings, "TURNITIN_POLLING_BATCH_SIZE", 100)
+    max_workers = getattr(settings, "TURNITIN_POLLING_MAX_WORKERS", 4)
+
+    now = timezone.now()
+    min_delay = 0
+    never_polled = Q(next_poll_at__isnull=True)
+
+    if webhooks_enabled():
+        min_delay = getattr(settings, "TURNITIN_WEBHOOK_FALLBACK_POLLING_INTERVAL", 300)
+        never_polled &= Q(status_updated_at__lte=now - timedelta(seconds=min_delay))
+
+    checks = (
+        (
+            [TurnitinSubmission.Status.UPLOADED, TurnitinSubmission.Status.PROCESSING],
+            fetch_submission_info,
+            update_submission_status,
+        ),
+        ([TurnitinSubmission.Status.REPORT_REQUESTED], fetch_similarity_report_info, update_similarity_report_info),
+    )
+
+    polled = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for statuses, fetch, store in checks:
+            turnitin_submission_ids = (
+                TurnitinSubmission.objects.filter(Q(next_poll_at__lte=now) | never_polled, status__in=statuses)
+                .order_by("turnitin_submission_id")
+                .values_list("turnitin_submission_id", flat=True)
+                .distinct()
+            )
+
+            last_turnitin_submission_id = ""
+            while True:
+                batch = list(
+                    turnitin_submission_ids.filter(turnitin_submission_id__gt=last_turnitin_submission_id)[:batch_size]
+                )
+                if not batch:
+                    break
+
+                futures = [executor.submit(fetch, turnitin_submission_id) for turnitin_submission_id in batch]
+                for turnitin_submission_id, future in zip(batch, futures):
+                    try:
+                        info = future.result()
+                    except TurnitinClientError as error:
+                        log.info(f"Deferred the check of Turnitin submission [{turnitin_submission_id}]: {error}")
+                        schedule_next_poll(
+                            turnitin_submission_id, max(min_delay, getattr(error, "retry_after", 0)), attempted=False
+                        )
+                        continue
+
+                    if info is not None:
+                        store(turnitin_submission_id, info)
+                    schedule_next_poll(turnitin_submission_id, min_delay)
+
+                polled += len(batch)
+                last_turnitin_submission_id = batch[-1]
+
+    return polled
+
+
+def request_pending_similarity_reports() -> int:
+    """
+    Request the similarity report of the complete Turnitin submissions due for a request.
+
+    At most `TURNITIN_POLLING_BATCH_SIZE` reports are requested per run, so a backlog
+    of complete submissions is spread over the next runs. The submissions whose last
+    request failed wait for the `next_poll_at` scheduled by `request_similarity_report`.
+
+    Returns:
+        int: The number of similarity reports requested.
     """
-    turnitin_client = TurnitinClient(user)
-    turnitin_client.generate_similarity_report(ora_submission_uuid)
+    batch_size = getattr(settings, "TURNITIN_POLLING_BATCH_SIZE", 100)
+
+    turnitin_submission_ids = list(
+        TurnitinSubmission.objects.filter(
+            Q(next_poll_at__isnull=True) | Q(next_poll_at__lte=timezone.now()),
+            status=TurnitinSubmission.Status.COMPLETE,
+        )
+        .order_by("turnitin_submission_id")
+        .values_list("turnitin_submission_id", flat=True)
+        .distinct()[:batch_size]
+    )
+
+    return sum(request_similarity_report(turnitin_submission_id) for turnitin_submission_id in turnitin_submission_ids)
+
+
+def get_outbox_retry_delay(attempts: int = 0) -> int:
+    """
+    Return the seconds to wait before checking an outbox entry again.
+
+    The delay starts at `TURNITIN_OUTBOX_RETRY_DELAY` seconds, so the first delivery
+    has time to finish, and doubles with each attempt up to `TURNITIN_OUTBOX_MAX_DELAY`.
+
+    Args:
+        attempts (int): The number of times the submission was sent again from the outbox.
+
+    Returns:
+        int: The delay in seconds.
+    """
+    retry_delay = getattr(settings, "TURNITIN_OUTBOX_RETRY_DELAY", 300)
+    max_delay = getattr(settings, "TURNITIN_OUTBOX_MAX_DELAY", 3600)
+    return min(max_delay, retry_delay * 2**attempts)
+
+
+def drain_outbox() -> int:
+    """
+    Send again the due ORA submissions of the outbox that are not fully uploaded.
+
+    The due entries whose parts and files are all uploaded are deleted without
+    counting against the batch. Nothing is sent while the circuit of the upload API
+    is open. Otherwise, at most `TURNITIN_OUTBOX_DRAIN_BATCH_SIZE` submissions are
+    sent again per run, spread over `TURNITIN_OUTBOX_DRAIN_INTERVAL` seconds, so the
+    backlog built during an outage does not flood Turnitin when it recovers. A batch
+    size of 0 pauses the drain.
+
+    Returns:
+        int: The number of submissions sent again.
+    """
+    batch_size = getattr(settings, "TURNITIN_OUTBOX_DRAIN_BATCH_SIZE", 20)
+    if batch_size < 1:
+        log.info("Skipping the Turnitin outbox because TURNITIN_OUTBOX_DRAIN_BATCH_SIZE is not positive.")
+        return 0
+
+    if is_circuit_open("upload"):
+        log.info("Skipping the Turnitin outbox because the Turnitin upload API is unavailable.")
+        return 0
+
+    spacing = getattr(settings, "TURNITIN_OUTBOX_DRAIN_INTERVAL", 60) / batch_size
+    now = timezone.now()
+
+    sent = 0
+    for entry in TurnitinOutboxEntry.objects.filter(next_attempt_at__lte=now).order_by("next_attempt_at").iterator():
+        if sent >= batch_size:
+            break
+
+        pending_tasks = get_pending_upload_tasks(
+            entry.ora_submission_id,
+            entry.anonymous_user_id,
+            entry.parts,
+            entry.file_names,
+            entry.file_urls,
+            entry.ora_block_id,
+        )
+        if not pending_tasks:
+            entry.delete()
+            continue
+
+        group(pending_tasks).apply_async(countdown=sent * spacing)
+        sent += 1
+
+        entry.attempts += 1
+        entry.next_attempt_at = now + timedelta(seconds=get_outbox_retry_delay(entry.attempts))
+        entry.save(update_fields=["attempts", "next_attempt_at", "updated_at"])
+
+    return sent
@@ -0,0 +1,413 @@
+"""Tests for the Turnitin API handler module."""
+
+import io
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import requests
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+
+from platform_plugin_turnitin.turnitin_client.exceptions import TurnitinRateLimited
+from platform_plugin_turnitin.turnitin_client.handlers import api_handler
+from platform_plugin_turnitin.turnitin_client.handlers.api_handler import (
+    get_request_method_func,
+    get_retry_delay,
+    get_session,
+    get_upload_body,
+    parse_retry_after,
+    reset_session,
+    retry_budget,
+    send_request,
+    turnitin_api_handler,
+)
+
+API_HANDLER_MODULE_PATH = "platform_plugin_turnitin.turnitin_client.handlers.api_handler"
+
+
+class TestSession(TestCase):
+    """Tests for the pooled session helpers."""
+
+    def setUp(self) -> None:
+        reset_session()
+
+    def tearDown(self) -> None:
+        reset_session()
+
+    def test_get_session_is_reused(self):
+        """
+        Test that `get_session` returns the same session within a process.
+
+        Expected result:
+            - Both calls return the same session object.
+        """
+        self.assertIs(get_session(), get_session())
+
+    @override_settings(TURNITIN_API_POOL_CONNECTIONS=2, TURNITIN_API_POOL_MAXSIZE=4, TURNITIN_API_POOL_BLOCK=True)
+    def test_session_pool_settings(self):
+        """
+        Test that the pooled adapter is configured from the settings.
+
+        Expected result:
+            - The HTTPS adapter uses the configured pool sizes.
+        """
+        adapter = get_session().get_adapter("https://example.com")
+
+        self.assertEqual(adapter._pool_connections, 2)  # pylint: disable=protected-access
+        self.assertEqual(adapter._pool_maxsize, 4)  # pylint: disable=protected-access
+        self.assertTrue(adapter._pool_block)  # pylint: disable=protected-access
+
+    @patch(f"{API_HANDLER_MODULE_PATH}.os.getpid")
+    def test_session_is_recreated_in_a_new_process(self, mock_getpid: Mock):
+        """
+        Test that a forked process gets its own session.
+
+        Expected result:
+            - A different process ID returns a new session.
+        """
+        mock_getpid.return_value = 1
+        parent_session = get_session()
+
+        mock_getpid.return_value = 2
+
+        self.assertIsNot(get_session(), parent_session)
+
+    def test_forget_session_after_fork(self):
+        """
+        Test that the inherited session is dropped without being closed.
+
+        Expected result:
+            - The session is not closed and a new one is created afterwards.
+        """
+        session = get_session()
+        session.close = Mock()
+
+        api_handler._forget_session_after_fork()  # pylint: disable=protected-access
+
+        session.close.assert_not_called()
+        self.assertIsNot(get_session(), session)
+
+
+class TestTurnitinApiHandler(TestCase):
+    """Tests for the `turnitin_api_handler` function."""
+
+    def test_get_request_method_func_unsupported(self):
+        """
+        Test `get_request_method_func` with an unsupported method.
+
+        Expected result:
+            - A ValueError is raised.
+        """
+        with self.assertRaises(ValueError):
+            get_request_method_func("options")
+
+    @patch(f"{API_HANDLER_MODULE_PATH}.get_session")
+    def test_get_request_uses_session(self, mock_get_session: Mock):
+        """
+        Test that GET requests are sent through the pooled session.
+
+        Expected result:
+            - `session.get` is called with the query params.
+        """
+        session = mock_get_session.return_value
+
+        response = turnitin_api_handler("get", "submissions/1", {"key": "value"})
+
+        session.get.assert_called_once()
+        self.assertEqual(session.get.call_args.kwargs["params"], {"key": "value"})
+        self.assertEqual(response, session.get.return_value)
+
+    @override_settings(TURNITIN_API_TIMEOUT=30)
+    @patch(f"{API_HANDLER_MODULE_PATH}.get_session")
+    def test_upload_uses_session(self, mock_get_session: Mock):
+        """
+        Test that uploads are sent through the pooled session.
+
+        Expected result:
+            - `session.put` is called with the file and binary headers.
+        """
+        session = mock_get_session.return_value
+        uploaded_file = Mock()
+        uploaded_file.name = "file.txt"
+
+        turnitin_api_handler("put", "submissions/1/original", is_upload=True, uploaded_file=uploaded_file)
+
+        session.put.assert_called_once()
+        self.assertEqual(session.put.call_args.kwargs["data"], uploaded_file)
+        self.assertEqual(session.put.call_args.kwargs["headers"]["Content-Type"], "binary/octet-stream")
+
+    @patch(f"{API_HANDLER_MODULE_PATH}.get_session")
+    def test_upload_file_name(self, mock_get_session: Mock):
+        """
+        Test that uploads of unnamed buffers use the given file name.
+
+        Expected result:
+            - The file name is sent in the `Content-Disposition` header.
+        """
+        session = mock_get_session.return_value
+
+        turnitin_api_handler(
+            "put", "submissions/1/original", is_upload=True, uploaded_file=io.BytesIO(b"text"), file_name="file.txt"
+        )
+
+        self.assertEqual(session.put.call_args.kwargs["headers"]["Content-Disposition"], 'inline; filename="file.txt"')
+
+    def test_upload_requires_file_name(self):
+        """
+        Test that uploads of unnamed content without a file name are rejected.
+
+        Expected result:
+            - A ValueError is raised.
+        """
+        with self.assertRaises(ValueError):
+            turnitin_api_handler("put", "submissions/1/original", is_upload=True, uploaded_file=b"text")
+
+    def test_get_upload_body(self):
+        """
+        Test `get_upload_body` with each kind of upload content.
+
+        Expected result:
+            - Buffers are sent as a memoryview and can always be sent again.
+            - Iterables of chunks report their length only if it is known and are sent once.
+            - Files are sent as is and rewound only if they are seekable.
+        """
+        body, rewind = get_upload_body(bytearray(b"text"))
+        self.assertIsInstance(body, memoryview)
+        self.assertEqual(bytes(body), b"text")
+        self.assertIsNotNone(rewind)
+
+        body, rewind = get_upload_body((chunk for chunk in [b"te", b"xt"]), content_length=4)
+        self.assertEqual(len(body), 4)
+        self.assertEqual(b"".join(body), b"text")
+        self.assertIsNone(rewind)
+
+        body, rewind = get_upload_body([b"te", b"xt"])
+        self.assertFalse(hasattr(body, "__len__"))
+        self.assertIsNone(rewind)
+
+        stream = Mock(seekable=Mock(return_value=False))
+        body, rewind = get_upload_body(stream)
+        self.assertIs(body, stream)
+        self.assertIsNone(rewind)
+
+
+@override_settings(TURNITIN_API_MAX_RETRIES=3, TURNITIN_API_RETRY_BACKOFF=0.5, TURNITIN_API_RETRY_MAX_DELAY=10)
+@patch(f"{API_HANDLER_MODULE_PATH}.time.sleep")
+@patch(f"{API_HANDLER_MODULE_PATH}.get_session")
+class TestSendRequest(SimpleTestCase):
+    """Tests for the retry policy of `send_request`."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        retry_budget.reset()
+
+    def tearDown(self) -> None:
+        retry_budget.reset()
+
+    def test_retry_gateway_error(self, mock_get_session: Mock, mock_sleep: Mock):
+        """
+        Test that an idempotent request is retried after a gateway error.
+
+        Expected result:
+            - The request is sent again and the successful response is returned.
+        """
+        session = mock_get_session.return_value
+        session.get.side_effect = [Mock(status_code=503, headers={}), Mock(status_code=200)]
+
+        response = send_request("get", "https://example.com")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(session.get.call_count, 2)
+        mock_sleep.assert_called_once()
+
+    def test_post_only_retried_when_throttled(self, mock_get_session: Mock, mock_sleep: Mock):
+        """
+        Test that a POST request is retried on 429 but not on a gateway error.
+
+        Expected result:
+            - The 429 response is retried and the 503 response is returned as is.
+        """
+        session = mock_get_session.return_value
+        session.post.side_effect = [Mock(status_code=429, headers={}), Mock(status_code=503, headers={})]
+
+        response = send_request("post", "https://example.com")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(session.post.call_count, 2)
+        mock_sleep.assert_called_once()
+
+    def test_retry_after_is_honoured(self, mock_get_session: Mock, mock_sleep: Mock):
+        """
+        Test that the `Retry-After` header sets the delay before the retry.
+
+        Expected result:
+            - The retry waits the seconds requested by Turnitin.
+            - A longer wait than `TURNITIN_API_RETRY_MAX_DELAY` is not retried.
+        """
+        session = mock_get_session.return_value
+        session.get.side_effect = [
+            Mock(status_code=429, headers={"Retry-After": "2"}),
+            Mock(status_code=429, headers={"Retry-After": "60"}),
+        ]
+
+        response = send_request("get", "https://example.com")
+
+        self.assertEqual(response.headers["Retry-After"], "60")
+        mock_sleep.assert_called_once_with(2.0)
+
+    def test_max_retries(self, mock_get_session: Mock, mock_sleep: Mock):
+        """
+        Test that a request is not retried more than `TURNITIN_API_MAX_RETRIES` times.
+
+        Expected result:
+            - The request is sent four times and the last response is returned.
+        """
+        session = mock_get_session.return_value
+        session.get.return_value = Mock(status_code=502, headers={})
+
+        response = send_request("get", "https://example.com")
+
+        self.assertEqual(response.status_code, 502)
+        self.assertEqual(session.get.call_count, 4)
+        self.assertEqual(mock_sleep.call_count, 3)
+
+    @override_settings(TURNITIN_API_RETRY_BUDGET_RATIO=0, TURNITIN_API_RETRY_BUDGET_RESERVE=1)
+    def test_retry_budget_exhausted(self, mock_get_session: Mock, mock_sleep: Mock):
+        """
+        Test that no retry is made once the retry budget is exhausted.
+
+        Expected result:
+            - Only the first failing request is retried.
+        """
+        session = mock_get_session.return_value
+        session.get.return_value = Mock(status_code=503, headers={})
+
+        send_request("get", "https://example.com")
+        send_request("get", "https://example.com")
+
+        self.assertEqual(session.get.call_count, 3)
+        mock_sleep.assert_called_once()
+
+    def test_connection_error(self, mock_get_session: Mock, mock_sleep: Mock):
+        """
+        Test that connection errors are only retried for idempotent requests.
+
+        Expected result:
+            - The GET request is retried and the POST request raises the error.
+        """
+        session = mock_get_session.return_value
+        session.get.side_effect = [requests.ConnectionError, Mock(status_code=200)]
+        session.post.side_effect = requests.ConnectionError
+
+        self.assertEqual(send_request("get", "https://example.com").status_code, 200)
+        with self.assertRaises(requests.ConnectionError):
+            send_request("post", "https://example.com")
+        mock_sleep.assert_called_once()
+
+    @patch(f"{API_HANDLER_MODULE_PATH}.record_call")
+    @patch(f"{API_HANDLER_MODULE_PATH}.before_call")
+    @patch(f"{API_HANDLER_MODULE_PATH}.acquire")
+    def test_circuit_breaker_records_every_call(
+        self, mock_acquire: Mock, mock_before_call: Mock, mock_record_call: Mock, mock_get_session: Mock, _
+    ):
+        """
+        Test that every call let through by the circuit breaker records its result.
+
+        Expected result:
+            - A call that raises any request error is recorded as failed.
+            - A call given up by the rate limiter does not go through the circuit breaker.
+        """
+        session = mock_get_session.return_value
+        session.get.side_effect = requests.exceptions.InvalidURL
+
+        with self.assertRaises(requests.exceptions.InvalidURL):
+            send_request("get", "https://example.com", bucket="status")
+
+        mock_before_call.assert_called_once_with("status")
+        mock_record_call.assert_called_once_with("status", failed=True)
+
+        mock_before_call.reset_mock()
+        mock_record_call.reset_mock()
+        mock_acquire.side_effect = TurnitinRateLimited("status", 1)
+
+        with self.assertRaises(TurnitinRateLimited):
+            send_request("get", "https://example.com", bucket="status")
+
+        mock_before_call.assert_not_called()
+        mock_record_call.assert_not_called()
+
+    def test_upload_rewinds_the_file(self, mock_get_session: Mock, mock_sleep: Mock):
+        """
+        Test that the uploaded file is rewound before the upload is retried.
+
+        Expected result:
+            - The file is sent again from the start.
+        """
+        session = mock_get_session.return_value
+        session.put.side_effect = [Mock(status_code=503, headers={}), Mock(status_code=200)]
+        uploaded_file = Mock()
+        uploaded_file.name = "file.txt"
+
+        turnitin_api_handler("put", "submissions/1/original", is_upload=True, uploaded_file=uploaded_file)
+
+        self.assertEqual(session.put.call_count, 2)
+        uploaded_file.seek.assert_called_once_with(0)
+        mock_sleep.assert_called_once()
+
+    def test_upload_stream_is_not_retried(self, mock_get_session: Mock, mock_sleep: Mock):
+        """
+        Test that an upload streamed from an iterable of chunks is sent only once.
+
+        Expected result:
+            - The failed response is returned without a retry.
+        """
+        session = mock_get_session.return_value
+        session.put.return_value = Mock(status_code=429, headers={})
+
+        response = turnitin_api_handler(
+            "put",
+            "submissions/1/original",
+            is_upload=True,
+            uploaded_file=(chunk for chunk in [b"te", b"xt"]),
+            file_name="file.txt",
+        )
+
+        self.assertEqual(response.status_code, 429)
+        session.put.assert_called_once()
+        mock_sleep.assert_not_called()
+
+
+class TestRetryDelay(TestCase):
+    """Tests for the retry delay helpers."""
+
+    def test_parse_retry_after(self):
+        """
+        Test `parse_retry_after` with seconds, an HTTP date and invalid values.
+
+        Expected result:
+            - The seconds to wait are returned, or None if the value is not valid.
+        """
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+
+        self.assertEqual(parse_retry_after("5"), 5.0)
+        self.assertAlmostEqual(parse_retry_after(format_datetime(retry_at, usegmt=True)), 30, delta=2)
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertIsNone(parse_retry_after(None))
+
+    @override_settings(TURNITIN_API_RETRY_BACKOFF=0.5, TURNITIN_API_RETRY_MAX_DELAY=10)
+    @patch(f"{API_HANDLER_MODULE_PATH}.random.uniform")
+    def test_get_retry_delay_backoff(self, mock_uniform: Mock):
+        """
+        Test that the backoff grows exponentially up to `TURNITIN_API_RETRY_MAX_DELAY`.
+
+        Expected result:
+            - The jitter is drawn between zero and the capped backoff.
+        """
+        get_retry_delay(2)
+        get_retry_delay(10)
+
+        mock_uniform.assert_any_call(0, 2.0)
+        mock_uniform.assert_any_call(0, 10)
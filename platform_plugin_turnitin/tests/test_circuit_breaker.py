@@ -0,0 +1,113 @@
+"""Tests for the Turnitin circuit breaker module."""
+
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+
+from platform_plugin_turnitin.turnitin_client.circuit_breaker import before_call, is_failed_call, record_call
+from platform_plugin_turnitin.turnitin_client.exceptions import TurnitinCircuitOpen
+
+CIRCUIT_BREAKER_MODULE_PATH = "platform_plugin_turnitin.turnitin_client.circuit_breaker"
+
+
+@override_settings(
+    TURNITIN_CIRCUIT_BREAKER_WINDOW=60,
+    TURNITIN_CIRCUIT_BREAKER_MIN_CALLS=4,
+    TURNITIN_CIRCUIT_BREAKER_FAILURE_RATE=0.5,
+    TURNITIN_CIRCUIT_BREAKER_OPEN_TIMEOUT=30,
+    TURNITIN_CIRCUIT_BREAKER_HALF_OPEN_PROBES=2,
+)
+@patch(f"{CIRCUIT_BREAKER_MODULE_PATH}.time")
+class TestCircuitBreaker(SimpleTestCase):
+    """Tests for the circuit breaker."""
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def trip(self) -> None:
+        """Record enough failed calls to open the circuit."""
+        record_call("status", failed=False)
+        record_call("status", failed=False)
+        record_call("status", failed=True)
+        record_call("status", failed=True)
+
+    def test_open_on_failure_rate(self, mock_time: Mock):
+        """
+        Test that the circuit opens once the failure rate is reached.
+
+        Expected result:
+            - The calls go through below the threshold and fail fast above it.
+            - The other endpoint families are not affected.
+        """
+        mock_time.time.return_value = 600
+        record_call("status", failed=True)
+        record_call("status", failed=True)
+
+        before_call("status")
+
+        self.trip()
+
+        with self.assertRaises(TurnitinCircuitOpen) as context:
+            before_call("status")
+        self.assertEqual(context.exception.retry_after, 30)
+        before_call("viewer")
+
+    def test_half_open_probes_close_the_circuit(self, mock_time: Mock):
+        """
+        Test that the circuit closes after successful half-open probes.
+
+        Expected result:
+            - Only the configured number of probes go through while half-open.
+            - The circuit closes once all of them succeed.
+        """
+        mock_time.time.return_value = 600
+        self.trip()
+        cache.delete("turnitin:circuit_breaker:status:open")
+
+        before_call("status")
+        before_call("status")
+        with self.assertRaises(TurnitinCircuitOpen):
+            before_call("status")
+
+        record_call("status", failed=False)
+        record_call("status", failed=False)
+
+        before_call("status")
+        before_call("status")
+        before_call("status")
+
+    def test_half_open_failure_reopens_the_circuit(self, mock_time: Mock):
+        """
+        Test that a failed half-open probe opens the circuit again.
+
+        Expected result:
+            - The calls fail fast again.
+        """
+        mock_time.time.return_value = 600
+        self.trip()
+        cache.delete("turnitin:circuit_breaker:status:open")
+
+        before_call("status")
+        record_call("status", failed=True)
+
+        with self.assertRaises(TurnitinCircuitOpen):
+            before_call("status")
+
+
+class TestIsFailedCall(SimpleTestCase):
+    """Tests for the `is_failed_call` function."""
+
+    @override_settings(TURNITIN_CIRCUIT_BREAKER_SLOW_CALL=10)
+    def test_is_failed_call(self):
+        """
+        Test which calls count as failures.
+
+        Expected result:
+            - Server errors and slow calls are failures, client errors are not.
+        """
+        self.assertTrue(is_failed_call(503, 1))
+        self.assertTrue(is_failed_call(200, 11))
+        self.assertFalse(is_failed_call(429, 1))
+        self.assertFalse(is_failed_call(200, 1))
@@ -1,8 +1,11 @@
 """ Tests for the TurnitinClient class."""
 
+from datetime import timedelta
 from unittest import TestCase
 from unittest.mock import Mock, call, patch
 
+from django.core.cache import cache
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.response import Response
 
@@ -26,10 +29,14 @@ class TestTurnitinClient(TestCase):
         self.ora_submission_id = "test-ora-submission-id"
         self.turnitin_submission_id = "test-turnitin-submission-id"
 
+    @patch(f"{VIEWS_MODULE_PATH}.TurnitinClient.remember_eula_acceptance")
     @patch(f"{VIEWS_MODULE_PATH}.get_current_datetime")
     @patch(f"{VIEWS_MODULE_PATH}.post_accept_eula_version")
     def test_accept_eula_agreement(
-        self, mock_post_accept: Mock, mock_get_current_datetime: Mock
+        self,
+        mock_post_accept: Mock,
+        mock_get_current_datetime: Mock,
+        mock_remember_eula_acceptance: Mock,
     ):
         """
         Test the `accept_eula_agreement` method.
@@ -51,8 +58,93 @@ class TestTurnitinClient(TestCase):
         result = self.turnitin_client.accept_eula_agreement()
 
         mock_post_accept.assert_called_once_with(expected_payload)
+        mock_remember_eula_acceptance.assert_called_once()
         self.assertEqual(result, expected_response)
 
+    @patch(f"{VIEWS_MODULE_PATH}.get_eula_acceptance_by_user")
+    @patch(f"{VIEWS_MODULE_PATH}.TurnitinEulaAcceptance")
+    @patch(f"{VIEWS_MODULE_PATH}.cache")
+    def test_is_eula_accepted_cached(
+        self, mock_cache: Mock, mock_model: Mock, mock_get_acceptance: Mock
+    ):
+        """
+        Test the `is_eula_accepted` method when the acceptance is cached.
+
+        Expected result:
+            - The database and Turnitin are not queried.
+        """
+        mock_cache.get.return_value = True
+
+        self.assertTrue(self.turnitin_client.is_eula_accepted())
+        mock_model.objects.filter.assert_not_called()
+        mock_get_acceptance.assert_not_called()
+
+    @patch(f"{VIEWS_MODULE_PATH}.get_eula_acceptance_by_user")
+    @patch(f"{VIEWS_MODULE_PATH}.TurnitinEulaAcceptance")
+    @patch(f"{VIEWS_MODULE_PATH}.cache")
+    def test_is_eula_accepted_stored(
+        self, mock_cache: Mock, mock_model: Mock, mock_get_acceptance: Mock
+    ):
+        """
+        Test the `is_eula_accepted` method when the acceptance is in the database.
+
+        Expected result:
+            - The acceptance is cached and Turnitin is not queried.
+        """
+        mock_cache.get.return_value = None
+        mock_model.objects.filter.return_value.exists.return_value = True
+
+        self.assertTrue(self.turnitin_client.is_eula_accepted())
+        mock_cache.set.assert_called_once()
+        mock_get_acceptance.assert_not_called()
+
+    @patch(f"{VIEWS_MODULE_PATH}.TurnitinClient.remember_eula_acceptance")
+    @patch(f"{VIEWS_MODULE_PATH}.get_eula_acceptance_by_user")
+    @patch(f"{VIEWS_MODULE_PATH}.TurnitinEulaAcceptance")
+    @patch(f"{VIEWS_MODULE_PATH}.cache")
+    def test_is_eula_accepted_in_turnitin(
+        self,
+        mock_cache: Mock,
+        mock_model: Mock,
+        mock_get_acceptance: Mock,
+        mock_remember_eula_acceptance: Mock,
+    ):
+        """
+        Test the `is_eula_accepted` method on a local miss.
+
+        Expected result:
+            - Turnitin is queried and the acceptance is stored locally if found.
+        """
+        mock_cache.get.return_value = None
+        mock_model.objects.filter.return_value.exists.return_value = False
+        mock_get_acceptance.return_value = Mock(
+            ok=True, json=Mock(return_value=[{"version": "v1beta"}])
+        )
+
+        self.assertTrue(self.turnitin_client.is_eula_accepted())
+        mock_get_acceptance.assert_called_once_with(self.user.id)
+        mock_remember_eula_acceptance.assert_called_once()
+
+        mock_get_acceptance.return_value = Mock(ok=True, json=Mock(return_value=[]))
+
+        self.assertFalse(self.turnitin_client.is_eula_accepted())
+
+    @patch(f"{VIEWS_MODULE_PATH}.TurnitinEulaAcceptance")
+    @patch(f"{VIEWS_MODULE_PATH}.cache")
+    def test_remember_eula_acceptance(self, mock_cache: Mock, mock_model: Mock):
+        """
+        Test the `remember_eula_acceptance` method.
+
+        Expected result:
+            - The acceptance is stored in the database and the cache.
+        """
+        self.turnitin_client.remember_eula_acceptance()
+
+        mock_model.objects.get_or_create.assert_called_once_with(
+            user=self.user, eula_version="v1beta"
+        )
+        mock_cache.set.assert_called_once()
+
     @patch(f"{VIEWS_MODULE_PATH}.put_upload_submission_file_content")
     @patch(f"{VIEWS_MODULE_PATH}.TurnitinSubmission")
     @patch(f"{VIEWS_MODULE_PATH}.Response")
@@ -88,13 +180,78 @@ class TestTurnitinClient(TestCase):
             ora_submission_id=self.ora_submission_id,
             turnitin_submission_id=self.turnitin_submission_id,
             file_name=self.file.name,
+            ora_block_id=None,
+            course_id=None,
+            content_hash=None,
         )
         mock_put_upload_file.assert_called_once_with(
-            self.turnitin_submission_id, self.file
+            self.turnitin_submission_id, self.file, self.file.name
         )
         mock_response.assert_called_once_with(mock_put_upload_file.return_value.json())
         self.assertEqual(result, mock_response.return_value)
 
+    @patch(f"{VIEWS_MODULE_PATH}.put_upload_submission_file_content")
+    @patch(f"{VIEWS_MODULE_PATH}.TurnitinSubmission")
+    @patch(f"{VIEWS_MODULE_PATH}.Response")
+    @patch(f"{VIEWS_MODULE_PATH}.TurnitinClient.create_turnitin_submission_object")
+    def test_upload_turnitin_submission_file_claimed(
+        self,
+        mock_create_turnitin_submission: Mock,
+        mock_response: Mock,
+        mock_model: Mock,
+        mock_put_upload_file: Mock,
+    ):
+        """
+        Test the `upload_turnitin_submission_file` method with a claimed submission.
+
+        Expected result:
+            - No new `TurnitinSubmission` is created.
+            - The claimed submission is saved with the Turnitin submission ID.
+        """
+        mock_create_turnitin_submission.return_value = Mock(
+            status_code=status.HTTP_201_CREATED,
+            json=Mock(return_value={"id": self.turnitin_submission_id}),
+        )
+        claimed_submission = Mock(turnitin_submission_id=None)
+
+        self.turnitin_client.upload_turnitin_submission_file(
+            self.ora_submission_id, content_hash="hash", submission=claimed_submission
+        )
+
+        mock_model.assert_not_called()
+        self.assertEqual(claimed_submission.turnitin_submission_id, self.turnitin_submission_id)
+        self.assertEqual(claimed_submission.content_hash, "hash")
+        claimed_submission.save.assert_called_once()
+        claimed_submission.set_status.assert_called_once_with(mock_model.Status.UPLOADED)
+
+    @patch(f"{VIEWS_MODULE_PATH}.put_upload_submission_file_content")
+    @patch(f"{VIEWS_MODULE_PATH}.TurnitinClient.create_turnitin_submission_object")
+    def test_upload_turnitin_submission_file_resumed(
+        self,
+        mock_create_turnitin_submission: Mock,
+        mock_put_upload_file: Mock,
+    ):
+        """
+        Test the `upload_turnitin_submission_file` method with a claimed submission created in Turnitin.
+
+        Expected result:
+            - No new Turnitin submission is created.
+            - The file is uploaded to the existing Turnitin submission.
+            - The submission is not marked as uploaded if the upload fails.
+        """
+        claimed_submission = Mock(turnitin_submission_id=self.turnitin_submission_id)
+        mock_put_upload_file.return_value = Mock(ok=False, json=Mock(return_value={}))
+
+        self.turnitin_client.upload_turnitin_submission_file(
+            self.ora_submission_id, submission=claimed_submission
+        )
+
+        mock_create_turnitin_submission.assert_not_called()
+        mock_put_upload_file.assert_called_once_with(
+            self.turnitin_submission_id, self.file, self.file.name
+        )
+        claimed_submission.set_status.assert_not_called()
+
     @patch(f"{VIEWS_MODULE_PATH}.put_upload_submission_file_content")
     @patch(f"{VIEWS_MODULE_PATH}.Response")
     @patch(f"{VIEWS_MODULE_PATH}.TurnitinClient.create_turnitin_submission_object")
@@ -174,10 +331,14 @@ class TestTurnitinClient(TestCase):
         mock_post_create.assert_called_once_with(expected_payload)
         self.assertEqual(result, expected_response)
 
+    @patch(f"{VIEWS_MODULE_PATH}.update_submission_status")
     @patch(f"{VIEWS_MODULE_PATH}.get_submission_info")
     @patch(f"{VIEWS_MODULE_PATH}.TurnitinClient.get_submissions")
     def test_get_submission_status_success(
-        self, mock_get_submissions: Mock, mock_get_submission_info: Mock
+        self,
+        mock_get_submissions: Mock,
+        mock_get_submission_info: Mock,
+        mock_update_submission_status: Mock,
     ):
         """
         Test the `get_submission_status` method.
@@ -186,25 +347,123 @@ class TestTurnitinClient(TestCase):
             - `get_submissions` function is called with the correct parameters
             - `get_submission_info` function is called the correct number of
                 times with the correct parameters
+            - The information of each submission is stored.
         """
-        turnitin_submission_1 = Mock(turnitin_submission_id="id1")
-        turnitin_submission_2 = Mock(turnitin_submission_id="id2")
+        turnitin_submission_1 = Mock(turnitin_submission_id="id1", submission_info=None)
+        turnitin_submission_2 = Mock(turnitin_submission_id="id2", submission_info=None)
         mock_get_submissions.return_value = [
             turnitin_submission_1,
             turnitin_submission_2,
         ]
         mock_response_1 = Mock(json=Mock(return_value={"status": "COMPLETED"}))
         mock_response_2 = Mock(json=Mock(return_value={"status": "PROCESSING"}))
-        mock_get_submission_info.side_effect = [mock_response_1, mock_response_2]
+        mock_get_submission_info.side_effect = {
+            "id1": mock_response_1,
+            "id2": mock_response_2,
+        }.get
 
         result = self.turnitin_client.get_submission_status(self.ora_submission_id)
 
         mock_get_submissions.assert_called_once_with(self.ora_submission_id)
-        mock_get_submission_info.assert_has_calls([call("id1"), call("id2")])
+        mock_get_submission_info.assert_has_calls(
+            [call("id1"), call("id2")], any_order=True
+        )
+        mock_update_submission_status.assert_has_calls(
+            [
+                call("id1", {"status": "COMPLETED"}),
+                call("id2", {"status": "PROCESSING"}),
+            ]
+        )
         self.assertEqual(
             result.data, [{"status": "COMPLETED"}, {"status": "PROCESSING"}]
         )
 
+    @patch("platform_plugin_turnitin.tasks.refresh_stored_info_task")
+    @patch(f"{VIEWS_MODULE_PATH}.get_submission_info")
+    @patch(f"{VIEWS_MODULE_PATH}.TurnitinClient.get_submissions")
+    def test_get_submission_status_stored(
+        self,
+        mock_get_submissions: Mock,
+        mock_get_submission_info: Mock,
+        mock_refresh_task: Mock,
+    ):
+        """
+        Test the `get_submission_status` method with stored information.
+
+        Expected result:
+            - Turnitin is not called and the stored information is returned.
+            - Only the stale information in progress is refreshed in the background,
+                once per TTL.
+        """
+        cache.clear()
+        now = timezone.now()
+        mock_get_submissions.return_value = [
+            Mock(
+                turnitin_submission_id="id1",
+                submission_info={"status": "COMPLETE"},
+                submission_info_updated_at=now - timedelta(days=30),
+            ),
+            Mock(
+                turnitin_submission_id="id2",
+                submission_info={"status": "PROCESSING"},
+                submission_info_updated_at=now,
+            ),
+            Mock(
+                turnitin_submission_id="id3",
+                submission_info={"status": "PROCESSING"},
+                submission_info_updated_at=now - timedelta(hours=1),
+            ),
+        ]
+
+        result = self.turnitin_client.get_submission_status(self.ora_submission_id)
+        self.turnitin_client.get_submission_status(self.ora_submission_id)
+
+        mock_get_submission_info.assert_not_called()
+        mock_refresh_task.delay.assert_called_once_with("submission_info", ["id3"])
+        self.assertEqual(
+            result.data,
+            [
+                {"status": "COMPLETE"},
+                {"status": "PROCESSING"},
+                {"status": "PROCESSING"},
+            ],
+        )
+
+    @patch(f"{VIEWS_MODULE_PATH}.update_submission_status")
+    @patch(f"{VIEWS_MODULE_PATH}.get_submission_info")
+    @patch(f"{VIEWS_MODULE_PATH}.TurnitinClient.get_submissions")
+    def test_get_submission_status_file_error(
+        self,
+        mock_get_submissions: Mock,
+        mock_get_submission_info: Mock,
+        mock_update_submission_status: Mock,
+    ):
+        """
+        Test the `get_submission_status` method when the call of one file fails.
+
+        Expected result:
+            - The other files are still returned, in order.
+            - The failed file is returned with its error.
+        """
+        mock_get_submissions.return_value = [
+            Mock(turnitin_submission_id="id1", submission_info=None),
+            Mock(turnitin_submission_id="id2", submission_info=None),
+        ]
+        mock_get_submission_info.side_effect = {
+            "id1": Mock(json=Mock(side_effect=ValueError("Invalid JSON"))),
+            "id2": Mock(json=Mock(return_value={"status": "PROCESSING"})),
+        }.get
+
+        result = self.turnitin_client.get_submission_status(self.ora_submission_id)
+
+        self.assertEqual(
+            result.data,
+            [{"id": "id1", "error": "Invalid JSON"}, {"status": "PROCESSING"}],
+        )
+        mock_update_submission_status.assert_called_once_with(
+            "id2", {"status": "PROCESSING"}
+        )
+
     @patch(f"{VIEWS_MODULE_PATH}.get_submission_info")
     @patch(f"{VIEWS_MODULE_PATH}.TurnitinClient.get_submissions")
     def test_get_submission_status_error_response(
@@ -225,10 +484,14 @@ class TestTurnitinClient(TestCase):
         self.assertEqual(response, error_response)
         mock_get_submission_info.assert_not_called()
 
+    @patch(f"{VIEWS_MODULE_PATH}.forget_similarity_report_info")
     @patch(f"{VIEWS_MODULE_PATH}.put_generate_similarity_report")
     @patch(f"{VIEWS_MODULE_PATH}.TurnitinClient.get_submissions")
     def test_generate_similarity_report_success(
-        self, mock_get_submissions: Mock, mock_put_generate: Mock
+        self,
+        mock_get_submissions: Mock,
+        mock_put_generate: Mock,
+        mock_forget_similarity_report_info: Mock,
     ):
         """
         Test the `generate_similarity_report` method.
@@ -246,7 +509,10 @@ class TestTurnitinClient(TestCase):
         ]
         mock_response_1 = Mock(json=Mock(return_value={"message": "SUCCESSFUL"}))
         mock_response_2 = Mock(json=Mock(return_value={"message": "SUCCESSFUL"}))
-        mock_put_generate.side_effect = [mock_response_1, mock_response_2]
+        mock_put_generate.side_effect = lambda turnitin_submission_id, payload: {
+            "id1": mock_response_1,
+            "id2": mock_response_2,
+        }[turnitin_submission_id]
 
         result = self.turnitin_client.generate_similarity_report(self.ora_submission_id)
 
@@ -255,11 +521,13 @@ class TestTurnitinClient(TestCase):
             [
                 call("id1", {"test_key": "test_value"}),
                 call("id2", {"test_key": "test_value"}),
-            ]
+            ],
+            any_order=True,
         )
         self.assertEqual(
             result.data, [{"message": "SUCCESSFUL"}, {"message": "SUCCESSFUL"}]
         )
+        mock_forget_similarity_report_info.assert_called_once_with(["id1", "id2"])
 
     @patch(f"{VIEWS_MODULE_PATH}.TurnitinClient.get_submissions")
     def test_generate_similarity_report_error_response(
@@ -279,10 +547,14 @@ class TestTurnitinClient(TestCase):
 
         self.assertEqual(result, error_response)
 
+    @patch(f"{VIEWS_MODULE_PATH}.update_similarity_report_info")
     @patch(f"{VIEWS_MODULE_PATH}.get_similarity_report_info")
     @patch(f"{VIEWS_MODULE_PATH}.TurnitinClient.get_submissions")
     def test_get_similarity_report_status_success(
-        self, mock_get_submissions: Mock, mock_get_report_info: Mock
+        self,
+        mock_get_submissions: Mock,
+        mock_get_report_info: Mock,
+        mock_update_similarity_report_info: Mock,
     ):
         """
         Test the `get_similarity_report_status` method.
@@ -292,22 +564,32 @@ class TestTurnitinClient(TestCase):
             - `get_similarity_report_info` function is called the correct number of
                 times with the correct parameters
         """
-        turnitin_submission_1 = Mock(turnitin_submission_id="id1")
-        turnitin_submission_2 = Mock(turnitin_submission_id="id2")
+        turnitin_submission_1 = Mock(
+            turnitin_submission_id="id1", similarity_report_info=None
+        )
+        turnitin_submission_2 = Mock(
+            turnitin_submission_id="id2", similarity_report_info=None
+        )
         mock_get_submissions.return_value = [
             turnitin_submission_1,
             turnitin_submission_2,
         ]
         mock_response_1 = Mock(json=Mock(return_value={"status": "COMPLETED"}))
         mock_response_2 = Mock(json=Mock(return_value={"status": "PROCESSING"}))
-        mock_get_report_info.side_effect = [mock_response_1, mock_response_2]
+        mock_get_report_info.side_effect = {
+            "id1": mock_response_1,
+            "id2": mock_response_2,
+        }.get
 
         result = self.turnitin_client.get_similarity_report_status(
             self.ora_submission_id
         )
 
         mock_get_submissions.assert_called_once_with(self.ora_submission_id)
-        mock_get_report_info.assert_has_calls([call("id1"), call("id2")])
+        mock_get_report_info.assert_has_calls(
+            [call("id1"), call("id2")], any_order=True
+        )
+        self.assertEqual(mock_update_similarity_report_info.call_count, 2)
         self.assertEqual(
             result.data, [{"status": "COMPLETED"}, {"status": "PROCESSING"}]
         )
@@ -353,7 +635,10 @@ class TestTurnitinClient(TestCase):
         ]
         mock_response_1 = Mock(json=Mock(return_value={"viewer_url": "url1"}))
         mock_response_2 = Mock(json=Mock(return_value={"viewer_url": "url2"}))
-        mock_post_create.side_effect = [mock_response_1, mock_response_2]
+        mock_post_create.side_effect = lambda turnitin_submission_id, payload: {
+            "id1": mock_response_1,
+            "id2": mock_response_2,
+        }[turnitin_submission_id]
 
         result = self.turnitin_client.create_similarity_viewer(self.ora_submission_id)
 
@@ -379,7 +664,8 @@ class TestTurnitinClient(TestCase):
             "sidebar": {"default_mode": "similarity"},
         }
         mock_post_create.assert_has_calls(
-            [call("id1", expected_payload), call("id2", expected_payload)]
+            [call("id1", expected_payload), call("id2", expected_payload)],
+            any_order=True,
         )
         self.assertEqual(
             result.data,
@@ -415,11 +701,11 @@ class TestTurnitinClient(TestCase):
         mock_response_1 = Mock(json=Mock(return_value={"success": False}))
         mock_response_2 = Mock(json=Mock(return_value={"success": False}))
         mock_response_3 = Mock(json=Mock(return_value={"viewer_url": "url3"}))
-        mock_post_create.side_effect = [
-            mock_response_1,
-            mock_response_2,
-            mock_response_3,
-        ]
+        mock_post_create.side_effect = lambda turnitin_submission_id, payload: {
+            "id1": mock_response_1,
+            "id2": mock_response_2,
+            "id3": mock_response_3,
+        }[turnitin_submission_id]
 
         result = self.turnitin_client.create_similarity_viewer(self.ora_submission_id)
 
@@ -449,7 +735,8 @@ class TestTurnitinClient(TestCase):
                 call("id1", expected_payload),
                 call("id2", expected_payload),
                 call("id3", expected_payload),
-            ]
+            ],
+            any_order=True,
         )
         self.assertEqual(result.data, [{"url": "url3", "file_name": "file3"}])
 
@@ -483,7 +770,8 @@ class TestTurnitinClient(TestCase):
         result = self.turnitin_client.get_submissions(self.ora_submission_id)
 
         mock_objects.filter.assert_called_once_with(
-            ora_submission_id=self.ora_submission_id
+            ora_submission_id=self.ora_submission_id,
+            turnitin_submission_id__isnull=False,
         )
         self.assertEqual(result, [mock_submission])
 
@@ -500,7 +788,8 @@ class TestTurnitinClient(TestCase):
         result = self.turnitin_client.get_submissions(self.ora_submission_id)
 
         mock_objects.filter.assert_called_once_with(
-            ora_submission_id=self.ora_submission_id
+            ora_submission_id=self.ora_submission_id,
+            turnitin_submission_id__isnull=False,
         )
         self.assertEqual(result.status_code, status.HTTP_404_NOT_FOUND)
         self.assertEqual(
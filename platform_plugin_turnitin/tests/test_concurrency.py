@@ -0,0 +1,119 @@
+"""Tests for the concurrency module."""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+
+from platform_plugin_turnitin.turnitin_client.concurrency import fan_out, get_executor, reset_executor
+
+CONCURRENCY_MODULE_PATH = "platform_plugin_turnitin.turnitin_client.concurrency"
+
+
+class TestFanOut(SimpleTestCase):
+    """Tests for the `fan_out` function."""
+
+    def setUp(self) -> None:
+        reset_executor()
+        self.lock = threading.Lock()
+        self.in_flight = []
+        self.max_in_flight = 0
+
+    def tearDown(self) -> None:
+        reset_executor()
+
+    def call(self, item: int) -> int:
+        """Record the calls in flight and return the item multiplied by 10, the first items finishing last."""
+        with self.lock:
+            self.in_flight.append(item)
+            self.max_in_flight = max(self.max_in_flight, len(self.in_flight))
+        time.sleep(0.02 * (5 - item))
+        with self.lock:
+            self.in_flight.remove(item)
+        if item == 3:
+            raise ValueError("failed")
+        return item * 10
+
+    @override_settings(TURNITIN_CONCURRENCY_BACKEND="thread", TURNITIN_API_THREAD_POOL_SIZE=2)
+    def test_fan_out_thread(self):
+        """
+        Test `fan_out` with the thread pool backend.
+
+        Expected result:
+            - The results are returned in the order of the items.
+            - The failed call is replaced by the result of `on_error`.
+            - No more calls than threads in the pool are in flight.
+        """
+        results = fan_out(self.call, range(5), on_error=lambda item, error: str(error))
+
+        self.assertEqual(results, [0, 10, 20, "failed", 40])
+        self.assertEqual(self.max_in_flight, 2)
+
+    @override_settings(TURNITIN_CONCURRENCY_BACKEND="asyncio", TURNITIN_API_CONCURRENCY=3)
+    def test_fan_out_asyncio(self):
+        """
+        Test `fan_out` with the asyncio backend.
+
+        Expected result:
+            - The results are returned in the order of the items.
+            - No more than `TURNITIN_API_CONCURRENCY` calls are in flight.
+        """
+        results = fan_out(self.call, range(5), on_error=lambda item, error: None)
+
+        self.assertEqual(results, [0, 10, 20, None, 40])
+        self.assertEqual(self.max_in_flight, 3)
+
+    @override_settings(TURNITIN_CONCURRENCY_BACKEND="serial")
+    def test_fan_out_serial(self):
+        """
+        Test `fan_out` with the serial backend and without `on_error`.
+
+        Expected result:
+            - The calls are made one after another and the error is raised.
+        """
+        with self.assertRaises(ValueError):
+            fan_out(self.call, range(5))
+
+        self.assertEqual(self.max_in_flight, 1)
+
+    def test_fan_out_every_call_failed(self):
+        """
+        Test `fan_out` when every call failed.
+
+        Expected result:
+            - The first error is raised instead of the results of `on_error`.
+        """
+        func = Mock(side_effect=[KeyError, ValueError])
+
+        with self.assertRaises(KeyError):
+            fan_out(func, ["first-id", "second-id"], on_error=lambda item, error: None)
+
+    @override_settings(TURNITIN_CONCURRENCY_BACKEND="unknown")
+    def test_fan_out_unsupported_backend(self):
+        """
+        Test `fan_out` with an unsupported backend.
+
+        Expected result:
+            - A ValueError is raised.
+        """
+        with self.assertRaises(ValueError):
+            fan_out(self.call, range(2))
+
+    @patch(f"{CONCURRENCY_MODULE_PATH}.os.getpid")
+    def test_executor_is_recreated_in_a_new_process(self, mock_getpid: Mock):
+        """
+        Test that the thread pool is shared within a process and re-created in a new one.
+
+        Expected result:
+            - The same pool is returned until the process ID changes.
+        """
+        mock_getpid.return_value = 1
+        parent_executor = get_executor()
+
+        self.assertIs(get_executor(), parent_executor)
+
+        mock_getpid.return_value = 2
+
+        self.assertIsNot(get_executor(), parent_executor)
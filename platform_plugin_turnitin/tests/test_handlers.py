@@ -4,8 +4,10 @@ from unittest.mock import Mock, patch
 
 from django.test import TestCase
 from django.test.utils import override_settings
+from kombu.exceptions import OperationalError
 
 from platform_plugin_turnitin.handlers import ora_submission_created
+from platform_plugin_turnitin.models import TurnitinOutboxEntry
 
 
 class TestHandlers(TestCase):
@@ -28,6 +30,7 @@ class TestHandlers(TestCase):
         ora_submission_created(self.submission)
 
         mock_call_task.assert_not_called()
+        self.assertFalse(TurnitinOutboxEntry.objects.exists())
 
     @override_settings(ENABLE_TURNITIN_SUBMISSION=True)
     @patch("platform_plugin_turnitin.handlers.ora_submission_created_task.delay")
@@ -41,7 +44,19 @@ class TestHandlers(TestCase):
             self.submission.answer.parts,
             self.submission.answer.file_names,
             self.submission.answer.file_urls,
+            self.submission.location,
         )
+        self.assertTrue(TurnitinOutboxEntry.objects.filter(ora_submission_id=self.submission.uuid).exists())
+
+    @override_settings(ENABLE_TURNITIN_SUBMISSION=True)
+    @patch("platform_plugin_turnitin.handlers.ora_submission_created_task.delay")
+    def test_ora_submission_created_broker_unavailable(self, mock_call_task: Mock):
+        """Test `ora_submission_created` when the task cannot be queued."""
+        mock_call_task.side_effect = OperationalError
+
+        ora_submission_created(self.submission)
+
+        self.assertTrue(TurnitinOutboxEntry.objects.filter(ora_submission_id=self.submission.uuid).exists())
 
     @patch("platform_plugin_turnitin.handlers.ora_submission_created_task.delay")
     @patch("platform_plugin_turnitin.handlers.enabled_in_course")
@@ -57,4 +72,5 @@ class TestHandlers(TestCase):
             self.submission.answer.parts,
             self.submission.answer.file_names,
             self.submission.answer.file_urls,
+            self.submission.location,
         )
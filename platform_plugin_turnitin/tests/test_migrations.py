@@ -0,0 +1,102 @@
+"""Tests for the data migrations of the Turnitin plugin."""
+
+from unittest.mock import Mock, patch
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+APP_LABEL = "platform_plugin_turnitin"
+EDXAPP_WRAPPER_MODULE_PATH = "platform_plugin_turnitin.edxapp_wrapper"
+
+
+class MigrationTestCase(TransactionTestCase):
+    """Base test case that runs the migrations from `migrate_from` to `migrate_to`."""
+
+    migrate_from = None
+    migrate_to = None
+
+    def setUp(self) -> None:
+        self.executor = MigrationExecutor(connection)
+        self.executor.migrate([(APP_LABEL, self.migrate_from)])
+        apps = self.executor.loader.project_state([(APP_LABEL, self.migrate_from)]).apps
+        self.user = apps.get_model("auth", "User").objects.create(username="john_doe")
+        self.TurnitinSubmission = apps.get_model(APP_LABEL, "TurnitinSubmission")
+
+    def tearDown(self) -> None:
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes(APP_LABEL))
+
+    def migrate(self):
+        """Run the migrations up to `migrate_to` and return the migrated model."""
+        self.executor.loader.build_graph()
+        self.executor.migrate([(APP_LABEL, self.migrate_to)])
+        return self.executor.loader.project_state([(APP_LABEL, self.migrate_to)]).apps.get_model(
+            APP_LABEL, "TurnitinSubmission"
+        )
+
+
+class TestMarkExistingSubmissions(MigrationTestCase):
+    """Tests for the `0008_turnitinsubmission_status` migration."""
+
+    migrate_from = "0007_turnitinsubmission_idempotency_key"
+    migrate_to = "0008_turnitinsubmission_status"
+
+    def test_mark_existing_submissions(self):
+        """
+        Test the status of the submissions sent before the pipeline status existed.
+
+        Expected result:
+            - The submissions sent to Turnitin are marked as REPORT_READY, so they are not polled.
+            - The other submissions are left as CREATED.
+        """
+        self.TurnitinSubmission.objects.create(user=self.user, turnitin_submission_id="turnitin-submission-id")
+        self.TurnitinSubmission.objects.create(user=self.user)
+
+        TurnitinSubmission = self.migrate()
+
+        self.assertEqual(
+            list(TurnitinSubmission.objects.order_by("id").values_list("status", flat=True)),
+            ["REPORT_READY", "CREATED"],
+        )
+
+
+class TestBackfillCourseId(MigrationTestCase):
+    """Tests for the `0013_backfill_turnitinsubmission_course_id` migration."""
+
+    migrate_from = "0004_turnitinsubmission_file_name"
+    migrate_to = "0013_backfill_turnitinsubmission_course_id"
+
+    @patch(f"{EDXAPP_WRAPPER_MODULE_PATH}.get_submission_and_student")
+    def test_backfill_pre_series_rows(self, mock_get_submission_and_student: Mock):
+        """
+        Test the backfill of rows created before the ORA block was stored.
+
+        Expected result:
+            - The course and the ORA block are taken from the student item of the ORA submission.
+            - The ORA submission is read once for all its rows.
+            - Rows whose ORA submission cannot be read are left without course.
+        """
+        ora_block_id = "block-v1:edX+DemoX+Demo_Course+type@openassessment+block@ora"
+        for file_name in ("part-1.txt", "file.pdf"):
+            self.TurnitinSubmission.objects.create(
+                user=self.user, ora_submission_id="ora-submission-id", file_name=file_name
+            )
+        self.TurnitinSubmission.objects.create(user=self.user, ora_submission_id="missing")
+        mock_get_submission_and_student.side_effect = lambda ora_submission_id: {
+            "ora-submission-id": {
+                "student_item": {"course_id": "course-v1:edX+DemoX+Demo_Course", "item_id": ora_block_id}
+            }
+        }[ora_submission_id]
+
+        TurnitinSubmission = self.migrate()
+
+        self.assertEqual(
+            list(TurnitinSubmission.objects.order_by("id").values_list("course_id", "ora_block_id")),
+            [
+                ("course-v1:edX+DemoX+Demo_Course", ora_block_id),
+                ("course-v1:edX+DemoX+Demo_Course", ora_block_id),
+                (None, None),
+            ],
+        )
+        self.assertEqual(mock_get_submission_and_student.call_count, 2)
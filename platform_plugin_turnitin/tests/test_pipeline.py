@@ -0,0 +1,358 @@
+"""Tests for the pipeline module."""
+
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from platform_plugin_turnitin.constants import SIMILARITY_REPORT_INFO, SUBMISSION_INFO
+from platform_plugin_turnitin.models import TurnitinSubmission
+from platform_plugin_turnitin.pipeline import (
+    fetch_submission_info,
+    forget_similarity_report_info,
+    get_poll_delay,
+    is_stored_info_fresh,
+    refresh_stored_info,
+    request_similarity_report,
+    schedule_next_poll,
+    update_similarity_report_info,
+    update_submission_status,
+)
+from platform_plugin_turnitin.turnitin_client.exceptions import TurnitinRateLimited
+
+PIPELINE_MODULE_PATH = "platform_plugin_turnitin.pipeline"
+
+User = get_user_model()
+
+
+class TestPipeline(TestCase):
+    """Tests for the state transitions of the Turnitin pipeline."""
+
+    def setUp(self) -> None:
+        self.user = User.objects.create(username="john_doe")
+        self.turnitin_submission_id = "turnitin-submission-id"
+        self.submission = TurnitinSubmission.objects.create(
+            user=self.user,
+            turnitin_submission_id=self.turnitin_submission_id,
+            status=TurnitinSubmission.Status.UPLOADED,
+        )
+
+    def assert_status(self, status: str) -> None:
+        """Assert the current status of the submission."""
+        self.submission.refresh_from_db()
+        self.assertEqual(self.submission.status, status)
+
+    def test_update_submission_status(self):
+        """
+        Test the `update_submission_status` function with statuses in and out of order.
+
+        Expected result:
+            - The submission moves forward and never backwards.
+            - Unknown statuses are ignored.
+        """
+        self.assertEqual(update_submission_status(self.turnitin_submission_id, {"status": "PROCESSING"}), 1)
+        self.assert_status(TurnitinSubmission.Status.PROCESSING)
+
+        self.assertEqual(update_submission_status(self.turnitin_submission_id, {"status": "COMPLETE"}), 1)
+        self.assertEqual(update_submission_status(self.turnitin_submission_id, {"status": "PROCESSING"}), 0)
+        self.assertEqual(update_submission_status(self.turnitin_submission_id, {"status": "UNKNOWN"}), 0)
+        self.assert_status(TurnitinSubmission.Status.COMPLETE)
+        self.assertIsNotNone(TurnitinSubmission.objects.get().status_updated_at)
+
+    def test_update_submission_status_counts(self):
+        """
+        Test the `update_submission_status` function with the page and word counts.
+
+        Expected result:
+            - The counts are stored even if the status does not change.
+        """
+        update_submission_status(self.turnitin_submission_id, {"status": "CREATED", "page_count": 3, "word_count": 900})
+
+        self.submission.refresh_from_db()
+        self.assertEqual(self.submission.page_count, 3)
+        self.assertEqual(self.submission.word_count, 900)
+
+    def test_update_similarity_report_info(self):
+        """
+        Test the `update_similarity_report_info` function.
+
+        Expected result:
+            - The report information, score and status are stored.
+            - Only a complete report marks the submission as REPORT_READY.
+        """
+        TurnitinSubmission.objects.update(status=TurnitinSubmission.Status.REPORT_REQUESTED)
+
+        self.assertEqual(update_similarity_report_info(self.turnitin_submission_id, {"status": "PROCESSING"}), 0)
+        self.assert_status(TurnitinSubmission.Status.REPORT_REQUESTED)
+        self.assertEqual(self.submission.report_status, "PROCESSING")
+
+        report_info = {"status": "COMPLETE", "overall_match_percentage": 15}
+
+        self.assertEqual(update_similarity_report_info(self.turnitin_submission_id, report_info), 1)
+        self.assert_status(TurnitinSubmission.Status.REPORT_READY)
+        self.assertEqual(self.submission.similarity_report_info, report_info)
+        self.assertEqual(self.submission.similarity_score, 15)
+        self.assertIsNotNone(self.submission.similarity_report_info_updated_at)
+
+    def test_forget_similarity_report_info(self):
+        """
+        Test the `forget_similarity_report_info` function after a new report was requested.
+
+        Expected result:
+            - The report information, score and status are dropped.
+            - A submission with a ready report is polled again from scratch.
+            - A submission whose report was never requested keeps its status.
+        """
+        other = TurnitinSubmission.objects.create(
+            user=self.user, turnitin_submission_id="other-id", status=TurnitinSubmission.Status.PROCESSING
+        )
+        TurnitinSubmission.objects.filter(pk=self.submission.pk).update(
+            status=TurnitinSubmission.Status.REPORT_READY,
+            similarity_report_info={"status": "COMPLETE", "overall_match_percentage": 15},
+            similarity_report_info_updated_at=timezone.now(),
+            similarity_score=15,
+            report_status="COMPLETE",
+            poll_attempts=4,
+            next_poll_at=timezone.now(),
+        )
+
+        self.assertEqual(forget_similarity_report_info([self.turnitin_submission_id, "other-id"]), 2)
+
+        self.assert_status(TurnitinSubmission.Status.REPORT_REQUESTED)
+        self.assertIsNone(self.submission.similarity_report_info)
+        self.assertIsNone(self.submission.similarity_report_info_updated_at)
+        self.assertIsNone(self.submission.similarity_score)
+        self.assertIsNone(self.submission.report_status)
+        self.assertEqual(self.submission.poll_attempts, 0)
+        self.assertIsNone(self.submission.next_poll_at)
+        other.refresh_from_db()
+        self.assertEqual(other.status, TurnitinSubmission.Status.PROCESSING)
+
+    @override_settings(TURNITIN_SUBMISSION_INFO_TTL=60, TURNITIN_SIMILARITY_REPORT_INFO_TTL=30)
+    def test_is_stored_info_fresh(self):
+        """
+        Test the `is_stored_info_fresh` function.
+
+        Expected result:
+            - Information in a terminal state is always fresh.
+            - Any other is fresh only within the TTL of its kind.
+        """
+        now = timezone.now()
+        old = now - timedelta(seconds=45)
+
+        self.assertTrue(is_stored_info_fresh(SUBMISSION_INFO, {"status": "ERROR"}, None))
+        self.assertTrue(is_stored_info_fresh(SIMILARITY_REPORT_INFO, {"status": "COMPLETE"}, old))
+        self.assertTrue(is_stored_info_fresh(SUBMISSION_INFO, {"status": "PROCESSING"}, old))
+        self.assertFalse(is_stored_info_fresh(SIMILARITY_REPORT_INFO, {"status": "PROCESSING"}, old))
+        self.assertFalse(is_stored_info_fresh(SUBMISSION_INFO, {"status": "PROCESSING"}, None))
+
+    @patch(f"{PIPELINE_MODULE_PATH}.fetch_similarity_report_info")
+    @patch(f"{PIPELINE_MODULE_PATH}.fetch_submission_info")
+    def test_refresh_stored_info(self, mock_fetch_submission_info: Mock, mock_fetch_similarity_report_info: Mock):
+        """
+        Test the `refresh_stored_info` function.
+
+        Expected result:
+            - The information fetched is stored with the function of its kind.
+            - Failed fetches are skipped.
+        """
+        mock_fetch_submission_info.side_effect = [{"status": "PROCESSING"}, None]
+        mock_fetch_similarity_report_info.return_value = {"status": "PROCESSING", "overall_match_percentage": 5}
+
+        self.assertEqual(refresh_stored_info(SUBMISSION_INFO, [self.turnitin_submission_id, "other-id"]), 1)
+        self.assertEqual(refresh_stored_info(SIMILARITY_REPORT_INFO, [self.turnitin_submission_id]), 1)
+
+        self.submission.refresh_from_db()
+        self.assertEqual(self.submission.submission_info, {"status": "PROCESSING"})
+        self.assertEqual(self.submission.similarity_score, 5)
+
+    @override_settings(TURNITIN_POLLING_BASE_DELAY=10, TURNITIN_POLLING_MAX_DELAY=1000)
+    def test_get_poll_delay(self):
+        """
+        Test the `get_poll_delay` function.
+
+        Expected result:
+            - The delay doubles with each attempt and grows with the size of the document.
+            - The delay is randomized between half and the whole of its value.
+            - The delay is capped by the maximum before it is randomized.
+            - The randomized delay is never below the minimum.
+        """
+        submission = TurnitinSubmission(poll_attempts=2)
+
+        with patch(f"{PIPELINE_MODULE_PATH}.random.uniform", side_effect=lambda low, high: high):
+            self.assertEqual(get_poll_delay(submission), 40)
+
+            submission.page_count = 50
+
+            self.assertEqual(get_poll_delay(submission), 200)
+
+            submission.poll_attempts = 10
+
+            self.assertEqual(get_poll_delay(submission), 1000)
+
+        with patch(f"{PIPELINE_MODULE_PATH}.random.uniform", side_effect=lambda low, high: low):
+            self.assertEqual(get_poll_delay(submission), 500)
+            self.assertEqual(get_poll_delay(TurnitinSubmission(), min_delay=300), 300)
+            self.assertEqual(get_poll_delay(TurnitinSubmission(page_count=50), min_delay=20), 25)
+
+    @patch(f"{PIPELINE_MODULE_PATH}.get_poll_delay")
+    def test_schedule_next_poll(self, mock_get_poll_delay: Mock):
+        """
+        Test the `schedule_next_poll` function before the deadline.
+
+        Expected result:
+            - The next check is scheduled after the delay and the attempt is counted.
+        """
+        mock_get_poll_delay.return_value = 60
+
+        schedule_next_poll(self.turnitin_submission_id)
+
+        self.submission.refresh_from_db()
+        self.assertEqual(self.submission.poll_attempts, 1)
+        self.assertGreater(self.submission.next_poll_at, timezone.now() + timedelta(seconds=50))
+
+    @override_settings(TURNITIN_POLLING_DEADLINE=3600)
+    def test_schedule_next_poll_deferred(self):
+        """
+        Test the `schedule_next_poll` function for a check that did not reach Turnitin.
+
+        Expected result:
+            - The attempt is not counted and the submission is not given up on after the deadline.
+            - The next check waits at least the minimum delay.
+        """
+        TurnitinSubmission.objects.update(poll_attempts=3, status_updated_at=timezone.now() - timedelta(seconds=3601))
+
+        schedule_next_poll(self.turnitin_submission_id, 120, attempted=False)
+
+        self.assert_status(TurnitinSubmission.Status.UPLOADED)
+        self.assertEqual(self.submission.poll_attempts, 3)
+        self.assertGreater(self.submission.next_poll_at, timezone.now() + timedelta(seconds=110))
+
+    @override_settings(TURNITIN_POLLING_DEADLINE=3600)
+    def test_schedule_next_poll_deadline(self):
+        """
+        Test the `schedule_next_poll` function after the deadline.
+
+        Expected result:
+            - A submission never polled is not given up on, even if it is older than the deadline.
+            - Polling stops and a polled submission is marked as ERROR with the reason.
+        """
+        TurnitinSubmission.objects.update(
+            created_at=timezone.now() - timedelta(seconds=7200),
+            status_updated_at=timezone.now() - timedelta(seconds=3601),
+        )
+
+        schedule_next_poll(self.turnitin_submission_id)
+
+        self.assert_status(TurnitinSubmission.Status.UPLOADED)
+        self.assertEqual(self.submission.poll_attempts, 1)
+
+        schedule_next_poll(self.turnitin_submission_id)
+
+        self.assert_status(TurnitinSubmission.Status.ERROR)
+        self.assertIsNone(self.submission.next_poll_at)
+        self.assertIn("within 3600 seconds", self.submission.error_message)
+
+    @override_settings(TURNITIN_SIMILARITY_REPORT_MAX_ATTEMPTS=2)
+    @patch(f"{PIPELINE_MODULE_PATH}.put_generate_similarity_report")
+    def test_request_similarity_report_failures(self, mock_put_generate_similarity_report: Mock):
+        """
+        Test the `request_similarity_report` function when Turnitin keeps failing.
+
+        Expected result:
+            - A server error is retried until `TURNITIN_SIMILARITY_REPORT_MAX_ATTEMPTS` failures.
+            - A client error that would fail again moves the submission to ERROR right away.
+        """
+        TurnitinSubmission.objects.update(status=TurnitinSubmission.Status.COMPLETE)
+        mock_put_generate_similarity_report.return_value = Mock(ok=False, status_code=503)
+
+        request_similarity_report(self.turnitin_submission_id)
+        self.assert_status(TurnitinSubmission.Status.COMPLETE)
+        request_similarity_report(self.turnitin_submission_id)
+
+        self.assert_status(TurnitinSubmission.Status.ERROR)
+        self.assertIsNone(self.submission.next_poll_at)
+        self.assertIn("after 2 attempts", self.submission.error_message)
+
+        TurnitinSubmission.objects.update(status=TurnitinSubmission.Status.COMPLETE, report_attempts=0)
+        mock_put_generate_similarity_report.return_value = Mock(ok=False, status_code=404)
+
+        self.assertFalse(request_similarity_report(self.turnitin_submission_id))
+        self.assert_status(TurnitinSubmission.Status.ERROR)
+        self.assertIn("404", self.submission.error_message)
+        self.assertEqual(self.submission.report_attempts, 0)
+
+    @patch(f"{PIPELINE_MODULE_PATH}.get_submission_info")
+    def test_fetch_submission_info(self, mock_get_submission_info: Mock):
+        """
+        Test the `fetch_submission_info` function.
+
+        Expected result:
+            - A failed request returns None.
+            - The submission information is returned otherwise.
+        """
+        mock_get_submission_info.return_value = Mock(ok=False)
+
+        self.assertIsNone(fetch_submission_info(self.turnitin_submission_id))
+
+        mock_get_submission_info.return_value = Mock(ok=True, json=Mock(return_value={"status": "PROCESSING"}))
+
+        self.assertEqual(fetch_submission_info(self.turnitin_submission_id), {"status": "PROCESSING"})
+
+    @patch(f"{PIPELINE_MODULE_PATH}.put_generate_similarity_report")
+    @patch(f"{PIPELINE_MODULE_PATH}.get_submission_info")
+    def test_rate_limited(self, mock_get_submission_info: Mock, mock_put_generate_similarity_report: Mock):
+        """
+        Test the pipeline when the Turnitin rate limit is reached.
+
+        Expected result:
+            - The status check is deferred to the caller.
+            - The status refresh is skipped.
+            - The report request is deferred and the submission stays COMPLETE.
+        """
+        mock_get_submission_info.side_effect = TurnitinRateLimited("status", 10)
+        mock_put_generate_similarity_report.side_effect = TurnitinRateLimited("report", 10)
+        TurnitinSubmission.objects.update(status=TurnitinSubmission.Status.COMPLETE)
+
+        with self.assertRaises(TurnitinRateLimited):
+            fetch_submission_info(self.turnitin_submission_id)
+        self.assertEqual(refresh_stored_info(SUBMISSION_INFO, [self.turnitin_submission_id]), 0)
+        with patch(f"{PIPELINE_MODULE_PATH}.random.uniform", side_effect=lambda low, high: low):
+            self.assertFalse(request_similarity_report(self.turnitin_submission_id))
+        self.assert_status(TurnitinSubmission.Status.COMPLETE)
+        self.assertIn("rate limit", self.submission.error_message)
+        self.assertEqual(self.submission.report_attempts, 0)
+        self.assertGreater(self.submission.next_poll_at, timezone.now() + timedelta(seconds=9))
+
+    @patch(f"{PIPELINE_MODULE_PATH}.put_generate_similarity_report")
+    def test_request_similarity_report(self, mock_put_generate_similarity_report: Mock):
+        """
+        Test the `request_similarity_report` function.
+
+        Expected result:
+            - Nothing is requested before the submission is complete.
+            - A failed request moves the submission back to COMPLETE so it can be requested again.
+            - A requested report starts the polling schedule over.
+        """
+        self.assertFalse(request_similarity_report(self.turnitin_submission_id))
+        mock_put_generate_similarity_report.assert_not_called()
+
+        TurnitinSubmission.objects.update(status=TurnitinSubmission.Status.COMPLETE)
+        mock_put_generate_similarity_report.return_value = Mock(ok=False, status_code=500)
+
+        self.assertFalse(request_similarity_report(self.turnitin_submission_id))
+        self.assert_status(TurnitinSubmission.Status.COMPLETE)
+        self.assertIn("500", self.submission.error_message)
+        self.assertEqual(self.submission.report_attempts, 1)
+        self.assertGreater(self.submission.next_poll_at, timezone.now())
+
+        mock_put_generate_similarity_report.return_value = Mock(ok=True)
+        TurnitinSubmission.objects.update(poll_attempts=3)
+
+        self.assertTrue(request_similarity_report(self.turnitin_submission_id))
+        self.assert_status(TurnitinSubmission.Status.REPORT_REQUESTED)
+        self.assertEqual(self.submission.poll_attempts, 0)
+        self.assertIsNone(self.submission.next_poll_at)
@@ -0,0 +1,124 @@
+"""Tests for the Turnitin rate limiter module."""
+
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+
+from platform_plugin_turnitin.turnitin_client.exceptions import TurnitinRateLimited
+from platform_plugin_turnitin.turnitin_client.rate_limit import (
+    acquire,
+    get_max_wait,
+    get_rate_limit_bucket,
+    rate_limit_max_wait,
+)
+
+RATE_LIMIT_MODULE_PATH = "platform_plugin_turnitin.turnitin_client.rate_limit"
+
+
+@override_settings(TURNITIN_RATE_LIMITS={"status": 2}, TURNITIN_RATE_LIMIT_PERIOD=60, TURNITIN_RATE_LIMIT_MAX_WAIT=5)
+@patch(f"{RATE_LIMIT_MODULE_PATH}.time")
+class TestRateLimit(SimpleTestCase):
+    """Tests for the rate limiter."""
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_acquire_within_limit(self, mock_time: Mock):
+        """
+        Test `acquire` while the bucket has tokens, and for a bucket without a limit.
+
+        Expected result:
+            - The calls go through without waiting.
+        """
+        mock_time.time.return_value = 600
+
+        acquire("status")
+        acquire("status")
+        acquire("upload")
+
+        mock_time.sleep.assert_not_called()
+
+    def test_acquire_waits_for_token(self, mock_time: Mock):
+        """
+        Test `acquire` when a token is available within the longest wait.
+
+        Expected result:
+            - The tokens of the previous period count for the part of it still in the window.
+            - The call waits until the previous period slides out of the window.
+        """
+        mock_time.time.side_effect = [590, 590, 658, 658, 660]
+
+        acquire("status")
+        acquire("status")
+        acquire("status")
+        acquire("status")
+
+        mock_time.sleep.assert_called_once()
+        self.assertGreaterEqual(mock_time.sleep.call_args.args[0], 2)
+
+    def test_acquire_deferred(self, mock_time: Mock):
+        """
+        Test `acquire` when no token is available within the longest wait.
+
+        Expected result:
+            - `TurnitinRateLimited` is raised with the seconds until a token is available.
+            - The deferred call does not take a token.
+        """
+        mock_time.time.return_value = 630
+
+        acquire("status")
+        acquire("status")
+        with self.assertRaises(TurnitinRateLimited) as context, rate_limit_max_wait(0):
+            acquire("status")
+
+        self.assertEqual(context.exception.bucket, "status")
+        self.assertEqual(context.exception.retry_after, 60)
+        self.assertEqual(cache.get("turnitin:rate_limit:status:10"), 2)
+        mock_time.sleep.assert_not_called()
+
+    def test_acquire_window_boundary(self, mock_time: Mock):
+        """
+        Test `acquire` with a burst at the end of a period and another at the start of the next one.
+
+        Expected result:
+            - The second burst is limited by the tokens taken at the end of the previous period.
+        """
+        mock_time.time.side_effect = [659, 659, 660]
+
+        acquire("status")
+        acquire("status")
+        with self.assertRaises(TurnitinRateLimited) as context, rate_limit_max_wait(0):
+            acquire("status")
+
+        self.assertEqual(context.exception.retry_after, 30)
+
+    def test_rate_limit_max_wait(self, mock_time: Mock):
+        """
+        Test that `rate_limit_max_wait` only overrides the wait inside its block.
+
+        Expected result:
+            - The setting is used outside the block.
+        """
+        with rate_limit_max_wait(0):
+            self.assertEqual(get_max_wait(), 0)
+
+        self.assertEqual(get_max_wait(), 5)
+
+
+class TestRateLimitBucket(SimpleTestCase):
+    """Tests for the `get_rate_limit_bucket` function."""
+
+    def test_get_rate_limit_bucket(self):
+        """
+        Test the bucket of each kind of call.
+
+        Expected result:
+            - Uploads, status checks, reports and viewers use their own bucket.
+        """
+        self.assertEqual(get_rate_limit_bucket("post", "submissions"), "upload")
+        self.assertEqual(get_rate_limit_bucket("put", "submissions/1/original", is_upload=True), "upload")
+        self.assertEqual(get_rate_limit_bucket("get", "submissions/1"), "status")
+        self.assertEqual(get_rate_limit_bucket("put", "submissions/1/similarity"), "report")
+        self.assertEqual(get_rate_limit_bucket("post", "submissions/1/viewer-url"), "viewer")
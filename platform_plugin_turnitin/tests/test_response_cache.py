@@ -0,0 +1,329 @@
+"""Tests for the Turnitin response cache module."""
+
+import threading
+from io import StringIO
+from unittest.mock import Mock, patch
+
+import requests
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+
+from platform_plugin_turnitin.turnitin_client.handlers import (
+    get_similarity_report_info,
+    get_submission_info,
+    post_create_viewer_launch_url,
+    put_generate_similarity_report,
+    put_upload_submission_file_content,
+)
+from platform_plugin_turnitin.turnitin_client.response_cache import (
+    cached_response,
+    cached_viewer_url_response,
+    get_response_cache_stats,
+    invalidate_cached_responses,
+)
+
+HANDLERS_MODULE_PATH = "platform_plugin_turnitin.turnitin_client.handlers"
+RESPONSE_CACHE_MODULE_PATH = "platform_plugin_turnitin.turnitin_client.response_cache"
+
+
+def make_response(status_code: int = 200, content: bytes = b'{"status": "PROCESSING"}') -> requests.Response:
+    """Build a response as returned by the Turnitin API."""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content  # pylint: disable=protected-access
+    response.headers["Content-Type"] = "application/json"
+    return response
+
+
+@override_settings(
+    TURNITIN_RESPONSE_CACHE_TIMEOUTS={"submission_info": 10, "similarity_report_info": 30},
+    TURNITIN_RESPONSE_CACHE_STATS=True,
+    TURNITIN_VIEWER_URL_EXPIRY=0,
+)
+class TestResponseCache(SimpleTestCase):
+    """Tests for the shared response cache."""
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_cached_response(self):
+        """
+        Test the `cached_response` function.
+
+        Expected result:
+            - The request is sent once and the next calls are served from the cache.
+            - The responses of other submissions and endpoints are cached apart.
+            - The hits and misses are counted per endpoint.
+        """
+        send = Mock(return_value=make_response())
+
+        first = cached_response("submission_info", "id1", send)
+        second = cached_response("submission_info", "id1", send)
+        cached_response("submission_info", "id2", send)
+        cached_response("similarity_report_info", "id1", send)
+
+        self.assertEqual(send.call_count, 3)
+        self.assertEqual(second.json(), first.json())
+        self.assertTrue(second.ok)
+        self.assertEqual(second.headers["content-type"], "application/json")
+        self.assertEqual(
+            get_response_cache_stats(),
+            {
+                "submission_info": {"hits": 1, "misses": 2},
+                "similarity_report_info": {"hits": 0, "misses": 1},
+            },
+        )
+
+    def test_cached_response_errors(self):
+        """
+        Test the `cached_response` function with a failed request.
+
+        Expected result:
+            - The failed response is not stored and the request is sent again.
+        """
+        send = Mock(side_effect=[make_response(status_code=503), make_response()])
+
+        self.assertEqual(cached_response("submission_info", "id1", send).status_code, 503)
+        self.assertEqual(cached_response("submission_info", "id1", send).status_code, 200)
+        self.assertEqual(send.call_count, 2)
+
+    @override_settings(TURNITIN_RESPONSE_CACHE_TIMEOUTS={"submission_info": 0})
+    def test_cached_response_disabled(self):
+        """
+        Test the `cached_response` function for an endpoint that is not cached.
+
+        Expected result:
+            - Every call sends the request.
+        """
+        send = Mock(return_value=make_response())
+
+        cached_response("submission_info", "id1", send)
+        cached_response("submission_info", "id1", send)
+        cached_response("similarity_report_info", "id1", send)
+
+        self.assertEqual(send.call_count, 3)
+
+    @override_settings(TURNITIN_RESPONSE_CACHE_STATS=False)
+    def test_cached_response_without_stats(self):
+        """
+        Test the `cached_response` function when the stats are disabled.
+
+        Expected result:
+            - The responses are cached but the hits and misses are not counted.
+        """
+        send = Mock(return_value=make_response())
+
+        with patch.object(cache, "incr", wraps=cache.incr) as mock_incr:
+            cached_response("submission_info", "id1", send)
+            cached_response("submission_info", "id1", send)
+
+        send.assert_called_once()
+        mock_incr.assert_not_called()
+        self.assertEqual(get_response_cache_stats()["submission_info"], {"hits": 0, "misses": 0})
+
+    @patch(f"{RESPONSE_CACHE_MODULE_PATH}.RESPONSE_CACHE_STATS_TIMEOUT", 100)
+    def test_cached_response_stats_timeout(self):
+        """
+        Test the hit and miss counters of the `cached_response` function.
+
+        Expected result:
+            - The counters are started with a timeout.
+        """
+        with patch.object(cache, "add", wraps=cache.add) as mock_add:
+            cached_response("submission_info", "id1", Mock(return_value=make_response()))
+
+        mock_add.assert_called_once_with("turnitin:response_cache:submission_info:stats:misses", 0, 100)
+
+    def test_invalidate_cached_responses(self):
+        """
+        Test the `invalidate_cached_responses` function.
+
+        Expected result:
+            - Only the invalidated endpoints of the submission are sent again.
+            - A response fetched before the invalidation is not served after it.
+        """
+        send = Mock(return_value=make_response())
+        cached_response("submission_info", "id1", send)
+        cached_response("similarity_report_info", "id1", send)
+
+        invalidate_cached_responses("id1", ["submission_info"])
+        cached_response("submission_info", "id1", send)
+        cached_response("similarity_report_info", "id1", send)
+
+        self.assertEqual(send.call_count, 3)
+
+        def send_during_write() -> requests.Response:
+            invalidate_cached_responses("id2", ["submission_info"])
+            return make_response()
+
+        cached_response("submission_info", "id2", send_during_write)
+        cached_response("submission_info", "id2", send)
+
+        self.assertEqual(send.call_count, 4)
+
+    @patch(f"{HANDLERS_MODULE_PATH}.similarity_reports.turnitin_api_handler")
+    @patch(f"{HANDLERS_MODULE_PATH}.submissions.turnitin_api_handler")
+    def test_handlers(self, mock_submissions_handler: Mock, mock_similarity_reports_handler: Mock):
+        """
+        Test the cached handlers and the handlers that invalidate them.
+
+        Expected result:
+            - The status handlers are served from the cache.
+            - An upload invalidates the submission information.
+            - A report request invalidates the similarity report information.
+        """
+        mock_submissions_handler.return_value = make_response()
+        mock_similarity_reports_handler.return_value = make_response()
+
+        get_submission_info("id1")
+        get_submission_info("id1")
+        get_similarity_report_info("id1")
+        get_similarity_report_info("id1")
+
+        self.assertEqual(mock_submissions_handler.call_count, 1)
+        self.assertEqual(mock_similarity_reports_handler.call_count, 1)
+
+        put_upload_submission_file_content("id1", b"content", "file.txt")
+        put_generate_similarity_report("id1", {})
+        get_submission_info("id1")
+        get_similarity_report_info("id1")
+
+        mock_submissions_handler.assert_called_with("get", "submissions/id1")
+        mock_similarity_reports_handler.assert_called_with("get", "submissions/id1/similarity")
+        self.assertEqual(mock_submissions_handler.call_count, 3)
+        self.assertEqual(mock_similarity_reports_handler.call_count, 3)
+
+    def test_stats_command(self):
+        """
+        Test the `turnitin_response_cache_stats` management command.
+
+        Expected result:
+            - The hits, misses and hit rate of each endpoint are shown.
+            - The counters are set back to zero with --reset.
+        """
+        send = Mock(return_value=make_response())
+        cached_response("submission_info", "id1", send)
+        cached_response("submission_info", "id1", send)
+        out = StringIO()
+
+        call_command("turnitin_response_cache_stats", "--reset", stdout=out)
+
+        self.assertIn("submission_info: 1 hits, 1 misses (50.0% hit rate)", out.getvalue())
+        self.assertIn("similarity_report_info: 0 hits, 0 misses (0.0% hit rate)", out.getvalue())
+        self.assertEqual(get_response_cache_stats()["submission_info"], {"hits": 0, "misses": 0})
+
+
+@override_settings(
+    TURNITIN_RESPONSE_CACHE_TIMEOUTS={},
+    TURNITIN_RESPONSE_CACHE_STATS=True,
+    TURNITIN_VIEWER_URL_EXPIRY=60,
+    TURNITIN_VIEWER_URL_EXPIRY_MARGIN=10,
+)
+class TestViewerUrlCache(SimpleTestCase):
+    """Tests for the viewer launch URL cache."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.payload = {"viewer_user_id": 1, "viewer_permissions": {"may_view_submission_full_source": False}}
+
+    def test_cached_viewer_url_response(self):
+        """
+        Test the `cached_viewer_url_response` function.
+
+        Expected result:
+            - The URL is reused for the same submission and payload, until shortly before it expires.
+            - Another viewer or other permissions get a new URL.
+            - Failed responses are not stored.
+        """
+        send = Mock(return_value=make_response(content=b'{"viewer_url": "url"}'))
+        other_payload = {**self.payload, "viewer_user_id": 2}
+
+        with patch.object(cache, "set", wraps=cache.set) as mock_set:
+            first = cached_viewer_url_response("id1", self.payload, send)
+            second = cached_viewer_url_response("id1", dict(reversed(self.payload.items())), send)
+            cached_viewer_url_response("id1", other_payload, send)
+            cached_viewer_url_response("id2", self.payload, send)
+
+        self.assertEqual(send.call_count, 3)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(mock_set.call_args.args[2], 50)
+
+        send.return_value = make_response(status_code=500)
+
+        cached_viewer_url_response("id3", self.payload, send)
+        cached_viewer_url_response("id3", self.payload, send)
+
+        self.assertEqual(send.call_count, 5)
+        self.assertEqual(get_response_cache_stats(), {"viewer_url": {"hits": 1, "misses": 5}})
+
+    def test_cached_viewer_url_response_concurrent(self):
+        """
+        Test the `cached_viewer_url_response` function with concurrent callers.
+
+        Expected result:
+            - Only one request is sent and every caller gets its URL.
+        """
+        started = threading.Event()
+        release = threading.Event()
+
+        def send() -> requests.Response:
+            started.set()
+            release.wait(5)
+            return make_response(content=b'{"viewer_url": "url"}')
+
+        mock_send = Mock(side_effect=send)
+        results = []
+
+        def open_viewer() -> None:
+            results.append(cached_viewer_url_response("id1", self.payload, mock_send).json())
+
+        threads = [threading.Thread(target=open_viewer) for _ in range(4)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        mock_send.assert_called_once()
+        self.assertEqual(results, [{"viewer_url": "url"}] * 4)
+
+    @override_settings(TURNITIN_API_TIMEOUT=30)
+    @patch(f"{RESPONSE_CACHE_MODULE_PATH}.time")
+    def test_cached_viewer_url_response_lock_timeout(self, mock_time: Mock):
+        """
+        Test the `cached_viewer_url_response` function when the first caller takes too long.
+
+        Expected result:
+            - The waiting caller stops waiting after `VIEWER_URL_LOCK_WAIT` seconds, not the API timeout.
+            - The waiting caller sends the request itself.
+        """
+        mock_time.monotonic.side_effect = [0, 1, 2, 3]
+        send = Mock(return_value=make_response(content=b'{"viewer_url": "url"}'))
+
+        with patch.object(cache, "add", return_value=False):
+            response = cached_viewer_url_response("id1", self.payload, send)
+
+        self.assertEqual(response.json(), {"viewer_url": "url"})
+        self.assertEqual(mock_time.sleep.call_count, 2)
+        send.assert_called_once()
+
+    @override_settings(TURNITIN_VIEWER_URL_EXPIRY=10)
+    @patch(f"{HANDLERS_MODULE_PATH}.similarity_reports.turnitin_api_handler")
+    def test_post_create_viewer_launch_url_disabled(self, mock_turnitin_api_handler: Mock):
+        """
+        Test the `post_create_viewer_launch_url` handler when the expiry is within the margin.
+
+        Expected result:
+            - A new URL is created every time.
+        """
+        mock_turnitin_api_handler.return_value = make_response(content=b'{"viewer_url": "url"}')
+
+        post_create_viewer_launch_url("id1", self.payload)
+        post_create_viewer_launch_url("id1", self.payload)
+
+        mock_turnitin_api_handler.assert_called_with("post", "submissions/id1/viewer-url", self.payload)
+        self.assertEqual(mock_turnitin_api_handler.call_count, 2)
@@ -0,0 +1,85 @@
+"""Tests for the storage module."""
+
+import shutil
+import tempfile
+from unittest import TestCase
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test.utils import override_settings
+
+from platform_plugin_turnitin.storage import get_file_key, open_stored_file
+
+
+class TestStorage(TestCase):
+    """Tests for the storage backend file source."""
+
+    def setUp(self) -> None:
+        self.location = tempfile.mkdtemp()
+        FileSystemStorage(location=self.location).save("student/course/block", ContentFile(b"file content"))
+        self.storage_settings = override_settings(
+            TURNITIN_FILE_STORAGE_CLASS="django.core.files.storage.FileSystemStorage",
+            TURNITIN_FILE_STORAGE_OPTIONS={"location": self.location},
+            TURNITIN_FILE_STORAGE_URL_PREFIX="/openassessment/storage/",
+        )
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.location)
+
+    def test_get_file_key(self):
+        """
+        Test the `get_file_key` function.
+
+        Expected result:
+            - The key is unquoted and the query string is dropped.
+            - The path of an absolute URL is matched.
+            - URLs outside the prefix have no key.
+        """
+        with self.storage_settings:
+            self.assertEqual(
+                get_file_key("/openassessment/storage/student%2Fcourse%2Fblock?token=abc"), "student/course/block"
+            )
+            self.assertEqual(
+                get_file_key("https://lms.example.com/openassessment/storage/student/course/block"),
+                "student/course/block",
+            )
+            self.assertIsNone(get_file_key("https://example.com/file.pdf"))
+
+    @override_settings(TURNITIN_FILE_STORAGE_URL_PREFIX="/")
+    def test_get_file_key_presigned_url(self):
+        """
+        Test the `get_file_key` function with a presigned URL of an S3 bucket.
+
+        Expected result:
+            - The whole path is the key and the signature is dropped.
+        """
+        self.assertEqual(
+            get_file_key(
+                "https://bucket.s3.amazonaws.com/submissions_attachments/student/course/block"
+                "?X-Amz-Algorithm=AWS4-HMAC-SHA256&X-Amz-Signature=abc"
+            ),
+            "submissions_attachments/student/course/block",
+        )
+
+    def test_open_stored_file(self):
+        """
+        Test the `open_stored_file` function.
+
+        Expected result:
+            - A stored file is opened from the storage.
+            - A missing file must be downloaded instead.
+        """
+        with self.storage_settings:
+            with open_stored_file("/openassessment/storage/student/course/block") as stored_file:
+                self.assertEqual(stored_file.read(), b"file content")
+
+            self.assertIsNone(open_stored_file("/openassessment/storage/student/course/missing"))
+
+    def test_open_stored_file_not_configured(self):
+        """
+        Test the `open_stored_file` function without a storage backend.
+
+        Expected result:
+            - The file must be downloaded.
+        """
+        self.assertIsNone(open_stored_file("/openassessment/storage/student/course/block"))
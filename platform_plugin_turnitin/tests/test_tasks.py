@@ -1,26 +1,45 @@
 """Tests for the tasks module."""
 
+import hashlib
+import io
+from datetime import timedelta
 from unittest import TestCase
-from unittest.mock import Mock, call, patch
-
+from unittest.mock import ANY, Mock, call, patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files import File
+from django.test import TestCase as DjangoTestCase
+from django.test.utils import override_settings
+from django.utils import timezone
 from rest_framework import status
 
+from platform_plugin_turnitin.constants import IDEMPOTENCY_CLAIM_TIMEOUT, POLLING_LOCK_KEY
+from platform_plugin_turnitin.models import TurnitinOutboxEntry, TurnitinSubmission
 from platform_plugin_turnitin.tasks import (
-    generate_similarity_report,
-    get_submission_status,
-    is_submission_complete,
+    claim_turnitin_submission,
+    drain_outbox,
+    is_turnitin_submission_claimed,
     ora_submission_created_task,
+    poll_pending_submissions,
+    poll_pending_submissions_task,
+    process_webhook_event_task,
+    refresh_stored_info_task,
+    request_pending_similarity_reports,
+    reuse_turnitin_submission,
     send_file_to_turnitin,
-    send_text_to_turnitin,
-    send_uploaded_files_to_turnitin,
+    send_text_part_to_turnitin,
+    send_text_part_to_turnitin_task,
+    send_uploaded_file_to_turnitin,
+    send_uploaded_file_to_turnitin_task,
     upload_turnitin_submission,
 )
+from platform_plugin_turnitin.turnitin_client.exceptions import TurnitinCircuitOpen, TurnitinRateLimited
 
 TASKS_MODULE_PATH = "platform_plugin_turnitin.tasks"
+FILE_CONTENT_HASH = hashlib.sha256(b"file content").hexdigest()
 
-
-MAX_REQUEST_RETRIES = 3
-SECONDS_TO_WAIT_BETWEEN_RETRIES = 1
+User = get_user_model()
 
 
 class TestOraSubmissionCreatedTask(TestCase):
@@ -32,191 +51,421 @@ class TestOraSubmissionCreatedTask(TestCase):
         self.parts = [{"text": "part1"}, {"text": "part2"}]
         self.file_names = ["file1.txt", "file2.doc"]
         self.file_urls = ["/download/file1.txt", "/download/file2.doc"]
+        self.ora_block_id = "block-v1:edX+DemoX+Demo_Course+type@openassessment+block@ora"
         self.user = Mock()
         self.file = Mock()
 
-    @patch(f"{TASKS_MODULE_PATH}.user_by_anonymous_id")
-    @patch(f"{TASKS_MODULE_PATH}.send_text_to_turnitin")
-    @patch(f"{TASKS_MODULE_PATH}.send_uploaded_files_to_turnitin")
-    @patch(f"{TASKS_MODULE_PATH}.is_submission_complete")
-    @patch(f"{TASKS_MODULE_PATH}.generate_similarity_report")
+    @patch(f"{TASKS_MODULE_PATH}.TurnitinSubmission")
+    @patch(f"{TASKS_MODULE_PATH}.group")
+    @patch(f"{TASKS_MODULE_PATH}.send_uploaded_file_to_turnitin_task.si")
+    @patch(f"{TASKS_MODULE_PATH}.send_text_part_to_turnitin_task.si")
     def test_ora_submission_created_task(
         self,
-        mock_generate_similarity_report: Mock,
-        mock_is_submission_complete: Mock,
-        mock_send_uploaded_files_to_turnitin: Mock,
-        mock_send_text_to_turnitin: Mock,
-        mock_user_by_anonymous_id: Mock,
+        mock_send_text_part_task: Mock,
+        mock_send_uploaded_file_task: Mock,
+        mock_group: Mock,
+        mock_turnitin_submission: Mock,
     ):
         """
         Test the `ora_submission_created_task` function.
 
         Expected result:
-            - `user_by_anonymous_id` is called once with the anonymous_user_id.
-            - `send_text_to_turnitin` is called once with the submission_id, user and parts.
-            - `send_uploaded_files_to_turnitin` is called once with the submission_uuid,
-                user, file_names and file_urls.
+            - A subtask is created for each text part and each allowed file with its idempotency key.
+            - Only the units not uploaded yet are sent as a group.
         """
-        mock_user_by_anonymous_id.return_value = self.user
-        mock_is_submission_complete.return_value = True
+        file_names = self.file_names + ["file3.exe"]
+        file_urls = self.file_urls + ["/download/file3.exe"]
+        mock_turnitin_submission.objects.filter.return_value.exclude.return_value.values_list.return_value = [
+            f"{self.submission_uuid}:part:1",
+        ]
+
+        ora_submission_created_task(
+            self.submission_uuid, self.anonymous_user_id, self.parts, file_names, file_urls, self.ora_block_id
+        )
+
+        mock_send_text_part_task.assert_has_calls(
+            [
+                call(
+                    self.submission_uuid,
+                    self.anonymous_user_id,
+                    "part1",
+                    1,
+                    self.ora_block_id,
+                    f"{self.submission_uuid}:part:1",
+                ),
+                call(
+                    self.submission_uuid,
+                    self.anonymous_user_id,
+                    "part2",
+                    2,
+                    self.ora_block_id,
+                    f"{self.submission_uuid}:part:2",
+                ),
+            ]
+        )
+        mock_send_uploaded_file_task.assert_has_calls(
+            [
+                call(
+                    self.submission_uuid,
+                    self.anonymous_user_id,
+                    "file1.txt",
+                    "/download/file1.txt",
+                    self.ora_block_id,
+                    f"{self.submission_uuid}:file:1",
+                ),
+                call(
+                    self.submission_uuid,
+                    self.anonymous_user_id,
+                    "file2.doc",
+                    "/download/file2.doc",
+                    self.ora_block_id,
+                    f"{self.submission_uuid}:file:2",
+                ),
+            ]
+        )
+        self.assertEqual(mock_send_uploaded_file_task.call_count, 2)
+        self.assertEqual(len(mock_group.call_args.args[0]), 3)
+        mock_group.return_value.apply_async.assert_called_once_with()
+
+    @patch(f"{TASKS_MODULE_PATH}.group")
+    def test_ora_submission_created_task_nothing_to_send(self, mock_group: Mock):
+        """
+        Test the `ora_submission_created_task` function without parts nor allowed files.
+
+        Expected result:
+            - No subtask is sent.
+        """
+        ora_submission_created_task(self.submission_uuid, self.anonymous_user_id, [], ["file.exe"], ["/file.exe"])
+
+        mock_group.assert_not_called()
+
+    @patch(f"{TASKS_MODULE_PATH}.TurnitinSubmission")
+    @patch(f"{TASKS_MODULE_PATH}.group")
+    def test_ora_submission_created_task_redelivered(self, mock_group: Mock, mock_turnitin_submission: Mock):
+        """
+        Test the `ora_submission_created_task` function when every unit was already uploaded.
+
+        Expected result:
+            - No subtask is sent.
+        """
+        mock_turnitin_submission.objects.filter.return_value.exclude.return_value.values_list.return_value = [
+            f"{self.submission_uuid}:part:1",
+            f"{self.submission_uuid}:file:1",
+        ]
 
         ora_submission_created_task(
-            self.submission_uuid, self.anonymous_user_id, self.parts, self.file_names, self.file_urls
+            self.submission_uuid, self.anonymous_user_id, [{"text": "part1"}], ["file1.txt"], ["/download/file1.txt"]
+        )
+
+        mock_group.assert_not_called()
+
+    @patch(f"{TASKS_MODULE_PATH}.user_by_anonymous_id")
+    @patch(f"{TASKS_MODULE_PATH}.send_text_part_to_turnitin")
+    def test_send_text_part_to_turnitin_task(self, mock_send_text_part: Mock, mock_user_by_anonymous_id: Mock):
+        """
+        Test the `send_text_part_to_turnitin_task` function.
+
+        Expected result:
+            - `send_text_part_to_turnitin` is called once with the user and the part.
+        """
+        mock_user_by_anonymous_id.return_value = self.user
+
+        send_text_part_to_turnitin_task(
+            self.submission_uuid, self.anonymous_user_id, "part1", 1, self.ora_block_id, "key"
         )
 
         mock_user_by_anonymous_id.assert_called_once_with(self.anonymous_user_id)
-        mock_send_text_to_turnitin.assert_called_once_with(self.submission_uuid, self.user, self.parts)
-        mock_send_uploaded_files_to_turnitin.assert_called_once_with(
-            self.submission_uuid,
-            self.user,
-            self.file_names,
-            self.file_urls,
+        mock_send_text_part.assert_called_once_with(
+            self.submission_uuid, self.user, "part1", 1, self.ora_block_id, "key"
         )
-        mock_is_submission_complete.assert_called()
-        mock_generate_similarity_report.assert_called_once_with(self.submission_uuid, self.user)
 
     @patch(f"{TASKS_MODULE_PATH}.user_by_anonymous_id")
-    @patch(f"{TASKS_MODULE_PATH}.send_text_to_turnitin")
-    @patch(f"{TASKS_MODULE_PATH}.send_uploaded_files_to_turnitin")
-    @patch(f"{TASKS_MODULE_PATH}.is_submission_complete")
-    @patch(f"{TASKS_MODULE_PATH}.generate_similarity_report")
-    @patch(f"{TASKS_MODULE_PATH}.sleep")
-    def test_ora_submission_created_task_with_retries(
-        self,
-        mock_sleep: Mock,
-        mock_generate_similarity_report: Mock,
-        mock_is_submission_complete: Mock,
-        mock_send_uploaded_files_to_turnitin: Mock,
-        mock_send_text_to_turnitin: Mock,
-        mock_user_by_anonymous_id: Mock,
-    ):
+    @patch(f"{TASKS_MODULE_PATH}.send_uploaded_file_to_turnitin")
+    def test_send_uploaded_file_to_turnitin_task(self, mock_send_uploaded_file: Mock, mock_user_by_anonymous_id: Mock):
         """
-        Test the `ora_submission_created_task` function with retries.
+        Test the `send_uploaded_file_to_turnitin_task` function.
 
         Expected result:
-            - `user_by_anonymous_id` is called once with the anonymous_user_id.
-            - `send_text_to_turnitin` is called once with the submission_uuid, user and parts.
-            - `send_uploaded_files_to_turnitin` is called once with the submission_uuid,
-                user, file_names and file_urls.
-            - `is_submission_complete` is called MAX_REQUEST_RETRIES times.
-            - `generate_similarity_report` is called once.
+            - `send_uploaded_file_to_turnitin` is called once with the user and the file.
         """
         mock_user_by_anonymous_id.return_value = self.user
-        mock_is_submission_complete.side_effect = [False] * (MAX_REQUEST_RETRIES - 1) + [True]
 
-        ora_submission_created_task(
-            self.submission_uuid, self.anonymous_user_id, self.parts, self.file_names, self.file_urls
+        send_uploaded_file_to_turnitin_task(
+            self.submission_uuid, self.anonymous_user_id, "file1.txt", "/download/file1.txt", self.ora_block_id, "key"
         )
 
         mock_user_by_anonymous_id.assert_called_once_with(self.anonymous_user_id)
-        mock_send_text_to_turnitin.assert_called_once_with(self.submission_uuid, self.user, self.parts)
-        mock_send_uploaded_files_to_turnitin.assert_called_once_with(
-            self.submission_uuid, self.user, self.file_names, self.file_urls
+        mock_send_uploaded_file.assert_called_once_with(
+            self.submission_uuid, self.user, "file1.txt", "/download/file1.txt", self.ora_block_id, "key"
         )
-        self.assertEqual(mock_is_submission_complete.call_count, MAX_REQUEST_RETRIES)
-        mock_generate_similarity_report.assert_called_once_with(self.submission_uuid, self.user)
-        self.assertEqual(mock_sleep.call_count, MAX_REQUEST_RETRIES - 1)
 
     @patch(f"{TASKS_MODULE_PATH}.send_file_to_turnitin")
-    def test_send_text_to_turnitin(self, mock_send_file_to_turnitin: Mock):
+    def test_send_text_part_to_turnitin(self, mock_send_file_to_turnitin: Mock):
         """
-        Test the `send_text_to_turnitin` function.
+        Test the `send_text_part_to_turnitin` function.
 
         Expected result:
-            - `send_file_to_turnitin` is called twice with the submission_id,
-                user and text parts.
+            - `send_file_to_turnitin` is called once with the encoded text and the part file name.
         """
-        response_txt = "Student's Text Response Part {}.txt"
+        send_text_part_to_turnitin(self.submission_uuid, self.user, "part2", 2, self.ora_block_id)
 
-        send_text_to_turnitin(self.submission_uuid, self.user, self.parts)
+        mock_send_file_to_turnitin.assert_called_once_with(
+            self.submission_uuid,
+            self.user,
+            "part2".encode("utf-8"),
+            "Student's Text Response Part 2.txt",
+            self.ora_block_id,
+            None,
+        )
 
-        calls = [
-            call(self.submission_uuid, self.user, "part1".encode("utf-8"), response_txt.format(1)),
-            call(self.submission_uuid, self.user, "part2".encode("utf-8"), response_txt.format(2)),
-        ]
-        mock_send_file_to_turnitin.assert_has_calls(calls)
+    @patch(f"{TASKS_MODULE_PATH}.requests.get")
+    @patch(f"{TASKS_MODULE_PATH}.send_file_to_turnitin")
+    def test_send_uploaded_file_to_turnitin(self, mock_send_file_to_turnitin: Mock, mock_get: Mock):
+        """
+        Test the `send_uploaded_file_to_turnitin` function.
 
+        Expected result:
+            - The file is downloaded in chunks.
+            - `send_file_to_turnitin` is called once with the downloaded file and its content hash.
+        """
+        mock_get.return_value.__enter__.return_value = Mock(
+            ok=True, headers={}, iter_content=Mock(return_value=[b"file ", b"content"])
+        )
+        mock_send_file_to_turnitin.side_effect = lambda *args: self.assertEqual(args[2].read(), b"file content")
+
+        send_uploaded_file_to_turnitin(
+            self.submission_uuid, self.user, "file1.txt", "/download/file1.txt", self.ora_block_id
+        )
+
+        self.assertTrue(mock_get.call_args.kwargs["stream"])
+        mock_send_file_to_turnitin.assert_called_once_with(
+            self.submission_uuid, self.user, ANY, "file1.txt", self.ora_block_id, None, FILE_CONTENT_HASH
+        )
+
+    @override_settings(TURNITIN_UPLOAD_MAX_MEMORY_SIZE=12)
+    @patch(f"{TASKS_MODULE_PATH}.tempfile")
+    @patch(f"{TASKS_MODULE_PATH}.requests.get")
     @patch(f"{TASKS_MODULE_PATH}.send_file_to_turnitin")
-    def test_send_text_to_turnitin_empty_answer(self, mock_send_file_to_turnitin: Mock):
+    def test_send_uploaded_file_to_turnitin_in_memory(
+        self, mock_send_file_to_turnitin: Mock, mock_get: Mock, mock_tempfile: Mock
+    ):
         """
-        Test the `send_text_to_turnitin` function with an empty answer.
+        Test the `send_uploaded_file_to_turnitin` function with a small file.
 
         Expected result:
-            - `send_file_to_turnitin` function is not called.
+            - The file is spooled to an in-memory buffer instead of a temporary file.
         """
-        send_text_to_turnitin(self.submission_uuid, self.user, [])
+        mock_get.return_value.__enter__.return_value = Mock(
+            ok=True, headers={"Content-Length": "12"}, iter_content=Mock(return_value=[b"file ", b"content"])
+        )
 
-        self.assertFalse(mock_send_file_to_turnitin.called)
+        send_uploaded_file_to_turnitin(
+            self.submission_uuid, self.user, "file1.txt", "/download/file1.txt", self.ora_block_id
+        )
+
+        self.assertFalse(mock_tempfile.mock_calls)
+        self.assertIsInstance(mock_send_file_to_turnitin.call_args.args[2], io.BytesIO)
 
+    @patch(f"{TASKS_MODULE_PATH}.open_stored_file")
     @patch(f"{TASKS_MODULE_PATH}.requests.get")
     @patch(f"{TASKS_MODULE_PATH}.send_file_to_turnitin")
-    def test_send_uploaded_files_to_turnitin(self, mock_send_file_to_turnitin: Mock, mock_get: Mock):
+    def test_send_uploaded_file_to_turnitin_from_storage(
+        self, mock_send_file_to_turnitin: Mock, mock_get: Mock, mock_open_stored_file: Mock
+    ):
         """
-        Test the `send_uploaded_files_to_turnitin` function.
+        Test the `send_uploaded_file_to_turnitin` function with a file in the storage backend.
 
         Expected result:
-            - `send_file_to_turnitin` is called twice with the submission_uuid,
-                user, file_names and file_urls.
+            - The file is read from the storage instead of downloaded.
         """
-        file_names = ["file1.txt", "file2.doc"]
-        file_urls = ["/download/file1.txt", "/download/file2.doc"]
-        mock_get.return_value = Mock(ok=True, content=b"file content")
+        stored_file = File(io.BytesIO(b"file content"))
+        mock_open_stored_file.return_value = stored_file
 
-        send_uploaded_files_to_turnitin(self.submission_uuid, self.user, file_names, file_urls)
+        send_uploaded_file_to_turnitin(
+            self.submission_uuid, self.user, "file1.txt", "/download/file1.txt", self.ora_block_id
+        )
 
-        calls = [
-            call(self.submission_uuid, self.user, b"file content", "file1.txt"),
-            call(self.submission_uuid, self.user, b"file content", "file2.doc"),
-        ]
-        mock_send_file_to_turnitin.assert_has_calls(calls)
-        self.assertEqual(mock_send_file_to_turnitin.call_count, 2)
+        mock_get.assert_not_called()
+        self.assertTrue(stored_file.closed)
+        mock_send_file_to_turnitin.assert_called_once_with(
+            self.submission_uuid, self.user, ANY, "file1.txt", self.ora_block_id, None, FILE_CONTENT_HASH
+        )
 
+    @override_settings(TURNITIN_MAX_FILE_SIZE=8)
+    @patch(f"{TASKS_MODULE_PATH}.is_turnitin_submission_claimed", Mock(return_value=False))
+    @patch(f"{TASKS_MODULE_PATH}.claim_turnitin_submission")
     @patch(f"{TASKS_MODULE_PATH}.requests.get")
     @patch(f"{TASKS_MODULE_PATH}.send_file_to_turnitin")
-    def test_send_uploaded_files_to_turnitin_failure_to_download(
-        self, mock_send_file_to_turnitin: Mock, mock_get: Mock
+    def test_send_uploaded_file_to_turnitin_too_large(
+        self, mock_send_file_to_turnitin: Mock, mock_get: Mock, mock_claim_turnitin_submission: Mock
     ):
         """
-        Test the `send_uploaded_files_to_turnitin` function with a failure to download a file.
+        Test the `send_uploaded_file_to_turnitin` function with a file larger than the maximum size.
+
+        Expected result:
+            - The download is aborted and the file is not sent to Turnitin.
+            - The unit is marked as ERROR so it is not downloaded again.
+        """
+        mock_get.return_value.__enter__.return_value = Mock(
+            ok=True, headers={}, iter_content=Mock(return_value=[b"file ", b"content"])
+        )
+
+        send_uploaded_file_to_turnitin(
+            self.submission_uuid, self.user, "file1.txt", "/download/file1.txt", self.ora_block_id, "key"
+        )
+
+        mock_send_file_to_turnitin.assert_not_called()
+        mock_claim_turnitin_submission.return_value.set_status.assert_called_once_with(
+            TurnitinSubmission.Status.ERROR, "The file is larger than the maximum of 8 bytes."
+        )
+
+    @patch(f"{TASKS_MODULE_PATH}.requests.get")
+    @patch(f"{TASKS_MODULE_PATH}.send_file_to_turnitin")
+    def test_send_uploaded_file_to_turnitin_failure_to_download(self, mock_send_file_to_turnitin: Mock, mock_get: Mock):
+        """
+        Test the `send_uploaded_file_to_turnitin` function with a failure to download a file.
 
         Expected result:
             - An exception is raised with the correct message.
             - `send_file_to_turnitin` function is not called.
         """
         file_link = "/download/file1.txt"
-        file_names = ["file1.txt"]
-        file_urls = [file_link]
         exception_message = f"Failed to download file from {file_link}"
-        mock_get.return_value = Mock(ok=False)
+        mock_get.return_value.__enter__.return_value = Mock(ok=False)
 
         with self.assertRaises(Exception) as context:
-            send_uploaded_files_to_turnitin(self.submission_uuid, self.user, file_names, file_urls)
+            send_uploaded_file_to_turnitin(self.submission_uuid, self.user, "file1.txt", file_link)
 
         mock_send_file_to_turnitin.assert_not_called()
         self.assertEqual(exception_message, str(context.exception))
 
-    @patch(f"{TASKS_MODULE_PATH}.tempfile.NamedTemporaryFile")
+    @patch(f"{TASKS_MODULE_PATH}.reuse_turnitin_submission")
+    @patch(f"{TASKS_MODULE_PATH}.tempfile")
     @patch(f"{TASKS_MODULE_PATH}.upload_turnitin_submission")
-    def test_send_file_to_turnitin(self, mock_upload_turnitin_submission: Mock, mock_temp_file: Mock):
+    def test_send_file_to_turnitin(
+        self, mock_upload_turnitin_submission: Mock, mock_tempfile: Mock, mock_reuse_turnitin_submission: Mock
+    ):
         """
         Test the `send_file_to_turnitin` function.
 
         Expected result:
-            - `tempfile.NamedTemporaryFile` is called once.
+            - No temporary file is created.
             - `upload_turnitin_submission` is called once with the submission_id,
-                user and file content.
+                user, an in-memory buffer with the content, ORA block, content hash and file name.
         """
         file_content = b"file content"
         filename = "file.txt"
-        mock_file = mock_temp_file.return_value.__enter__.return_value
-        mock_file.name = filename
+        mock_reuse_turnitin_submission.return_value = False
+
+        send_file_to_turnitin(self.submission_uuid, self.user, file_content, filename, self.ora_block_id)
+
+        self.assertFalse(mock_tempfile.mock_calls)
+        mock_upload_turnitin_submission.assert_called_once_with(
+            self.submission_uuid, self.user, ANY, self.ora_block_id, FILE_CONTENT_HASH, None, filename
+        )
+        uploaded_file = mock_upload_turnitin_submission.call_args.args[2]
+        self.assertIsInstance(uploaded_file, io.BytesIO)
+        self.assertEqual(uploaded_file.read(), file_content)
+
+    @patch(f"{TASKS_MODULE_PATH}.reuse_turnitin_submission")
+    @patch(f"{TASKS_MODULE_PATH}.upload_turnitin_submission")
+    def test_send_file_to_turnitin_file(
+        self, mock_upload_turnitin_submission: Mock, mock_reuse_turnitin_submission: Mock
+    ):
+        """
+        Test the `send_file_to_turnitin` function with a binary file.
+
+        Expected result:
+            - The file is hashed in chunks and uploaded as is.
+        """
+        file = io.BytesIO(b"file content")
+        mock_reuse_turnitin_submission.return_value = False
+
+        send_file_to_turnitin(self.submission_uuid, self.user, file, "file.txt", self.ora_block_id)
+
+        mock_upload_turnitin_submission.assert_called_once_with(
+            self.submission_uuid, self.user, file, self.ora_block_id, FILE_CONTENT_HASH, None, "file.txt"
+        )
+        self.assertEqual(file.tell(), 0)
+
+    @patch(f"{TASKS_MODULE_PATH}.reuse_turnitin_submission")
+    @patch(f"{TASKS_MODULE_PATH}.upload_turnitin_submission")
+    def test_send_file_to_turnitin_duplicated_content(
+        self, mock_upload_turnitin_submission: Mock, mock_reuse_turnitin_submission: Mock
+    ):
+        """
+        Test the `send_file_to_turnitin` function when the content was already sent.
+
+        Expected result:
+            - `reuse_turnitin_submission` is called with the content hash.
+            - `upload_turnitin_submission` is not called.
+        """
+        mock_reuse_turnitin_submission.return_value = True
+
+        send_file_to_turnitin(self.submission_uuid, self.user, b"file content", "file.txt", self.ora_block_id)
+
+        mock_reuse_turnitin_submission.assert_called_once_with(
+            self.submission_uuid, self.user, "file.txt", self.ora_block_id, FILE_CONTENT_HASH, None
+        )
+        mock_upload_turnitin_submission.assert_not_called()
+
+    @patch(f"{TASKS_MODULE_PATH}.claim_turnitin_submission")
+    @patch(f"{TASKS_MODULE_PATH}.reuse_turnitin_submission")
+    @patch(f"{TASKS_MODULE_PATH}.upload_turnitin_submission")
+    def test_send_file_to_turnitin_already_claimed(
+        self,
+        mock_upload_turnitin_submission: Mock,
+        mock_reuse_turnitin_submission: Mock,
+        mock_claim_turnitin_submission: Mock,
+    ):
+        """
+        Test the `send_file_to_turnitin` function when the unit was already claimed.
+
+        Expected result:
+            - Nothing is sent to Turnitin.
+        """
+        mock_claim_turnitin_submission.return_value = None
+
+        send_file_to_turnitin(self.submission_uuid, self.user, b"file content", "file.txt", self.ora_block_id, "key")
+
+        mock_claim_turnitin_submission.assert_called_once_with(
+            "key", self.user, self.submission_uuid, "file.txt", self.ora_block_id, len(b"file content")
+        )
+        mock_reuse_turnitin_submission.assert_not_called()
+        mock_upload_turnitin_submission.assert_not_called()
+
+    @patch(f"{TASKS_MODULE_PATH}.TurnitinSubmission")
+    @patch(f"{TASKS_MODULE_PATH}.claim_turnitin_submission")
+    @patch(f"{TASKS_MODULE_PATH}.reuse_turnitin_submission")
+    @patch(f"{TASKS_MODULE_PATH}.upload_turnitin_submission")
+    def test_send_file_to_turnitin_releases_claim_on_failure(
+        self,
+        mock_upload_turnitin_submission: Mock,
+        mock_reuse_turnitin_submission: Mock,
+        mock_claim_turnitin_submission: Mock,
+        mock_turnitin_submission: Mock,
+    ):
+        """
+        Test the `send_file_to_turnitin` function when the upload fails.
+
+        Expected result:
+            - The claim is released but the row is kept, so a retry resumes from it.
+            - The exception is raised.
+        """
+        mock_reuse_turnitin_submission.return_value = False
+        mock_upload_turnitin_submission.side_effect = Exception("Upload failed")
 
-        send_file_to_turnitin(self.submission_uuid, self.user, file_content, filename)
+        with self.assertRaises(Exception):
+            send_file_to_turnitin(
+                self.submission_uuid, self.user, b"file content", "file.txt", self.ora_block_id, "key"
+            )
 
-        mock_temp_file.assert_called_once()
-        mock_file.write.assert_called_once_with(file_content)
-        mock_file.seek.assert_called_once_with(0)
-        mock_upload_turnitin_submission.assert_called_once_with(self.submission_uuid, self.user, mock_file)
+        mock_turnitin_submission.objects.filter.assert_called_once_with(
+            pk=mock_claim_turnitin_submission.return_value.pk
+        )
+        mock_turnitin_submission.objects.filter.return_value.update.assert_called_once_with(
+            claimed_at=None, error_message="Upload failed"
+        )
 
     @patch(f"{TASKS_MODULE_PATH}.TurnitinClient")
     def test_upload_turnitin_submission(self, mock_turnitin_client: Mock):
@@ -229,13 +478,53 @@ class TestOraSubmissionCreatedTask(TestCase):
             - `upload_turnitin_submission_file` is called once with the submission_id.
         """
         mock_turnitin_client_instance = mock_turnitin_client.return_value
+        mock_turnitin_client_instance.is_eula_accepted.return_value = False
         mock_turnitin_client_instance.accept_eula_agreement.return_value.ok = True
 
         upload_turnitin_submission(self.submission_uuid, self.user, self.file)
 
-        mock_turnitin_client.assert_called_once_with(self.user, self.file)
+        mock_turnitin_client.assert_called_once_with(self.user, self.file, None)
         mock_turnitin_client_instance.accept_eula_agreement.assert_called_once()
-        mock_turnitin_client_instance.upload_turnitin_submission_file.assert_called_once_with(self.submission_uuid)
+        mock_turnitin_client_instance.upload_turnitin_submission_file.assert_called_once_with(
+            self.submission_uuid, ora_block_id=None, content_hash=None, submission=None
+        )
+
+    @patch(f"{TASKS_MODULE_PATH}.TurnitinClient")
+    def test_upload_turnitin_submission_not_uploaded(self, mock_turnitin_client: Mock):
+        """
+        Test the `upload_turnitin_submission` function when the content upload fails.
+
+        Expected result:
+            - An exception is raised so the task is retried from the claimed row.
+        """
+        mock_turnitin_client.return_value.is_eula_accepted.return_value = True
+        claimed_submission = Mock(status=TurnitinSubmission.Status.CREATED)
+
+        with self.assertRaises(Exception) as context:
+            upload_turnitin_submission(
+                self.submission_uuid, self.user, self.file, claimed_submission=claimed_submission
+            )
+
+        self.assertEqual("Failed to upload the file to Turnitin.", str(context.exception))
+
+    @patch(f"{TASKS_MODULE_PATH}.TurnitinClient")
+    def test_upload_turnitin_submission_eula_already_accepted(self, mock_turnitin_client: Mock):
+        """
+        Test the `upload_turnitin_submission` function when the EULA was already accepted.
+
+        Expected result:
+            - `accept_eula_agreement` is not called.
+            - `upload_turnitin_submission_file` is called once with the submission_id.
+        """
+        mock_turnitin_client_instance = mock_turnitin_client.return_value
+        mock_turnitin_client_instance.is_eula_accepted.return_value = True
+
+        upload_turnitin_submission(self.submission_uuid, self.user, self.file)
+
+        mock_turnitin_client_instance.accept_eula_agreement.assert_not_called()
+        mock_turnitin_client_instance.upload_turnitin_submission_file.assert_called_once_with(
+            self.submission_uuid, ora_block_id=None, content_hash=None, submission=None
+        )
 
     @patch(f"{TASKS_MODULE_PATH}.TurnitinClient")
     def test_upload_turnitin_submission_eula_failure(self, mock_turnitin_client: Mock):
@@ -249,158 +538,568 @@ class TestOraSubmissionCreatedTask(TestCase):
             - `upload_turnitin_submission_file` is not called.
         """
         mock_turnitin_client_instance = mock_turnitin_client.return_value
+        mock_turnitin_client_instance.is_eula_accepted.return_value = False
         mock_turnitin_client_instance.accept_eula_agreement.return_value.ok = False
 
         with self.assertRaises(Exception) as context:
             upload_turnitin_submission(self.submission_uuid, self.user, self.file)
 
         self.assertEqual("Failed to accept the EULA agreement.", str(context.exception))
-        mock_turnitin_client.assert_called_once_with(self.user, self.file)
+        mock_turnitin_client.assert_called_once_with(self.user, self.file, None)
         mock_turnitin_client_instance.accept_eula_agreement.assert_called_once()
         mock_turnitin_client_instance.upload_turnitin_submission_file.assert_not_called()
 
-    @patch(f"{TASKS_MODULE_PATH}.get_submission_status")
-    @patch(f"{TASKS_MODULE_PATH}.log.info")
-    def test_is_submission_complete_with_non_ok_status_code(
-        self, mock_log_info: Mock, mock_get_submission_status: Mock
-    ):
+    @patch(f"{TASKS_MODULE_PATH}.process_webhook_event")
+    def test_process_webhook_event_task(self, mock_process_webhook_event: Mock):
         """
-        Test the `is_submission_complete` function with a non-OK status code.
+        Test the `process_webhook_event_task` function.
 
         Expected result:
-            - The function returns False.
-            - `get_submission_status` is called once with the submission_id and user.
-            - `log.info` is not called.
+            - `process_webhook_event` is called once with the event type and payload.
         """
-        mock_get_submission_status.return_value = Mock(status_code=status.HTTP_400_BAD_REQUEST)
+        payload = {"id": "turnitin-submission-id", "status": "COMPLETE"}
 
-        result = is_submission_complete(self.submission_uuid, self.user)
+        process_webhook_event_task("SUBMISSION_COMPLETE", payload)
 
-        self.assertFalse(result)
-        mock_get_submission_status.assert_called_once_with(self.submission_uuid, self.user)
-        mock_log_info.assert_not_called()
+        mock_process_webhook_event.assert_called_once_with("SUBMISSION_COMPLETE", payload)
 
-    @patch(f"{TASKS_MODULE_PATH}.get_submission_status")
-    @patch(f"{TASKS_MODULE_PATH}.log.info")
-    def test_is_submission_complete_with_all_complete_submissions(
-        self, mock_log_info: Mock, mock_get_submission_status: Mock
-    ):
+    @patch(f"{TASKS_MODULE_PATH}.refresh_stored_info")
+    def test_refresh_stored_info_task(self, mock_refresh_stored_info: Mock):
         """
-        Test the `is_submission_complete` function with all submissions complete.
+        Test the `refresh_stored_info_task` function.
 
         Expected result:
-            - The function returns True.
-            - `get_submission_status` is called once with the submission_id and user.
-            - `log.info` is called once with the correct message.
+            - `refresh_stored_info` is called once with the kind and the submission IDs.
         """
-        mock_get_submission_status.return_value = Mock(
-            status_code=status.HTTP_200_OK,
-            data=[{"status": "COMPLETE"}, {"status": "COMPLETE"}],
+        refresh_stored_info_task("submission_info", ["turnitin-submission-id"])
+
+        mock_refresh_stored_info.assert_called_once_with("submission_info", ["turnitin-submission-id"])
+
+
+class TestReuseTurnitinSubmission(DjangoTestCase):
+    """Tests for the reuse_turnitin_submission function."""
+
+    def setUp(self) -> None:
+        self.user = User.objects.create(username="john_doe")
+        self.ora_block_id = "block-v1:edX+DemoX+Demo_Course+type@openassessment+block@ora"
+        TurnitinSubmission.objects.create(
+            user=self.user,
+            ora_submission_id="first-submission-uuid",
+            ora_block_id=self.ora_block_id,
+            turnitin_submission_id="turnitin-submission-id",
+            file_name="file.txt",
+            content_hash=FILE_CONTENT_HASH,
+            status=TurnitinSubmission.Status.REPORT_READY,
+            page_count=2,
+            submission_info={"status": "COMPLETE"},
+            similarity_report_info={"status": "COMPLETE", "overall_match_percentage": 15},
+            similarity_score=15,
+            report_status="COMPLETE",
+        )
+
+    def test_reuse_turnitin_submission(self):
+        """
+        Test the `reuse_turnitin_submission` function with the same content in the same ORA block.
+
+        Expected result:
+            - The existing Turnitin submission is linked to the new ORA submission in the same step.
+            - The stored submission and similarity report information is copied.
+        """
+        reused = reuse_turnitin_submission(
+            "second-submission-uuid", self.user, "file.txt", self.ora_block_id, FILE_CONTENT_HASH
+        )
+
+        submission = TurnitinSubmission.objects.get(ora_submission_id="second-submission-uuid")
+        self.assertTrue(reused)
+        self.assertEqual(submission.turnitin_submission_id, "turnitin-submission-id")
+        self.assertEqual(submission.status, TurnitinSubmission.Status.REPORT_READY)
+        self.assertEqual(submission.course_id, "course-v1:edX+DemoX+Demo_Course")
+        self.assertEqual(submission.page_count, 2)
+        self.assertEqual(submission.submission_info, {"status": "COMPLETE"})
+        self.assertEqual(submission.similarity_report_info["overall_match_percentage"], 15)
+        self.assertEqual(submission.similarity_score, 15)
+        self.assertEqual(submission.report_status, "COMPLETE")
+
+    def test_reuse_turnitin_submission_claimed(self):
+        """
+        Test the `reuse_turnitin_submission` function with a row claimed for the unit.
+
+        Expected result:
+            - The claimed row is linked to the existing Turnitin submission with its stored information.
+        """
+        claimed_submission = TurnitinSubmission.objects.create(
+            user=self.user, ora_submission_id="second-submission-uuid", idempotency_key="second-submission-uuid:file:1"
+        )
+
+        reused = reuse_turnitin_submission(
+            "second-submission-uuid",
+            self.user,
+            "file.txt",
+            self.ora_block_id,
+            FILE_CONTENT_HASH,
+            claimed_submission,
+        )
+
+        claimed_submission.refresh_from_db()
+        self.assertTrue(reused)
+        self.assertEqual(claimed_submission.turnitin_submission_id, "turnitin-submission-id")
+        self.assertEqual(claimed_submission.status, TurnitinSubmission.Status.REPORT_READY)
+        self.assertEqual(claimed_submission.similarity_score, 15)
+        self.assertEqual(claimed_submission.report_status, "COMPLETE")
+
+    def test_reuse_turnitin_submission_redelivered(self):
+        """
+        Test the `reuse_turnitin_submission` function when the same ORA submission is processed again.
+
+        Expected result:
+            - No new row is created.
+        """
+        reused = reuse_turnitin_submission(
+            "first-submission-uuid", self.user, "file.txt", self.ora_block_id, FILE_CONTENT_HASH
+        )
+
+        self.assertTrue(reused)
+        self.assertEqual(TurnitinSubmission.objects.count(), 1)
+
+    def test_reuse_turnitin_submission_not_found(self):
+        """
+        Test the `reuse_turnitin_submission` function with new content, another block, no block or a failure.
+
+        Expected result:
+            - Nothing is reused.
+        """
+        self.assertFalse(
+            reuse_turnitin_submission("second-submission-uuid", self.user, "file.txt", self.ora_block_id, "other")
+        )
+        self.assertFalse(
+            reuse_turnitin_submission("second-submission-uuid", self.user, "file.txt", "other", FILE_CONTENT_HASH)
+        )
+        self.assertFalse(reuse_turnitin_submission("second-submission-uuid", self.user, "file.txt", None, ""))
+
+        TurnitinSubmission.objects.update(status=TurnitinSubmission.Status.ERROR)
+
+        self.assertFalse(
+            reuse_turnitin_submission(
+                "second-submission-uuid", self.user, "file.txt", self.ora_block_id, FILE_CONTENT_HASH
+            )
+        )
+
+
+class TestClaimTurnitinSubmission(DjangoTestCase):
+    """Tests for the claim_turnitin_submission function."""
+
+    def setUp(self) -> None:
+        self.user = User.objects.create(username="john_doe")
+        self.idempotency_key = "submission-uuid:part:1"
+
+    def claim(self):
+        """Claim the part on behalf of a worker."""
+        return claim_turnitin_submission(self.idempotency_key, self.user, "submission-uuid", "file.txt", None)
+
+    def test_claim_turnitin_submission(self):
+        """
+        Test the `claim_turnitin_submission` function with a new and a claimed unit.
+
+        Expected result:
+            - The first claim creates the row.
+            - The second claim is rejected.
+        """
+        submission = self.claim()
+
+        self.assertEqual(submission.idempotency_key, self.idempotency_key)
+        self.assertIsNotNone(submission.claimed_at)
+        self.assertIsNone(self.claim())
+        self.assertEqual(TurnitinSubmission.objects.count(), 1)
+
+    def test_claim_turnitin_submission_course(self):
+        """
+        Test the `claim_turnitin_submission` function with an ORA block.
+
+        Expected result:
+            - The row stores the ORA block and its course.
+        """
+        submission = claim_turnitin_submission(
+            self.idempotency_key,
+            self.user,
+            "submission-uuid",
+            "file.txt",
+            "block-v1:edX+DemoX+Demo_Course+type@openassessment+block@ora",
+        )
+
+        self.assertEqual(submission.ora_block_id, "block-v1:edX+DemoX+Demo_Course+type@openassessment+block@ora")
+        self.assertEqual(submission.course_id, "course-v1:edX+DemoX+Demo_Course")
+
+    def test_claim_turnitin_submission_stale(self):
+        """
+        Test the `claim_turnitin_submission` function with a claim left by a dead worker.
+
+        Expected result:
+            - A stale claim of a row not uploaded yet is taken over.
+            - A stale claim of an uploaded row is not.
+        """
+        submission = self.claim()
+        stale_claimed_at = timezone.now() - timedelta(seconds=IDEMPOTENCY_CLAIM_TIMEOUT + 1)
+        TurnitinSubmission.objects.filter(pk=submission.pk).update(claimed_at=stale_claimed_at)
+
+        self.assertEqual(self.claim().pk, submission.pk)
+
+        TurnitinSubmission.objects.filter(pk=submission.pk).update(
+            claimed_at=stale_claimed_at, status=TurnitinSubmission.Status.UPLOADED
+        )
+
+        self.assertIsNone(self.claim())
+
+    def test_claim_turnitin_submission_released(self):
+        """
+        Test the `claim_turnitin_submission` function with a claim released by a failed attempt.
+
+        Expected result:
+            - The row is claimed again and keeps its Turnitin submission.
+        """
+        submission = self.claim()
+        TurnitinSubmission.objects.filter(pk=submission.pk).update(
+            claimed_at=None, turnitin_submission_id="turnitin-submission-id"
+        )
+
+        self.assertEqual(self.claim().turnitin_submission_id, "turnitin-submission-id")
+
+    def test_is_turnitin_submission_claimed(self):
+        """
+        Test the `is_turnitin_submission_claimed` function through the life of a claim.
+
+        Expected result:
+            - A new, released or stale claim can be claimed.
+            - A claim in progress or an uploaded unit cannot.
+        """
+        self.assertFalse(is_turnitin_submission_claimed(self.idempotency_key))
+
+        submission = self.claim()
+
+        self.assertTrue(is_turnitin_submission_claimed(self.idempotency_key))
+
+        TurnitinSubmission.objects.filter(pk=submission.pk).update(claimed_at=None)
+
+        self.assertFalse(is_turnitin_submission_claimed(self.idempotency_key))
+
+        stale_claimed_at = timezone.now() - timedelta(seconds=IDEMPOTENCY_CLAIM_TIMEOUT + 1)
+        TurnitinSubmission.objects.filter(pk=submission.pk).update(claimed_at=stale_claimed_at)
+
+        self.assertFalse(is_turnitin_submission_claimed(self.idempotency_key))
+
+        TurnitinSubmission.objects.filter(pk=submission.pk).update(status=TurnitinSubmission.Status.UPLOADED)
+
+        self.assertTrue(is_turnitin_submission_claimed(self.idempotency_key))
+
+    @patch(f"{TASKS_MODULE_PATH}.send_file_to_turnitin")
+    @patch(f"{TASKS_MODULE_PATH}.open_uploaded_file")
+    def test_send_uploaded_file_to_turnitin_claimed(self, mock_open_uploaded_file: Mock, mock_send_file: Mock):
+        """
+        Test the `send_uploaded_file_to_turnitin` function with a file claimed by another worker.
+
+        Expected result:
+            - The file is neither downloaded nor sent.
+        """
+        self.claim()
+
+        send_uploaded_file_to_turnitin(
+            "submission-uuid", self.user, "file.txt", "/download/file.txt", None, self.idempotency_key
         )
 
-        result = is_submission_complete(self.submission_uuid, self.user)
+        mock_open_uploaded_file.assert_not_called()
+        mock_send_file.assert_not_called()
+
 
-        self.assertTrue(result)
-        mock_get_submission_status.assert_called_once_with(self.submission_uuid, self.user)
-        mock_log_info.assert_called_once_with(f"Submission [{self.submission_uuid}] is complete.")
+class TestPollPendingSubmissions(DjangoTestCase):
+    """Tests for the periodic polling of the Turnitin submissions."""
+
+    def setUp(self) -> None:
+        self.user = User.objects.create(username="john_doe")
 
-    @patch(f"{TASKS_MODULE_PATH}.get_submission_status")
-    @patch(f"{TASKS_MODULE_PATH}.log.info")
-    def test_is_submission_complete_with_all_error_submissions(
-        self, mock_log_info: Mock, mock_get_submission_status: Mock
+    def create_submission(self, turnitin_submission_id: str, status: str, **kwargs) -> TurnitinSubmission:
+        """Create a Turnitin submission in the given step."""
+        return TurnitinSubmission.objects.create(
+            user=self.user, turnitin_submission_id=turnitin_submission_id, status=status, **kwargs
+        )
+
+    @patch(f"{TASKS_MODULE_PATH}.request_pending_similarity_reports")
+    @patch(f"{TASKS_MODULE_PATH}.poll_pending_submissions")
+    def test_poll_pending_submissions_task(
+        self, mock_poll_pending_submissions: Mock, mock_request_pending_similarity_reports: Mock
     ):
         """
-        Test the `is_submission_complete` function with all submissions in error.
+        Test the `poll_pending_submissions_task` function with and without a run in progress.
+
+        Expected result:
+            - The submissions are polled and the reports requested once the lock is free.
+            - Nothing is done while another run holds the lock.
+            - The lock is released at the end of the run.
+        """
+        cache.set(POLLING_LOCK_KEY, True)
+
+        poll_pending_submissions_task()
+
+        mock_poll_pending_submissions.assert_not_called()
+
+        cache.delete(POLLING_LOCK_KEY)
+        mock_poll_pending_submissions.return_value = 0
+        mock_request_pending_similarity_reports.return_value = 0
+
+        poll_pending_submissions_task()
+
+        mock_poll_pending_submissions.assert_called_once_with()
+        mock_request_pending_similarity_reports.assert_called_once_with()
+        self.assertIsNone(cache.get(POLLING_LOCK_KEY))
+
+    @override_settings(TURNITIN_POLLING_BATCH_SIZE=2, TURNITIN_POLLING_MAX_WORKERS=2)
+    @patch(f"{TASKS_MODULE_PATH}.schedule_next_poll")
+    @patch(f"{TASKS_MODULE_PATH}.fetch_submission_info")
+    def test_poll_pending_submissions(self, mock_fetch_submission_info: Mock, mock_schedule_next_poll: Mock):
+        """
+        Test the `poll_pending_submissions` function with submissions in every step.
+
+        Expected result:
+            - Every uploaded or processing Turnitin submission due for a check is polled once, across batches.
+            - The statuses returned by Turnitin are stored.
+            - The next check of every polled submission is scheduled.
+        """
+        now = timezone.now()
+        for idx in range(1, 4):
+            self.create_submission(f"processing-{idx}", TurnitinSubmission.Status.PROCESSING)
+        self.create_submission("processing-1", TurnitinSubmission.Status.PROCESSING)
+        self.create_submission("uploaded", TurnitinSubmission.Status.UPLOADED, next_poll_at=now)
+        self.create_submission("not-due", TurnitinSubmission.Status.UPLOADED, next_poll_at=now + timedelta(seconds=60))
+        self.create_submission("complete", TurnitinSubmission.Status.COMPLETE)
+        mock_fetch_submission_info.side_effect = lambda turnitin_submission_id: (
+            None if turnitin_submission_id == "uploaded" else {"status": "COMPLETE"}
+        )
+
+        self.assertEqual(poll_pending_submissions(), 4)
+
+        self.assertCountEqual(
+            [call_args.args[0] for call_args in mock_fetch_submission_info.call_args_list],
+            ["processing-1", "processing-2", "processing-3", "uploaded"],
+        )
+        self.assertEqual(TurnitinSubmission.objects.filter(status=TurnitinSubmission.Status.COMPLETE).count(), 5)
+        self.assertCountEqual(
+            mock_schedule_next_poll.call_args_list,
+            [call("processing-1", 0), call("processing-2", 0), call("processing-3", 0), call("uploaded", 0)],
+        )
+
+    @patch(f"{TASKS_MODULE_PATH}.schedule_next_poll")
+    @patch(f"{TASKS_MODULE_PATH}.fetch_submission_info")
+    def test_poll_pending_submissions_deferred(self, mock_fetch_submission_info: Mock, mock_schedule_next_poll: Mock):
+        """
+        Test the `poll_pending_submissions` function when the checks are deferred before reaching Turnitin.
 
         Expected result:
-            - The function returns True.
-            - `get_submission_status` is called once with the submission_id and user.
-            - `log.info` is called once with the correct message.
+            - The other submissions of the batch are still polled.
+            - The deferred checks are rescheduled after the wait of the rate limiter or the circuit breaker,
+              without counting an attempt.
         """
-        mock_get_submission_status.return_value = Mock(
-            status_code=status.HTTP_200_OK,
-            data=[{"status": "ERROR"}, {"status": "ERROR"}],
+        self.create_submission("limited", TurnitinSubmission.Status.UPLOADED)
+        self.create_submission("polled", TurnitinSubmission.Status.UPLOADED)
+        self.create_submission("unavailable", TurnitinSubmission.Status.PROCESSING)
+        errors = {"limited": TurnitinRateLimited("status", 30), "unavailable": TurnitinCircuitOpen("status", 60)}
+
+        def fetch_submission_info(turnitin_submission_id: str) -> dict:
+            if turnitin_submission_id in errors:
+                raise errors[turnitin_submission_id]
+            return {"status": "PROCESSING"}
+
+        mock_fetch_submission_info.side_effect = fetch_submission_info
+
+        self.assertEqual(poll_pending_submissions(), 3)
+
+        self.assertCountEqual(
+            mock_schedule_next_poll.call_args_list,
+            [call("limited", 30, attempted=False), call("polled", 0), call("unavailable", 60, attempted=False)],
         )
 
-        result = is_submission_complete(self.submission_uuid, self.user)
+    @patch(f"{TASKS_MODULE_PATH}.fetch_submission_info")
+    @patch(f"{TASKS_MODULE_PATH}.fetch_similarity_report_info")
+    def test_poll_pending_submissions_reports(
+        self, mock_fetch_similarity_report_info: Mock, mock_fetch_submission_info: Mock
+    ):
+        """
+        Test the `poll_pending_submissions` function with requested similarity reports.
 
-        self.assertTrue(result)
-        mock_get_submission_status.assert_called_once_with(self.submission_uuid, self.user)
-        mock_log_info.assert_called_once_with(f"Submission [{self.submission_uuid}] is complete.")
+        Expected result:
+            - The report of every Turnitin submission with a requested report is polled.
+            - A complete report is stored and marks the submission as REPORT_READY.
+            - The next check of a pending report is scheduled.
+        """
+        ready = self.create_submission("ready", TurnitinSubmission.Status.REPORT_REQUESTED)
+        pending = self.create_submission("pending", TurnitinSubmission.Status.REPORT_REQUESTED)
+        self.create_submission("complete", TurnitinSubmission.Status.COMPLETE)
+        mock_fetch_similarity_report_info.side_effect = lambda turnitin_submission_id: (
+            {"status": "COMPLETE", "overall_match_percentage": 7}
+            if turnitin_submission_id == "ready"
+            else {"status": "PROCESSING"}
+        )
 
-    @patch(f"{TASKS_MODULE_PATH}.get_submission_status")
-    @patch(f"{TASKS_MODULE_PATH}.log.info")
-    def test_is_submission_complete_with_processing_submissions(
-        self, mock_log_info: Mock, mock_get_submission_status: Mock
+        self.assertEqual(poll_pending_submissions(), 2)
+
+        mock_fetch_submission_info.assert_not_called()
+        ready.refresh_from_db()
+        self.assertEqual(ready.status, TurnitinSubmission.Status.REPORT_READY)
+        self.assertEqual(ready.similarity_score, 7)
+        pending.refresh_from_db()
+        self.assertEqual(pending.status, TurnitinSubmission.Status.REPORT_REQUESTED)
+        self.assertEqual(pending.poll_attempts, 1)
+        self.assertGreater(pending.next_poll_at, timezone.now())
+
+    @override_settings(TURNITIN_WEBHOOK_SIGNING_SECRET="secret", TURNITIN_WEBHOOK_FALLBACK_POLLING_INTERVAL=600)
+    @patch(f"{TASKS_MODULE_PATH}.schedule_next_poll")
+    @patch(f"{TASKS_MODULE_PATH}.fetch_submission_info")
+    def test_poll_pending_submissions_with_webhooks(
+        self, mock_fetch_submission_info: Mock, mock_schedule_next_poll: Mock
     ):
         """
-        Test the `is_submission_complete` function with processing submissions.
+        Test the `poll_pending_submissions` function when the webhooks are configured.
 
         Expected result:
-            - The function returns False.
-            - `get_submission_status` is called once with the submission_id and user.
-            - `log.info` is called once with the correct message.
+            - Only the submissions without news for the fallback interval are polled for the first time.
+            - The fallback interval is the minimum delay before the next check.
         """
-        mock_get_submission_status.return_value = Mock(
-            status_code=status.HTTP_200_OK,
-            data=[{"status": "COMPLETE"}, {"status": "PROCESSING"}],
+        now = timezone.now()
+        self.create_submission("recent", TurnitinSubmission.Status.UPLOADED, status_updated_at=now)
+        self.create_submission(
+            "stale", TurnitinSubmission.Status.UPLOADED, status_updated_at=now - timedelta(seconds=601)
         )
+        mock_fetch_submission_info.return_value = None
 
-        result = is_submission_complete(self.submission_uuid, self.user)
+        self.assertEqual(poll_pending_submissions(), 1)
 
-        self.assertFalse(result)
-        mock_get_submission_status.assert_called_once_with(self.submission_uuid, self.user)
-        mock_log_info.assert_called_once_with(f"Submission [{self.submission_uuid}] is not complete. Checking again...")
+        mock_fetch_submission_info.assert_called_once_with("stale")
+        mock_schedule_next_poll.assert_called_once_with("stale", 600)
 
-    @patch(f"{TASKS_MODULE_PATH}.TurnitinClient")
-    def test_get_submission_status(self, mock_turnitin_client: Mock):
+    @override_settings(TURNITIN_POLLING_BATCH_SIZE=2)
+    @patch(f"{TASKS_MODULE_PATH}.request_similarity_report")
+    def test_request_pending_similarity_reports(self, mock_request_similarity_report: Mock):
         """
-        Test the `get_submission_status` function.
+        Test the `request_pending_similarity_reports` function.
 
         Expected result:
-            - `TurnitinClient` is called once with the user.
-            - `get_submission_status` is called once with the submission_id.
+            - The report is requested once for each complete Turnitin submission due for a request.
+            - At most `TURNITIN_POLLING_BATCH_SIZE` reports are requested per run.
         """
-        mock_turnitin_client_instance = mock_turnitin_client.return_value
-        mock_turnitin_client_instance.get_submission_status.return_value = Mock(status_code=status.HTTP_200_OK)
+        now = timezone.now()
+        self.create_submission("complete-1", TurnitinSubmission.Status.COMPLETE)
+        self.create_submission("complete-1", TurnitinSubmission.Status.COMPLETE)
+        self.create_submission("complete-2", TurnitinSubmission.Status.COMPLETE, next_poll_at=now)
+        self.create_submission("complete-3", TurnitinSubmission.Status.COMPLETE)
+        self.create_submission("not-due", TurnitinSubmission.Status.COMPLETE, next_poll_at=now + timedelta(seconds=60))
+        self.create_submission("error", TurnitinSubmission.Status.ERROR)
+        self.create_submission("reported", TurnitinSubmission.Status.REPORT_REQUESTED)
+        mock_request_similarity_report.return_value = True
 
-        result = get_submission_status(self.submission_uuid, self.user)
+        self.assertEqual(request_pending_similarity_reports(), 2)
 
-        self.assertEqual(result.status_code, status.HTTP_200_OK)
-        mock_turnitin_client.assert_called_once_with(self.user)
-        mock_turnitin_client_instance.get_submission_status.assert_called_once_with(self.submission_uuid)
+        self.assertEqual(mock_request_similarity_report.call_args_list, [call("complete-1"), call("complete-2")])
 
-    @patch(f"{TASKS_MODULE_PATH}.TurnitinClient")
-    def test_get_submission_status_with_error(self, mock_turnitin_client: Mock):
+
+@override_settings(
+    TURNITIN_OUTBOX_DRAIN_BATCH_SIZE=2, TURNITIN_OUTBOX_DRAIN_INTERVAL=60, TURNITIN_OUTBOX_RETRY_DELAY=300
+)
+@patch(f"{TASKS_MODULE_PATH}.group")
+class TestDrainOutbox(DjangoTestCase):
+    """Tests for the drain of the Turnitin outbox."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create(username="john_doe")
+
+    def create_entry(self, ora_submission_id: str, **kwargs) -> TurnitinOutboxEntry:
+        """Create a due outbox entry with one text part."""
+        return TurnitinOutboxEntry.objects.create(
+            ora_submission_id=ora_submission_id,
+            anonymous_user_id="anonymous_user_id",
+            parts=[{"text": "answer"}],
+            next_attempt_at=timezone.now() - timedelta(seconds=1),
+            **kwargs,
+        )
+
+    def test_drain_outbox(self, mock_group: Mock):
         """
-        Test the `get_submission_status` function with an error.
+        Test the `drain_outbox` function with sent, pending and future entries.
 
         Expected result:
-            - The function returns a response with the correct status code.
-            - `TurnitinClient` is called once with the user.
-            - `get_submission_status` is called once with the submission_id.
+            - The entries whose parts are uploaded are deleted.
+            - The pending parts of the due entries are sent again, spread over the interval.
+            - The next check of the sent entries is postponed with a growing delay.
         """
-        mock_turnitin_client_instance = mock_turnitin_client.return_value
-        mock_turnitin_client_instance.get_submission_status.return_value = Mock(status_code=status.HTTP_400_BAD_REQUEST)
+        uploaded = self.create_entry("uploaded")
+        TurnitinSubmission.objects.create(
+            user=self.user,
+            idempotency_key="uploaded:part:1",
+            status=TurnitinSubmission.Status.UPLOADED,
+        )
+        pending = self.create_entry("pending", attempts=1)
+        future = self.create_entry("future")
+        TurnitinOutboxEntry.objects.filter(pk=future.pk).update(next_attempt_at=timezone.now() + timedelta(hours=1))
 
-        result = get_submission_status(self.submission_uuid, self.user)
+        self.assertEqual(drain_outbox(), 1)
 
-        self.assertEqual(result.status_code, status.HTTP_400_BAD_REQUEST)
-        mock_turnitin_client.assert_called_once_with(self.user)
-        mock_turnitin_client_instance.get_submission_status.assert_called_once_with(self.submission_uuid)
+        self.assertFalse(TurnitinOutboxEntry.objects.filter(pk=uploaded.pk).exists())
+        mock_group.return_value.apply_async.assert_called_once_with(countdown=0)
+        pending.refresh_from_db()
+        self.assertEqual(pending.attempts, 2)
+        self.assertGreater(pending.next_attempt_at, timezone.now() + timedelta(seconds=1190))
 
-    @patch(f"{TASKS_MODULE_PATH}.TurnitinClient")
-    def test_generate_similarity_report(self, mock_turnitin_client: Mock):
+    @override_settings(TURNITIN_OUTBOX_DRAIN_BATCH_SIZE=1, TURNITIN_OUTBOX_DRAIN_INTERVAL=60)
+    def test_drain_outbox_batch_size(self, mock_group: Mock):
         """
-        Test the `generate_similarity_report` function.
+        Test the `drain_outbox` function with more due entries than the batch size.
 
         Expected result:
-            - `TurnitinClient` is called once with the user.
-            - `generate_similarity_report` is called once with the submission_id.
+            - The uploaded entries are deleted without counting against the batch.
+            - Only the oldest pending entry is sent again.
         """
-        mock_turnitin_client_instance = mock_turnitin_client.return_value
+        for ora_submission_id in ("uploaded-1", "uploaded-2"):
+            self.create_entry(ora_submission_id)
+            TurnitinSubmission.objects.create(
+                user=self.user,
+                idempotency_key=f"{ora_submission_id}:part:1",
+                status=TurnitinSubmission.Status.UPLOADED,
+            )
+        pending = self.create_entry("pending")
+        later = self.create_entry("later")
+
+        self.assertEqual(drain_outbox(), 1)
+
+        self.assertEqual(set(TurnitinOutboxEntry.objects.values_list("pk", flat=True)), {pending.pk, later.pk})
+        mock_group.return_value.apply_async.assert_called_once_with(countdown=0)
+        pending.refresh_from_db()
+        later.refresh_from_db()
+        self.assertEqual((pending.attempts, later.attempts), (1, 0))
+
+    @patch(f"{TASKS_MODULE_PATH}.is_circuit_open")
+    def test_drain_outbox_circuit_open(self, mock_is_circuit_open: Mock, mock_group: Mock):
+        """
+        Test the `drain_outbox` function while the Turnitin upload API is unavailable.
+
+        Expected result:
+            - Nothing is sent and the entries are kept.
+        """
+        mock_is_circuit_open.return_value = True
+        self.create_entry("pending")
+
+        self.assertEqual(drain_outbox(), 0)
+
+        mock_group.assert_not_called()
+        self.assertTrue(TurnitinOutboxEntry.objects.exists())
+
+    @override_settings(TURNITIN_OUTBOX_DRAIN_BATCH_SIZE=0)
+    def test_drain_outbox_paused(self, mock_group: Mock):
+        """
+        Test the `drain_outbox` function with a batch size of 0.
+
+        Expected result:
+            - Nothing is sent and the entries are kept.
+        """
+        self.create_entry("pending")
 
-        generate_similarity_report(self.submission_uuid, self.user)
+        self.assertEqual(drain_outbox(), 0)
 
-        mock_turnitin_client.assert_called_once_with(self.user)
-        mock_turnitin_client_instance.generate_similarity_report.assert_called_once_with(self.submission_uuid)
+        mock_group.assert_not_called()
+        self.assertTrue(TurnitinOutboxEntry.objects.exists())
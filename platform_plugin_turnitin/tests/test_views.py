@@ -1,19 +1,31 @@
 """ Tests for the API views."""
 
+import hashlib
+import hmac
+import json
+from datetime import timedelta
 from unittest.mock import Mock, patch
 
+from django.contrib.auth import get_user_model
 from django.http import HttpResponse
+from django.test.utils import override_settings
 from django.urls import reverse
+from django.utils import timezone
+from kombu.exceptions import OperationalError
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
 
 from platform_plugin_turnitin.api.v1.views import (
+    TurnitinCourseSubmissionsAPIView,
     TurnitinSimilarityReportAPIView,
     TurnitinSubmissionAPIView,
     TurnitinUploadFileAPIView,
     TurnitinViewerAPIView,
+    TurnitinWebhookAPIView,
 )
+from platform_plugin_turnitin.models import TurnitinSubmission
+from platform_plugin_turnitin.turnitin_client.exceptions import TurnitinCircuitOpen, TurnitinRateLimited
 
 VIEWS_MODULE_PATH = "platform_plugin_turnitin.api.v1.views"
 UTILS_MODULE_PATH = "platform_plugin_turnitin.api.utils"
@@ -109,6 +121,11 @@ class TurnitinUploadFileAPIViewTest(TurnitinAPITestMixin):
     def setUp(self):
         super().setUp()
         self.view = TurnitinUploadFileAPIView.as_view()
+        is_eula_accepted_patcher = patch(
+            f"{VIEWS_MODULE_PATH}.TurnitinClient.is_eula_accepted", return_value=False
+        )
+        self.is_eula_accepted_mock = is_eula_accepted_patcher.start()
+        self.addCleanup(is_eula_accepted_patcher.stop)
 
     def post_response(self) -> HttpResponse:
         """Return the post response from the view."""
@@ -174,6 +191,31 @@ class TurnitinUploadFileAPIViewTest(TurnitinAPITestMixin):
         self.assertEqual(result.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(result.data["error"], "EULA not accepted")
 
+    @upload_turnitin_submission_patch
+    @accept_eula_patch
+    @get_course_overview_patch
+    def test_upload_file_eula_already_accepted(
+        self,
+        get_course_overview_mock: Mock,
+        accept_eula_mock: Mock,
+        upload_turnitin_submission_mock: Mock,
+    ):
+        """
+        Test the upload file view when the user already accepted the EULA.
+
+        Expected result: The EULA is not accepted again and the file is uploaded.
+        """
+        get_course_overview_mock.return_value = self.course
+        self.is_eula_accepted_mock.return_value = True
+        upload_turnitin_submission_mock.return_value = Response(
+            status=status.HTTP_200_OK
+        )
+
+        result = self.post_response()
+
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        accept_eula_mock.assert_not_called()
+
     def test_upload_file_course_key_not_valid(self):
         """
         Test the upload file view when the course key is not valid.
@@ -239,6 +281,32 @@ class TurnitinSubmissionAPIViewTest(TurnitinAPITestMixin):
 
         self.assertEqual(result.status_code, status.HTTP_200_OK)
 
+    @get_submission_patch
+    @course_instructor_role_patch
+    @course_staff_role_patch
+    @get_course_overview_patch
+    def test_get_submission_circuit_open(
+        self,
+        get_course_overview_mock: Mock,
+        course_staff_role_mock: Mock,
+        course_instructor_role_mock: Mock,
+        get_submission_mock: Mock,
+    ):
+        """
+        Test the get submission view when the circuit of the Turnitin API is open.
+
+        Expected result: The response status code is 503 with a Retry-After header.
+        """
+        get_course_overview_mock.return_value = self.course
+        course_staff_role_mock.return_value.has_user.return_value = True
+        course_instructor_role_mock.return_value.has_user.return_value = True
+        get_submission_mock.side_effect = TurnitinCircuitOpen("status", 20)
+
+        result = self.get_response()
+
+        self.assertEqual(result.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(result["Retry-After"], "20")
+
     def test_get_submission_course_key_not_valid(self):
         """
         Test the get submission view when the course key is not valid.
@@ -494,6 +562,32 @@ class TurnitinViewerAPIViewTest(TurnitinAPITestMixin):
 
         self.assertEqual(result.status_code, status.HTTP_200_OK)
 
+    @create_similarity_viewer_patch
+    @course_instructor_role_patch
+    @course_staff_role_patch
+    @get_course_overview_patch
+    def test_get_viewer_url_rate_limited(
+        self,
+        get_course_overview_mock: Mock,
+        course_staff_role_mock: Mock,
+        course_instructor_role_mock: Mock,
+        create_similarity_viewer_mock: Mock,
+    ):
+        """
+        Test the get viewer URL view when the Turnitin rate limit is reached.
+
+        Expected result: The response status code is 429 with a Retry-After header.
+        """
+        get_course_overview_mock.return_value = self.course
+        course_staff_role_mock.return_value.has_user.return_value = True
+        course_instructor_role_mock.return_value.has_user.return_value = True
+        create_similarity_viewer_mock.side_effect = TurnitinRateLimited("viewer", 12.3)
+
+        result = self.get_response()
+
+        self.assertEqual(result.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(result["Retry-After"], "13")
+
     def test_get_viewer_url_course_key_not_valid(self):
         """
         Test the get viewer URL view when the course key is not valid.
@@ -541,3 +635,230 @@ class TurnitinViewerAPIViewTest(TurnitinAPITestMixin):
         result = self.get_response()
 
         self.user_does_not_have_access(result)
+
+
+@course_instructor_role_patch
+@course_staff_role_patch
+@get_course_overview_patch
+class TurnitinCourseSubmissionsAPIViewTest(TurnitinAPITestMixin):
+    """Tests for the TurnitinCourseSubmissionsAPIView."""
+
+    def setUp(self):
+        super().setUp()
+        self.view = TurnitinCourseSubmissionsAPIView.as_view()
+        self.block_id = "block-v1:edX+DemoX+Demo_Course+type@openassessment+block@ora1"
+        self.other_block_id = "block-v1:edX+DemoX+Demo_Course+type@openassessment+block@ora2"
+        learners = [get_user_model().objects.create(username=f"learner{idx}") for idx in range(3)]
+        for idx, learner in enumerate(learners):
+            TurnitinSubmission.objects.create(
+                user=learner,
+                ora_submission_id=f"ora-submission-{idx}",
+                ora_block_id=self.block_id,
+                course_id=self.course_id,
+                file_name="answer.txt",
+                status=TurnitinSubmission.Status.REPORT_READY,
+                similarity_score=10 * idx,
+            )
+        TurnitinSubmission.objects.create(
+            user=learners[0],
+            ora_submission_id="ora-submission-0",
+            ora_block_id=self.block_id,
+            course_id=self.course_id,
+            file_name="essay.pdf",
+            status=TurnitinSubmission.Status.PROCESSING,
+        )
+        TurnitinSubmission.objects.create(
+            user=learners[0],
+            ora_submission_id="ora-submission-3",
+            ora_block_id=self.other_block_id,
+            course_id=self.course_id,
+            file_name="answer.txt",
+        )
+        TurnitinSubmission.objects.create(
+            user=learners[0],
+            ora_submission_id="ora-submission-4",
+            ora_block_id="block-v1:edX+Other+Course+type@openassessment+block@ora1",
+            course_id="course-v1:edX+Other+Course",
+            file_name="answer.txt",
+        )
+        for idx, submission in enumerate(TurnitinSubmission.objects.order_by("id")):
+            TurnitinSubmission.objects.filter(id=submission.id).update(
+                created_at=timezone.now() - timedelta(minutes=10 - idx)
+            )
+
+    def get_response(self, **params) -> HttpResponse:
+        """Return the get response from the view."""
+        request = self.factory.get(reverse("turnitin-api:v1:course-submissions"), params)
+        force_authenticate(request, user=self.user)
+        return self.view(request, course_id=self.course_id)
+
+    def test_get_course_submissions(
+        self,
+        get_course_overview_mock: Mock,
+        course_staff_role_mock: Mock,
+        course_instructor_role_mock: Mock,
+    ):
+        """
+        Test the course submissions view.
+
+        Expected result:
+            - Only the ORA submissions of the course are returned, newest first.
+            - The files of each ORA submission are grouped with their status and score.
+            - The database is queried a constant number of times.
+        """
+        get_course_overview_mock.return_value = self.course
+
+        with self.assertNumQueries(3):
+            result = self.get_response(page_size=2)
+
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        self.assertEqual(result.data["count"], 4)
+        self.assertIsNotNone(result.data["next"])
+        self.assertEqual(
+            [ora_submission["ora_submission_id"] for ora_submission in result.data["results"]],
+            ["ora-submission-3", "ora-submission-0"],
+        )
+        self.assertEqual(result.data["results"][1]["username"], "learner0")
+        self.assertEqual(
+            result.data["results"][1]["files"],
+            [
+                {"file_name": "answer.txt", "status": "REPORT_READY", "similarity_score": 0},
+                {"file_name": "essay.pdf", "status": "PROCESSING", "similarity_score": None},
+            ],
+        )
+        course_staff_role_mock.assert_called_once()
+
+        with self.assertNumQueries(3):
+            result = self.get_response(page_size=2, page=2)
+
+        self.assertEqual(
+            [ora_submission["ora_submission_id"] for ora_submission in result.data["results"]],
+            ["ora-submission-2", "ora-submission-1"],
+        )
+
+    def test_get_course_submissions_by_block(
+        self,
+        get_course_overview_mock: Mock,
+        course_staff_role_mock: Mock,
+        course_instructor_role_mock: Mock,
+    ):
+        """
+        Test the course submissions view filtered by ORA block.
+
+        Expected result: Only the ORA submissions of the block are returned.
+        """
+        get_course_overview_mock.return_value = self.course
+
+        result = self.get_response(ora_block_id=self.other_block_id)
+
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        self.assertEqual(result.data["count"], 1)
+        self.assertEqual(result.data["results"][0]["ora_block_id"], self.other_block_id)
+
+    def test_get_course_submissions_block_not_valid(
+        self,
+        get_course_overview_mock: Mock,
+        course_staff_role_mock: Mock,
+        course_instructor_role_mock: Mock,
+    ):
+        """
+        Test the course submissions view with an ORA block not valid or of another course.
+
+        Expected result: The response status code is 400.
+        """
+        get_course_overview_mock.return_value = self.course
+
+        for ora_block_id in ["not-valid", "block-v1:edX+Other+Course+type@openassessment+block@ora1"]:
+            result = self.get_response(ora_block_id=ora_block_id)
+
+            self.assertEqual(result.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("ora_block_id", result.data["field_errors"])
+
+    def test_get_course_submissions_user_does_not_have_access(
+        self,
+        get_course_overview_mock: Mock,
+        course_staff_role_mock: Mock,
+        course_instructor_role_mock: Mock,
+    ):
+        """
+        Test the course submissions view when the user does not have access.
+
+        Expected result: The response status code is 403.
+        """
+        get_course_overview_mock.return_value = self.course
+        self.user.is_staff = False
+        course_staff_role_mock.return_value.has_user.return_value = False
+        course_instructor_role_mock.return_value.has_user.return_value = False
+
+        result = self.get_response()
+
+        self.user_does_not_have_access(result)
+
+
+@override_settings(TURNITIN_WEBHOOK_SIGNING_SECRET="test-signing-secret")
+class TurnitinWebhookAPIViewTest(APITestCase):
+    """Tests for the TurnitinWebhookAPIView."""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.view = TurnitinWebhookAPIView.as_view()
+        self.payload = {"id": "turnitin-submission-id", "status": "COMPLETE"}
+
+    def post_response(self, signature: str) -> HttpResponse:
+        """Return the post response from the view."""
+        request = self.factory.post(
+            reverse("turnitin-api:v1:webhook"),
+            data=json.dumps(self.payload),
+            content_type="application/json",
+            HTTP_X_TURNITIN_SIGNATURE=signature,
+            HTTP_X_TURNITIN_EVENTTYPE="SUBMISSION_COMPLETE",
+        )
+        return self.view(request, course_id="course-v1:edX+DemoX+Demo_Course")
+
+    @patch("platform_plugin_turnitin.tasks.process_webhook_event_task.delay")
+    def test_webhook(self, process_webhook_event_task_mock: Mock):
+        """
+        Test the webhook view with a valid signature.
+
+        Expected result: The response status code is 202 and the event is enqueued.
+        """
+        signature = hmac.new(
+            b"test-signing-secret", json.dumps(self.payload).encode("utf-8"), hashlib.sha256
+        ).hexdigest()
+
+        result = self.post_response(signature)
+
+        self.assertEqual(result.status_code, status.HTTP_202_ACCEPTED)
+        process_webhook_event_task_mock.assert_called_once_with("SUBMISSION_COMPLETE", self.payload)
+
+    @patch("platform_plugin_turnitin.api.v1.views.process_webhook_event")
+    @patch("platform_plugin_turnitin.tasks.process_webhook_event_task.delay")
+    def test_webhook_queue_unavailable(
+        self, process_webhook_event_task_mock: Mock, process_webhook_event_mock: Mock
+    ):
+        """
+        Test the webhook view when the task queue is unavailable.
+
+        Expected result: The response status code is 200 and the event is processed in the request.
+        """
+        process_webhook_event_task_mock.side_effect = OperationalError
+        signature = hmac.new(
+            b"test-signing-secret", json.dumps(self.payload).encode("utf-8"), hashlib.sha256
+        ).hexdigest()
+
+        result = self.post_response(signature)
+
+        self.assertEqual(result.status_code, status.HTTP_200_OK)
+        process_webhook_event_mock.assert_called_once_with("SUBMISSION_COMPLETE", self.payload)
+
+    @patch("platform_plugin_turnitin.tasks.process_webhook_event_task.delay")
+    def test_webhook_invalid_signature(self, process_webhook_event_task_mock: Mock):
+        """
+        Test the webhook view with an invalid signature.
+
+        Expected result: The response status code is 403 and the event is not enqueued.
+        """
+        result = self.post_response("invalid-signature")
+
+        self.assertEqual(result.status_code, status.HTTP_403_FORBIDDEN)
+        process_webhook_event_task_mock.assert_not_called()
@@ -0,0 +1,172 @@
+"""Tests for the webhooks module."""
+
+import hashlib
+import hmac
+from unittest.mock import Mock, patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from platform_plugin_turnitin.models import TurnitinSubmission
+from platform_plugin_turnitin.webhooks import (
+    process_webhook_event,
+    register_webhook,
+    verify_webhook_signature,
+    webhooks_enabled,
+)
+
+WEBHOOKS_MODULE_PATH = "platform_plugin_turnitin.webhooks"
+PIPELINE_MODULE_PATH = "platform_plugin_turnitin.pipeline"
+SIGNING_SECRET = "test-signing-secret"
+
+User = get_user_model()
+
+
+@override_settings(TURNITIN_WEBHOOK_SIGNING_SECRET=SIGNING_SECRET)
+class TestWebhooks(TestCase):
+    """Tests for the webhooks module."""
+
+    def setUp(self) -> None:
+        self.url = "https://lms.example.com/platform-plugin-turnitin/course-v1:edX+DemoX+Demo_Course/api/v1/webhook/"
+        self.body = b'{"id": "turnitin-submission-id", "status": "COMPLETE"}'
+        self.user = User.objects.create(username="john_doe")
+
+    def sign(self, body: bytes) -> str:
+        """Return the signature Turnitin would send for the body."""
+        return hmac.new(SIGNING_SECRET.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+    def test_verify_webhook_signature(self):
+        """
+        Test `verify_webhook_signature` with a valid signature.
+
+        Expected result:
+            - The signature is valid.
+        """
+        self.assertTrue(verify_webhook_signature(self.body, self.sign(self.body)))
+
+    def test_verify_webhook_signature_invalid(self):
+        """
+        Test `verify_webhook_signature` with a tampered body or a missing signature.
+
+        Expected result:
+            - The signature is not valid.
+        """
+        self.assertFalse(verify_webhook_signature(b"tampered", self.sign(self.body)))
+        self.assertFalse(verify_webhook_signature(self.body, None))
+
+    @override_settings(TURNITIN_WEBHOOK_SIGNING_SECRET=None)
+    def test_verify_webhook_signature_disabled(self):
+        """
+        Test `verify_webhook_signature` when the webhooks are not configured.
+
+        Expected result:
+            - The webhooks are disabled and no signature is valid.
+        """
+        self.assertFalse(webhooks_enabled())
+        self.assertFalse(verify_webhook_signature(self.body, "any-signature"))
+
+    @patch(f"{WEBHOOKS_MODULE_PATH}.post_create_webhook")
+    @patch(f"{WEBHOOKS_MODULE_PATH}.get_webhooks")
+    def test_register_webhook(self, mock_get_webhooks: Mock, mock_post_create_webhook: Mock):
+        """
+        Test `register_webhook` when the webhook is not registered yet.
+
+        Expected result:
+            - `post_create_webhook` is called with the URL and the event types.
+        """
+        mock_get_webhooks.return_value = Mock(ok=True, json=Mock(return_value=[]))
+
+        response = register_webhook(self.url)
+
+        payload = mock_post_create_webhook.call_args.args[0]
+        self.assertEqual(response, mock_post_create_webhook.return_value)
+        self.assertEqual(payload["url"], self.url)
+        self.assertEqual(payload["event_types"], ["SUBMISSION_COMPLETE", "SIMILARITY_COMPLETE"])
+
+    @patch(f"{WEBHOOKS_MODULE_PATH}.post_create_webhook")
+    @patch(f"{WEBHOOKS_MODULE_PATH}.get_webhooks")
+    def test_register_webhook_already_registered(self, mock_get_webhooks: Mock, mock_post_create_webhook: Mock):
+        """
+        Test `register_webhook` when the webhook is already registered.
+
+        Expected result:
+            - `post_create_webhook` is not called.
+        """
+        mock_get_webhooks.return_value = Mock(ok=True, json=Mock(return_value=[{"url": self.url}]))
+
+        self.assertIsNone(register_webhook(self.url))
+        mock_post_create_webhook.assert_not_called()
+
+    @patch(f"{PIPELINE_MODULE_PATH}.put_generate_similarity_report")
+    def test_process_submission_complete(self, mock_put_generate_similarity_report: Mock):
+        """
+        Test SUBMISSION_COMPLETE events of a known submission, including a redelivery.
+
+        Expected result:
+            - The similarity report is generated only once.
+            - The submission is marked as REPORT_REQUESTED.
+        """
+        submission = TurnitinSubmission.objects.create(
+            user=self.user,
+            turnitin_submission_id="turnitin-submission-id",
+            status=TurnitinSubmission.Status.UPLOADED,
+        )
+
+        process_webhook_event("SUBMISSION_COMPLETE", {"id": "turnitin-submission-id", "status": "COMPLETE"})
+        process_webhook_event("SUBMISSION_COMPLETE", {"id": "turnitin-submission-id", "status": "COMPLETE"})
+
+        mock_put_generate_similarity_report.assert_called_once_with(
+            "turnitin-submission-id", {"test_key": "test_value"}
+        )
+        submission.refresh_from_db()
+        self.assertEqual(submission.status, TurnitinSubmission.Status.REPORT_REQUESTED)
+
+    @patch(f"{PIPELINE_MODULE_PATH}.put_generate_similarity_report")
+    def test_process_submission_complete_ignored(self, mock_put_generate_similarity_report: Mock):
+        """
+        Test SUBMISSION_COMPLETE events that must not generate a report.
+
+        Expected result:
+            - The similarity report is not generated for unknown or failed submissions.
+            - The failed submission is marked as ERROR with the Turnitin error code.
+        """
+        submission = TurnitinSubmission.objects.create(
+            user=self.user,
+            turnitin_submission_id="turnitin-submission-id",
+            status=TurnitinSubmission.Status.PROCESSING,
+        )
+
+        process_webhook_event("SUBMISSION_COMPLETE", {"id": "unknown-id", "status": "COMPLETE"})
+        process_webhook_event(
+            "SUBMISSION_COMPLETE",
+            {"id": "turnitin-submission-id", "status": "ERROR", "error_code": "TOO_LITTLE_TEXT"},
+        )
+        process_webhook_event("UNKNOWN_EVENT", {})
+
+        mock_put_generate_similarity_report.assert_not_called()
+        submission.refresh_from_db()
+        self.assertEqual(submission.status, TurnitinSubmission.Status.ERROR)
+        self.assertEqual(submission.error_message, "TOO_LITTLE_TEXT")
+
+    def test_process_similarity_complete(self):
+        """
+        Test a SIMILARITY_COMPLETE event of a submission with a requested report.
+
+        Expected result:
+            - The submission is marked as REPORT_READY.
+            - The report information and score are stored.
+        """
+        submission = TurnitinSubmission.objects.create(
+            user=self.user,
+            turnitin_submission_id="turnitin-submission-id",
+            status=TurnitinSubmission.Status.REPORT_REQUESTED,
+        )
+        payload = {"submission_id": "turnitin-submission-id", "status": "COMPLETE", "overall_match_percentage": 42}
+
+        process_webhook_event("SIMILARITY_COMPLETE", payload)
+
+        submission.refresh_from_db()
+        self.assertEqual(submission.status, TurnitinSubmission.Status.REPORT_READY)
+        self.assertEqual(submission.similarity_report_info, payload)
+        self.assertEqual(submission.similarity_score, 42)
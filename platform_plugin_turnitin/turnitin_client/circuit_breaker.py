@@ -0,0 +1,154 @@
+"""
+Circuit breaker for the calls to the Turnitin API.
+
+There is one circuit per endpoint family (the rate limit buckets), shared by all
+the LMS and Celery workers through the Django cache:
+
+- CLOSED: the calls go through. Failed and slow calls are counted in windows of
+  `TURNITIN_CIRCUIT_BREAKER_WINDOW` seconds, and the circuit opens once at least
+  `TURNITIN_CIRCUIT_BREAKER_MIN_CALLS` calls were made and the failure rate reaches
+  `TURNITIN_CIRCUIT_BREAKER_FAILURE_RATE`.
+- OPEN: the calls fail fast with `TurnitinCircuitOpen` for
+  `TURNITIN_CIRCUIT_BREAKER_OPEN_TIMEOUT` seconds.
+- HALF-OPEN: only `TURNITIN_CIRCUIT_BREAKER_HALF_OPEN_PROBES` calls go through. The
+  circuit closes when all of them succeed and opens again on the first failure.
+"""
+
+import time
+from logging import getLogger
+
+from django.conf import settings
+from django.core.cache import cache
+
+from platform_plugin_turnitin.constants import CIRCUIT_BREAKER_CACHE_KEY, CIRCUIT_BREAKER_FAILURE_STATUS_CODES
+from platform_plugin_turnitin.turnitin_client.exceptions import TurnitinCircuitOpen
+
+log = getLogger(__name__)
+
+
+def _key(family: str, name: str) -> str:
+    return CIRCUIT_BREAKER_CACHE_KEY.format(family=family, name=name)
+
+
+def _window_keys(family: str) -> list:
+    window_size = getattr(settings, "TURNITIN_CIRCUIT_BREAKER_WINDOW", 60)
+    window = int(time.time() // window_size)
+    return [_key(family, f"calls:{window}"), _key(family, f"failures:{window}")]
+
+
+def _incr(key: str, timeout: int) -> int:
+    cache.add(key, 0, timeout)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # The counter expired between the add and the increment.
+        cache.add(key, 1, timeout)
+        return 1
+
+
+def before_call(family: str) -> None:
+    """
+    Check that the circuit of an endpoint family lets a call through.
+
+    Parameters:
+    - family (str): The endpoint family of the call.
+
+    Raises:
+    - TurnitinCircuitOpen: If the circuit is open, or half-open with all its probes taken.
+    """
+    open_timeout = getattr(settings, "TURNITIN_CIRCUIT_BREAKER_OPEN_TIMEOUT", 30)
+
+    open_until = cache.get(_key(family, "open"))
+    if open_until is not None:
+        raise TurnitinCircuitOpen(family, max(0.0, open_until - time.time()))
+
+    if cache.get(_key(family, "tripped")):
+        probes = getattr(settings, "TURNITIN_CIRCUIT_BREAKER_HALF_OPEN_PROBES", 3)
+        if _incr(_key(family, "probes"), open_timeout) > probes:
+            raise TurnitinCircuitOpen(family, open_timeout)
+
+
+def is_circuit_open(family: str) -> bool:
+    """
+    Check if the circuit of an endpoint family is open.
+
+    Parameters:
+    - family (str): The endpoint family.
+
+    Returns:
+    - bool: True if the calls of the family currently fail fast.
+    """
+    return cache.get(_key(family, "open")) is not None
+
+
+def record_call(family: str, failed: bool) -> None:
+    """
+    Record the result of a call and open or close the circuit accordingly.
+
+    Parameters:
+    - family (str): The endpoint family of the call.
+    - failed (bool): Whether the call failed or was too slow.
+    """
+    if cache.get(_key(family, "tripped")) and cache.get(_key(family, "open")) is None:
+        if failed:
+            open_circuit(family)
+            return
+        probes = getattr(settings, "TURNITIN_CIRCUIT_BREAKER_HALF_OPEN_PROBES", 3)
+        open_timeout = getattr(settings, "TURNITIN_CIRCUIT_BREAKER_OPEN_TIMEOUT", 30)
+        if _incr(_key(family, "successes"), open_timeout) >= probes:
+            close_circuit(family)
+        return
+
+    window_size = getattr(settings, "TURNITIN_CIRCUIT_BREAKER_WINDOW", 60)
+    calls_key, failures_key = _window_keys(family)
+    calls = _incr(calls_key, window_size * 2)
+    if not failed:
+        return
+
+    failures = _incr(failures_key, window_size * 2)
+    min_calls = getattr(settings, "TURNITIN_CIRCUIT_BREAKER_MIN_CALLS", 10)
+    failure_rate = getattr(settings, "TURNITIN_CIRCUIT_BREAKER_FAILURE_RATE", 0.5)
+    if calls >= min_calls and failures / calls >= failure_rate:
+        open_circuit(family)
+
+
+def is_failed_call(status_code: int, duration: float) -> bool:
+    """
+    Check if a call counts as a failure for the circuit breaker.
+
+    Parameters:
+    - status_code (int): The status code of the response.
+    - duration (float): The seconds the call took.
+
+    Returns:
+    - bool: True if Turnitin failed or took longer than `TURNITIN_CIRCUIT_BREAKER_SLOW_CALL` seconds.
+    """
+    return status_code in CIRCUIT_BREAKER_FAILURE_STATUS_CODES or duration > getattr(
+        settings, "TURNITIN_CIRCUIT_BREAKER_SLOW_CALL", 10
+    )
+
+
+def open_circuit(family: str) -> None:
+    """
+    Open the circuit of an endpoint family.
+
+    Parameters:
+    - family (str): The endpoint family.
+    """
+    open_timeout = getattr(settings, "TURNITIN_CIRCUIT_BREAKER_OPEN_TIMEOUT", 30)
+    cache.set(_key(family, "open"), time.time() + open_timeout, open_timeout)
+    cache.set(_key(family, "tripped"), True, None)
+    cache.delete_many([_key(family, "probes"), _key(family, "successes")])
+    log.warning(f"Opened the circuit of the Turnitin {family} API for {open_timeout} seconds.")
+
+
+def close_circuit(family: str) -> None:
+    """
+    Close the circuit of an endpoint family.
+
+    Parameters:
+    - family (str): The endpoint family.
+    """
+    keys = [_key(family, name) for name in ("open", "tripped", "probes", "successes")]
+    cache.delete_many(keys + _window_keys(family))
+    log.info(f"Closed the circuit of the Turnitin {family} API.")
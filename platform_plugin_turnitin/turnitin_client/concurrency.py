@@ -0,0 +1,163 @@
+"""
+Concurrent calls to the Turnitin API.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+from typing import Callable, Iterable, List, Optional, Tuple, TypeVar
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+CONCURRENCY_BACKENDS = ("thread", "asyncio", "serial")
+
+log = getLogger(__name__)
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Return the process-wide thread pool used to call the Turnitin API concurrently.
+
+    The pool has at most `TURNITIN_API_THREAD_POOL_SIZE` threads, shared by all the
+    requests of the process. It is re-created when the process ID changes, because
+    the threads of the parent are not inherited by forked children.
+
+    Returns:
+    - ThreadPoolExecutor: The thread pool of the current process.
+    """
+    global _executor, _executor_pid  # pylint: disable=global-statement
+
+    pid = os.getpid()
+    if _executor is None or _executor_pid != pid:
+        with _executor_lock:
+            if _executor is None or _executor_pid != pid:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "TURNITIN_API_THREAD_POOL_SIZE", 10),
+                    thread_name_prefix="turnitin-api",
+                )
+                _executor_pid = pid
+    return _executor
+
+
+def reset_executor() -> None:
+    """
+    Shut down the current thread pool, if any, so the next call creates a new one.
+    """
+    global _executor, _executor_pid  # pylint: disable=global-statement
+
+    with _executor_lock:
+        if _executor is not None and _executor_pid == os.getpid():
+            _executor.shutdown(wait=False)
+        _executor = None
+        _executor_pid = None
+
+
+def _forget_executor_after_fork() -> None:
+    """
+    Drop the thread pool inherited from the parent process.
+    """
+    global _executor, _executor_pid, _executor_lock  # pylint: disable=global-statement
+
+    _executor = None
+    _executor_pid = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_executor_after_fork)
+
+
+async def gather_calls(func: Callable[[T], R], items: Iterable[T], limit: int) -> List[R]:
+    """
+    Call a blocking function for every item concurrently.
+
+    Each call runs in a worker thread, so the handlers keep their retries, rate
+    limiting and circuit breaker. A semaphore bounds the calls in flight.
+
+    Parameters:
+    - func (callable): The function to call, e.g. a Turnitin API handler.
+    - items (iterable): The argument of each call.
+    - limit (int): The maximum number of calls in flight.
+
+    Returns:
+    - list: The results, in the order of the items.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+    call = sync_to_async(func, thread_sensitive=False)
+
+    async def run(item: T) -> R:
+        async with semaphore:
+            return await call(item)
+
+    return await asyncio.gather(*(run(item) for item in items))
+
+
+def fan_out(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    on_error: Optional[Callable[[T, Exception], R]] = None,
+) -> List[R]:
+    """
+    Call a blocking function for every item concurrently.
+
+    The calls run with the backend set in `TURNITIN_CONCURRENCY_BACKEND`:
+    - thread: the process-wide thread pool, for synchronous deployments.
+    - asyncio: an event loop with at most `TURNITIN_API_CONCURRENCY` calls in flight.
+    - serial: one call after another.
+
+    A single item is always called directly. If `on_error` is given, a failed call
+    does not fail the others: its result is replaced by `on_error(item, error)`.
+    If every call failed, the first error is raised instead.
+
+    Parameters:
+    - func (callable): The function to call, e.g. a Turnitin API handler.
+    - items (iterable): The argument of each call.
+    - on_error (callable): Builds the result of a failed call.
+
+    Returns:
+    - list: The results, in the order of the items.
+
+    Raises:
+    - ValueError: If the concurrency backend is not supported.
+    """
+    items = list(items)
+    backend = getattr(settings, "TURNITIN_CONCURRENCY_BACKEND", "thread")
+    if backend not in CONCURRENCY_BACKENDS:
+        raise ValueError(f"Unsupported concurrency backend: {backend}")
+
+    def call(item: T) -> Tuple[Optional[R], Optional[Exception]]:
+        try:
+            return func(item), None
+        except Exception as error:
+            if on_error is None:
+                raise
+            return None, error
+
+    if len(items) < 2 or backend == "serial":
+        outcomes = [call(item) for item in items]
+    elif backend == "asyncio":
+        outcomes = async_to_sync(gather_calls)(call, items, getattr(settings, "TURNITIN_API_CONCURRENCY", 5))
+    else:
+        outcomes = list(get_executor().map(call, items))
+
+    errors = [error for _, error in outcomes if error is not None]
+    if errors and len(errors) == len(outcomes):
+        raise errors[0]
+
+    results = []
+    for item, (result, error) in zip(items, outcomes):
+        if error is not None:
+            log.warning(f"Failed to call {getattr(func, '__name__', func)} for [{item}]: {error}")
+            result = on_error(item, error)
+        results.append(result)
+    return results
@@ -0,0 +1,39 @@
+"""
+Exceptions raised by the Turnitin client.
+"""
+
+
+class TurnitinClientError(Exception):
+    """
+    Base exception of the Turnitin client.
+    """
+
+
+class TurnitinRateLimited(TurnitinClientError):
+    """
+    Raised when a call is deferred because its rate limit bucket is empty.
+
+    Attributes:
+    - bucket (str): The rate limit bucket of the call.
+    - retry_after (float): The seconds until a token of the bucket is available.
+    """
+
+    def __init__(self, bucket: str, retry_after: float) -> None:
+        self.bucket = bucket
+        self.retry_after = retry_after
+        super().__init__(f"The Turnitin {bucket} rate limit was reached, retry in {retry_after:.0f} seconds.")
+
+
+class TurnitinCircuitOpen(TurnitinClientError):
+    """
+    Raised when a call fails fast because the circuit of its endpoint family is open.
+
+    Attributes:
+    - family (str): The endpoint family of the call.
+    - retry_after (float): The seconds until the circuit lets a probe through.
+    """
+
+    def __init__(self, family: str, retry_after: float) -> None:
+        self.family = family
+        self.retry_after = retry_after
+        super().__init__(f"The Turnitin {family} API is unavailable, retry in {retry_after:.0f} seconds.")
@@ -16,3 +16,4 @@ from .submissions import (
     put_recover_submission,
     put_upload_submission_file_content,
 )
+from .webhooks import delete_webhook, get_webhooks, post_create_webhook
@@ -2,37 +2,335 @@
 API handlers for turnitin integration
 """
 
-from typing import Dict, Optional
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from logging import getLogger
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
 
 import requests
 from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from platform_plugin_turnitin.turnitin_client.circuit_breaker import before_call, is_failed_call, record_call
+from platform_plugin_turnitin.turnitin_client.rate_limit import acquire, get_rate_limit_bucket
 
 TII_API_URL = getattr(settings, "TURNITIN_TII_API_URL", None)
 TCA_INTEGRATION_FAMILY = getattr(settings, "TURNITIN_TCA_INTEGRATION_FAMILY", None)
 TCA_INTEGRATION_VERSION = getattr(settings, "TURNITIN_TCA_INTEGRATION_VERSION", None)
 TCA_API_KEY = getattr(settings, "TURNITIN_TCA_API_KEY", None)
 
+RETRYABLE_STATUS_CODES = (429, 502, 503, 504)
+IDEMPOTENT_METHODS = ("get", "put", "delete")
+
+log = getLogger(__name__)
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def create_session() -> requests.Session:
+    """
+    Create a `requests.Session` with a connection pool sized from the plugin settings.
+
+    Settings:
+    - TURNITIN_API_POOL_CONNECTIONS (int): Number of per-host pools to keep.
+    - TURNITIN_API_POOL_MAXSIZE (int): Maximum number of connections kept alive per host.
+    - TURNITIN_API_POOL_BLOCK (bool): If True, never open more than `TURNITIN_API_POOL_MAXSIZE`
+      connections per host and wait for a free one instead.
+
+    Returns:
+    - Session: A new session with the pooled adapter mounted for HTTP and HTTPS.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=getattr(settings, "TURNITIN_API_POOL_CONNECTIONS", 10),
+        pool_maxsize=getattr(settings, "TURNITIN_API_POOL_MAXSIZE", 10),
+        pool_block=getattr(settings, "TURNITIN_API_POOL_BLOCK", False),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide session used for every call to the Turnitin API.
+
+    The session keeps connections alive between calls, so only the first request of
+    a process pays the TCP and TLS handshake. It is re-created when the process ID
+    changes, so Celery prefork children never share sockets with their parent.
+
+    Returns:
+    - Session: The pooled session for the current process.
+    """
+    global _session, _session_pid  # pylint: disable=global-statement
+
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = create_session()
+                _session_pid = pid
+    return _session
+
+
+def reset_session() -> None:
+    """
+    Close the current session, if any, so the next call creates a new one.
+    """
+    global _session, _session_pid  # pylint: disable=global-statement
+
+    with _session_lock:
+        if _session is not None and _session_pid == os.getpid():
+            _session.close()
+        _session = None
+        _session_pid = None
+
+
+def _forget_session_after_fork() -> None:
+    """
+    Drop the session inherited from the parent process without closing its sockets.
+    """
+    global _session, _session_pid, _session_lock  # pylint: disable=global-statement
+
+    _session = None
+    _session_pid = None
+    _session_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_session_after_fork)
+
+
+class RetryBudget:
+    """
+    Limit the retries of a process to a fraction of its requests.
+
+    Every request deposits `TURNITIN_API_RETRY_BUDGET_RATIO` tokens and every retry
+    withdraws one, with at most `TURNITIN_API_RETRY_BUDGET_RESERVE` tokens saved.
+    While Turnitin is healthy there is always room for the occasional retry, but
+    during an outage the retries stop adding load on top of the failing requests.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._balance = None
+
+    def _reserve(self) -> float:
+        return float(getattr(settings, "TURNITIN_API_RETRY_BUDGET_RESERVE", 10))
+
+    def deposit(self) -> None:
+        """
+        Record a new request.
+        """
+        with self._lock:
+            balance = self._reserve() if self._balance is None else self._balance
+            ratio = getattr(settings, "TURNITIN_API_RETRY_BUDGET_RATIO", 0.2)
+            self._balance = min(self._reserve(), balance + ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Take a token for a retry.
+
+        Returns:
+        - bool: True if the retry is allowed, False if the budget is exhausted.
+        """
+        with self._lock:
+            balance = self._reserve() if self._balance is None else self._balance
+            if balance < 1:
+                self._balance = balance
+                return False
+            self._balance = balance - 1
+            return True
+
+    def reset(self) -> None:
+        """
+        Refill the budget.
+        """
+        with self._lock:
+            self._balance = None
+
+
+retry_budget = RetryBudget()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse the value of a `Retry-After` header.
+
+    Parameters:
+    - value (str): The header value, either a number of seconds or an HTTP date.
+
+    Returns:
+    - float: The seconds to wait, or None if the value is missing or invalid.
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def get_retry_delay(attempt: int, response: Optional[requests.Response] = None) -> Optional[float]:
+    """
+    Return the seconds to wait before retrying a request.
+
+    The `Retry-After` header of the response is honoured. Otherwise, the delay is an
+    exponential backoff from `TURNITIN_API_RETRY_BACKOFF` seconds with full jitter.
+
+    Parameters:
+    - attempt (int): The number of retries already made.
+    - response (Response): The response of the failed attempt, if any.
+
+    Returns:
+    - float: The seconds to wait, or None if Turnitin asked to wait longer than
+      `TURNITIN_API_RETRY_MAX_DELAY` seconds.
+    """
+    max_delay = getattr(settings, "TURNITIN_API_RETRY_MAX_DELAY", 10)
+
+    retry_after = parse_retry_after(response.headers.get("Retry-After")) if response is not None else None
+    if retry_after is not None:
+        return retry_after if retry_after <= max_delay else None
+
+    backoff = getattr(settings, "TURNITIN_API_RETRY_BACKOFF", 0.5)
+    return random.uniform(0, min(max_delay, backoff * 2**attempt))
+
+
+def is_retryable(request_method: str, status_code: int) -> bool:
+    """
+    Check if a response can be retried.
+
+    Idempotent methods are retried on throttling and gateway errors. Other methods
+    are only retried on 429, because Turnitin rejected them before doing anything.
+
+    Parameters:
+    - request_method (str): The HTTP method of the request.
+    - status_code (int): The status code of the response.
+
+    Returns:
+    - bool: True if the request can be sent again, False otherwise.
+    """
+    if request_method.lower() in IDEMPOTENT_METHODS:
+        return status_code in RETRYABLE_STATUS_CODES
+    return status_code == 429
+
+
+def send_request(
+    request_method: str,
+    url: str,
+    before_retry: Optional[Callable[[], None]] = None,
+    idempotent: Optional[bool] = None,
+    bucket: Optional[str] = None,
+    max_retries: Optional[int] = None,
+    **kwargs,
+) -> requests.Response:
+    """
+    Send a request to Turnitin, retrying transient failures.
+
+    A request is retried at most `TURNITIN_API_MAX_RETRIES` times, when the response
+    is retryable or, for idempotent methods, when the connection failed. Every retry
+    needs a token from the retry budget.
+
+    Parameters:
+    - request_method (str): The HTTP method (e.g., 'GET', 'POST', 'PUT', 'PATCH', 'DELETE').
+    - url (str): The URL of the request.
+    - before_retry (callable): Called before each retry, e.g. to rewind the uploaded file.
+    - idempotent (bool): Overrides whether the request is idempotent, which is otherwise
+      inferred from the method.
+    - bucket (str): The endpoint family of the request. Every attempt goes through its
+      circuit breaker and takes a token from its rate limit bucket.
+    - max_retries (int): Overrides `TURNITIN_API_MAX_RETRIES`, e.g. 0 for a body that
+      cannot be sent again.
+    - kwargs: The arguments of the request.
+
+    Returns:
+    - Response: The response of the last attempt.
+
+    Raises:
+    - RequestException: If the last attempt could not reach Turnitin.
+    - TurnitinCircuitOpen: If the circuit of the endpoint family is open.
+    - TurnitinRateLimited: If no token of the rate limit bucket is available in time.
+    """
+    method_func = get_request_method_func(request_method)
+    if max_retries is None:
+        max_retries = getattr(settings, "TURNITIN_API_MAX_RETRIES", 3)
+    timeout = getattr(settings, "TURNITIN_API_TIMEOUT", 30)
+    if idempotent is None:
+        idempotent = request_method.lower() in IDEMPOTENT_METHODS
+    retry_method = request_method if idempotent else "post"
+    retry_budget.deposit()
+
+    attempt = 0
+    while True:
+        if bucket is not None:
+            # Wait for a token first, so a deferred call never takes a half-open probe.
+            acquire(bucket)
+            before_call(bucket)
+        started_at = time.monotonic()
+        failed = True
+        try:
+            response = method_func(url, timeout=timeout, **kwargs)
+            failed = is_failed_call(response.status_code, time.monotonic() - started_at)
+        except (requests.ConnectionError, requests.Timeout):
+            if not idempotent or attempt >= max_retries:
+                raise
+            delay = get_retry_delay(attempt)
+            if not retry_budget.withdraw():
+                raise
+        else:
+            if attempt >= max_retries or not is_retryable(retry_method, response.status_code):
+                return response
+            delay = get_retry_delay(attempt, response)
+            if delay is None or not retry_budget.withdraw():
+                return response
+        finally:
+            if bucket is not None:
+                record_call(bucket, failed=failed)
+
+        attempt += 1
+        log.info(f"Retrying {request_method.upper()} {url} in {delay:.2f} seconds (retry {attempt}/{max_retries}).")
+        time.sleep(delay)
+        if before_retry is not None:
+            before_retry()
+
 
 def get_request_method_func(request_method: str):
     """
-    Retrieve the appropriate request method function from the `requests` library
+    Retrieve the appropriate request method function from the pooled session
     based on the provided HTTP request method.
 
     Parameters:
     - request_method (str): The HTTP method as a string (e.g., 'GET', 'POST', 'PUT', 'PATCH', 'DELETE').
 
     Returns:
-    - function: The corresponding function from the `requests` library (e.g., requests.get, requests.post).
+    - function: The corresponding method of the pooled session (e.g., session.get, session.post).
 
     Raises:
     - ValueError: If the provided request_method is unsupported or not recognized.
     """
+    session = get_session()
     method_map = {
-        "get": requests.get,
-        "post": requests.post,
-        "put": requests.put,
-        "delete": requests.delete,
-        "patch": requests.patch,
+        "get": session.get,
+        "post": session.post,
+        "put": session.put,
+        "delete": session.delete,
+        "patch": session.patch,
     }
     method_func = method_map.get(request_method.lower())
     if not method_func:
@@ -40,24 +338,90 @@ def get_request_method_func(request_method: str):
     return method_func
 
 
+class SizedChunks:
+    """
+    An iterable of byte chunks of a known total length.
+
+    `requests` sends a body with a length in a `Content-Length` header, while any
+    other iterable is sent with chunked transfer encoding.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], length: int) -> None:
+        self.chunks = chunks
+        self.length = length
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self.chunks)
+
+    def __len__(self) -> int:
+        return self.length
+
+
+def get_upload_body(uploaded_file, content_length: Optional[int] = None) -> Tuple[object, Optional[Callable[[], None]]]:
+    """
+    Return the body of an upload and how to send it again.
+
+    Parameters:
+    - uploaded_file: A binary file, an object supporting the buffer protocol (e.g.
+      bytes or a memoryview), or an iterable of byte chunks.
+    - content_length (int): The size of an iterable of chunks, if known.
+
+    Returns:
+    - tuple: The body to send and a function that rewinds it before a retry, or
+      None if the body can only be sent once.
+    """
+    if hasattr(uploaded_file, "read"):
+        seekable = getattr(uploaded_file, "seekable", None)
+        if hasattr(uploaded_file, "seek") and (seekable is None or seekable()):
+            return uploaded_file, lambda: uploaded_file.seek(0)
+        return uploaded_file, None
+
+    try:
+        return memoryview(uploaded_file).cast("B"), lambda: None
+    except TypeError:
+        pass
+
+    if content_length is not None:
+        return SizedChunks(uploaded_file, content_length), None
+    return iter(uploaded_file), None
+
+
 def turnitin_api_handler(
     request_method: str,
     url_prefix: str = "",
     data: Optional[Dict] = None,
     is_upload: bool = False,
     uploaded_file=None,
+    file_name: Optional[str] = None,
+    content_length: Optional[int] = None,
 ):
     """
     Handles API requests to the Turnitin service.
 
+    Transient failures are retried by `send_request`. An upload is only retried if
+    its body can be sent again from the start. Every call goes through the circuit
+    breaker and takes a token from the rate limit bucket of its endpoint family.
+
     Parameters:
     - request_method (str): The HTTP method (e.g., 'GET', 'POST', 'PUT', 'PATCH', 'DELETE').
     - data (dict): The payload to be sent in the request. Use None for methods that don't require a payload.
     - url_prefix (str): The endpoint suffix for the API URL.
+    - uploaded_file: The content to upload, if `is_upload` is True. It can be a binary
+      file, an object supporting the buffer protocol or an iterable of byte chunks,
+      which is streamed without being copied.
+    - file_name (str): The name of the uploaded file, defaults to the name of the file object.
+    - content_length (int): The size of an iterable of chunks. If unknown, the upload
+      uses chunked transfer encoding.
 
     Returns:
     - Response: A requests.Response object containing the server's response to the request.
+
+    Raises:
+    - TurnitinCircuitOpen: If the call fails fast because Turnitin is unavailable.
+    - TurnitinRateLimited: If the call is deferred by the rate limiter.
+    - ValueError: If the name of the uploaded file is unknown.
     """
+    bucket = get_rate_limit_bucket(request_method, url_prefix, is_upload)
     headers = {
         "X-Turnitin-Integration-Name": TCA_INTEGRATION_FAMILY,
         "X-Turnitin-Integration-Version": TCA_INTEGRATION_VERSION,
@@ -68,18 +432,24 @@ def turnitin_api_handler(
         headers["Content-Type"] = "application/json"
 
     if is_upload:
+        file_name = file_name or getattr(uploaded_file, "name", None)
+        if not file_name:
+            raise ValueError("The name of the uploaded file is required.")
+
+        body, rewind = get_upload_body(uploaded_file, content_length)
         headers["Content-Type"] = "binary/octet-stream"
-        headers["Content-Disposition"] = f'inline; filename="{uploaded_file.name}"'
-        response = requests.put(
+        headers["Content-Disposition"] = f'inline; filename="{file_name}"'
+        response = send_request(
+            "put",
             f"{TII_API_URL}/api/v1/{url_prefix}",
+            before_retry=rewind,
+            bucket=bucket,
+            max_retries=None if rewind else 0,
             headers=headers,
-            data=uploaded_file,
-            timeout=settings.TURNITIN_API_TIMEOUT,
+            data=body,
         )
         return response
 
-    method_func = get_request_method_func(request_method)
-
     args = {
         "headers": headers,
         (
@@ -87,7 +457,7 @@ def turnitin_api_handler(
         ): data,
     }
 
-    response = method_func(f"{TII_API_URL}/api/v1/{url_prefix}", **args)
+    response = send_request(request_method, f"{TII_API_URL}/api/v1/{url_prefix}", bucket=bucket, **args)
 
     return response
 
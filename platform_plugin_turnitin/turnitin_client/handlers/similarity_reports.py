@@ -2,6 +2,13 @@
 Similarity reports handlers
 """
 
+from platform_plugin_turnitin.constants import SIMILARITY_REPORT_INFO
+from platform_plugin_turnitin.turnitin_client.response_cache import (
+    cached_response,
+    cached_viewer_url_response,
+    invalidate_cached_responses,
+)
+
 from .api_handler import turnitin_api_handler
 
 
@@ -12,6 +19,7 @@ def put_generate_similarity_report(submission_id, payload):
     response = turnitin_api_handler(
         "put", f"submissions/{submission_id}/similarity", payload
     )
+    invalidate_cached_responses(submission_id, [SIMILARITY_REPORT_INFO])
     return response
 
 
@@ -22,8 +30,14 @@ def get_similarity_report_info(submission_id):
     Status:
     - PROCESSING
     - COMPLETE
+
+    The response is served from the shared response cache while it is valid.
     """
-    response = turnitin_api_handler("get", f"submissions/{submission_id}/similarity")
+    response = cached_response(
+        SIMILARITY_REPORT_INFO,
+        submission_id,
+        lambda: turnitin_api_handler("get", f"submissions/{submission_id}/similarity"),
+    )
     return response
 
 
@@ -32,9 +46,16 @@ def post_create_viewer_launch_url(submission_id, payload):
     So that users can interact with the details of a submission and Similarity Report,
     Turnitin provides a purpose-built viewer to enable smooth interaction with the
     report details and submitted document.
+
+    The URL is reused for the same submission and payload until shortly before it
+    expires.
     """
-    response = turnitin_api_handler(
-        "post", f"submissions/{submission_id}/viewer-url", payload
+    response = cached_viewer_url_response(
+        submission_id,
+        payload,
+        lambda: turnitin_api_handler(
+            "post", f"submissions/{submission_id}/viewer-url", payload
+        ),
     )
     return response
 
@@ -2,6 +2,12 @@
 Submissions hanlders
 """
 
+from platform_plugin_turnitin.constants import SIMILARITY_REPORT_INFO, SUBMISSION_INFO
+from platform_plugin_turnitin.turnitin_client.response_cache import (
+    cached_response,
+    invalidate_cached_responses,
+)
+
 from .api_handler import turnitin_api_handler
 
 
@@ -15,16 +21,22 @@ def post_create_submission(payload):
     return response
 
 
-def put_upload_submission_file_content(submission_id, file):
+def put_upload_submission_file_content(submission_id, file, file_name=None, content_length=None):
     """
     Attaches a document to a student's submission.
+
+    The file can be a binary file, bytes, a memoryview or an iterable of byte chunks.
+    The file name defaults to the name of the file object.
     """
     response = turnitin_api_handler(
         "put",
         f"submissions/{submission_id}/original",
         is_upload=True,
         uploaded_file=file,
+        file_name=file_name,
+        content_length=content_length,
     )
+    invalidate_cached_responses(submission_id, [SUBMISSION_INFO])
     return response
 
 
@@ -38,8 +50,13 @@ def get_submission_info(submission_id):
         COMPLETE	Submission processing is complete
         ERROR	An error occurred during submission processing; see error_code for details
 
+    The response is served from the shared response cache while it is valid.
     """
-    response = turnitin_api_handler("get", f"submissions/{submission_id}")
+    response = cached_response(
+        SUBMISSION_INFO,
+        submission_id,
+        lambda: turnitin_api_handler("get", f"submissions/{submission_id}"),
+    )
     return response
 
 
@@ -51,6 +68,9 @@ def delete_submission(submission_id, is_hard_delete="false"):
     response = turnitin_api_handler(
         "delete", f"submissions/{submission_id}/?hard={is_hard_delete}"
     )
+    invalidate_cached_responses(
+        submission_id, [SUBMISSION_INFO, SIMILARITY_REPORT_INFO]
+    )
     return response
 
 
@@ -59,4 +79,7 @@ def put_recover_submission(submission_id):
     Recovers a submission that has been soft deleted
     """
     response = turnitin_api_handler("put", f"submissions/{submission_id}/recover")
+    invalidate_cached_responses(
+        submission_id, [SUBMISSION_INFO, SIMILARITY_REPORT_INFO]
+    )
     return response
@@ -0,0 +1,30 @@
+"""
+Webhooks handlers
+"""
+
+from .api_handler import turnitin_api_handler
+
+
+def post_create_webhook(payload):
+    """
+    Registers a webhook so Turnitin notifies the given URL when the events
+    listed in the payload happen, e.g. when a submission finishes processing.
+    """
+    response = turnitin_api_handler("post", "webhooks", payload)
+    return response
+
+
+def get_webhooks():
+    """
+    Lists all the webhooks registered for the Turnitin account.
+    """
+    response = turnitin_api_handler("get", "webhooks")
+    return response
+
+
+def delete_webhook(webhook_id):
+    """
+    Deletes a webhook by its ID.
+    """
+    response = turnitin_api_handler("delete", f"webhooks/{webhook_id}")
+    return response
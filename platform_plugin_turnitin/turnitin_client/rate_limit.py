@@ -0,0 +1,156 @@
+"""
+Cluster-wide rate limiter for the calls to the Turnitin API.
+
+The LMS and the Celery workers share one Turnitin account, so the tokens of each
+bucket are counted in the Django cache. Each bucket allows
+`TURNITIN_RATE_LIMITS[bucket]` tokens in any `TURNITIN_RATE_LIMIT_PERIOD` seconds.
+
+The limit is a sliding window: the tokens of the current period are added to the
+tokens of the previous period, weighted by the part of it still inside the window,
+so a burst at the end of a period and another at the start of the next one do not
+go through twice the limit. The tokens of each period are counted with an atomic
+cache increment, so no lock is needed.
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from platform_plugin_turnitin.constants import RATE_LIMIT_CACHE_KEY
+from platform_plugin_turnitin.turnitin_client.exceptions import TurnitinRateLimited
+
+_local = threading.local()
+
+
+def get_rate_limit_bucket(request_method: str, url_prefix: str, is_upload: bool = False) -> str:
+    """
+    Return the rate limit bucket of a call to the Turnitin API.
+
+    Parameters:
+    - request_method (str): The HTTP method of the call.
+    - url_prefix (str): The path of the endpoint.
+    - is_upload (bool): Whether the call uploads a file.
+
+    Returns:
+    - str: One of `upload`, `status`, `report` or `viewer`.
+    """
+    if "viewer-url" in url_prefix:
+        return "viewer"
+    if is_upload or (request_method.lower() == "post" and url_prefix.strip("/") == "submissions"):
+        return "upload"
+    if "similarity" in url_prefix:
+        return "report"
+    return "status"
+
+
+@contextmanager
+def rate_limit_max_wait(seconds: float) -> Iterator[None]:
+    """
+    Override the longest wait for a token of the calls made by the current thread.
+
+    Use 0 for callers that can defer the work, e.g. the poller, so they get a
+    `TurnitinRateLimited` right away instead of blocking.
+
+    Parameters:
+    - seconds (float): The longest wait in seconds.
+    """
+    previous = getattr(_local, "max_wait", None)
+    _local.max_wait = seconds
+    try:
+        yield
+    finally:
+        _local.max_wait = previous
+
+
+def get_max_wait() -> float:
+    """
+    Return the longest wait for a token of the calls made by the current thread.
+
+    Returns:
+    - float: The override of `rate_limit_max_wait`, or `TURNITIN_RATE_LIMIT_MAX_WAIT`.
+    """
+    max_wait = getattr(_local, "max_wait", None)
+    if max_wait is None:
+        max_wait = getattr(settings, "TURNITIN_RATE_LIMIT_MAX_WAIT", 5)
+    return max_wait
+
+
+def take_token(bucket: str, limit: int, period: int) -> Optional[float]:
+    """
+    Take a token from a bucket.
+
+    Parameters:
+    - bucket (str): The rate limit bucket.
+    - limit (int): The tokens of the bucket per sliding window.
+    - period (int): The seconds of the sliding window.
+
+    Returns:
+    - float: None if the token was taken, otherwise the seconds until one is available.
+    """
+    now = time.time()
+    window = int(now // period)
+    key = RATE_LIMIT_CACHE_KEY.format(bucket=bucket, window=window)
+    weight = 1 - (now - window * period) / period
+    previous = cache.get(RATE_LIMIT_CACHE_KEY.format(bucket=bucket, window=window - 1), 0)
+
+    cache.add(key, 0, period * 2)
+    try:
+        taken = cache.incr(key)
+    except ValueError:
+        # The counter was evicted between the add and the increment.
+        cache.add(key, 1, period * 2)
+        taken = 1
+
+    if previous * weight + taken <= limit:
+        return None
+
+    # Only the tokens taken are counted, so the deferred calls do not slow the next windows.
+    try:
+        cache.decr(key)
+    except ValueError:
+        pass
+
+    current = taken - 1
+    if current < limit:
+        # The previous period slides out of the window until a token is free.
+        free_at = window * period + period * (1 - (limit - current - 1) / previous)
+    else:
+        # The current period is full, wait until it slides out of the next window.
+        free_at = (window + 1) * period + period * (1 - (limit - 1) / current)
+    return max(0.0, free_at - now)
+
+
+def acquire(bucket: str, max_wait: Optional[float] = None) -> None:
+    """
+    Take a token from a bucket, waiting for one to be available if needed.
+
+    Buckets without a limit in `TURNITIN_RATE_LIMITS` are not limited.
+
+    Parameters:
+    - bucket (str): The rate limit bucket.
+    - max_wait (float): The longest wait in seconds, defaults to `get_max_wait()`.
+
+    Raises:
+    - TurnitinRateLimited: If no token is available within `max_wait` seconds.
+    """
+    limit = getattr(settings, "TURNITIN_RATE_LIMITS", {}).get(bucket)
+    if not limit:
+        return
+
+    period = getattr(settings, "TURNITIN_RATE_LIMIT_PERIOD", 60)
+    if max_wait is None:
+        max_wait = get_max_wait()
+
+    waited = 0.0
+    while (retry_after := take_token(bucket, limit, period)) is not None:
+        # Spread the waiting callers so they do not all hit the next period at once.
+        delay = retry_after + random.uniform(0, min(1, period / 10))
+        if waited + delay > max_wait:
+            raise TurnitinRateLimited(bucket, retry_after)
+        time.sleep(delay)
+        waited += delay
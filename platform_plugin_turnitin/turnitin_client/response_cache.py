@@ -0,0 +1,259 @@
+"""
+Shared cache of the responses of the Turnitin status endpoints.
+
+Several staff members viewing the same learner send the same status requests to
+Turnitin. The successful responses of the endpoints listed in
+`TURNITIN_RESPONSE_CACHE_TIMEOUTS` are kept in the Django cache set in
+`TURNITIN_RESPONSE_CACHE_ALIAS`, shared by all the LMS and Celery workers, for the
+seconds configured for each endpoint.
+
+The entries of a submission are invalidated when the plugin changes it in Turnitin
+or is notified of a change. Each invalidation moves the submission to a new
+generation, so a response fetched before the change is never stored for it.
+
+The hits and misses of each endpoint are counted only when
+`TURNITIN_RESPONSE_CACHE_STATS` is enabled, since every count is one more round
+trip to the cache. The counters expire a day after they are started.
+
+The viewer launch URLs are cached per submission and payload, which includes the
+viewer user and the permissions, until `TURNITIN_VIEWER_URL_EXPIRY_MARGIN` seconds
+before they expire. Concurrent requests for the same URL wait briefly for the
+first one instead of calling Turnitin again.
+"""
+
+import hashlib
+import json
+import time
+from typing import Callable, Dict, Iterable, List
+from uuid import uuid4
+
+import requests
+from django.conf import settings
+from django.core.cache import caches
+from requests.structures import CaseInsensitiveDict
+
+from platform_plugin_turnitin.constants import (
+    RESPONSE_CACHE_GENERATION_TIMEOUT,
+    RESPONSE_CACHE_KEY,
+    RESPONSE_CACHE_STATS_KEY,
+    RESPONSE_CACHE_STATS_TIMEOUT,
+    VIEWER_URL,
+    VIEWER_URL_CACHE_KEY,
+    VIEWER_URL_LOCK_POLL_INTERVAL,
+    VIEWER_URL_LOCK_WAIT,
+)
+
+
+def get_response_cache():
+    """
+    Return the Django cache where the responses are stored.
+
+    Returns:
+    - BaseCache: The cache named by `TURNITIN_RESPONSE_CACHE_ALIAS`.
+    """
+    return caches[getattr(settings, "TURNITIN_RESPONSE_CACHE_ALIAS", "default")]
+
+
+def get_response_cache_timeout(endpoint: str) -> int:
+    """
+    Return the seconds the responses of an endpoint are cached.
+
+    Parameters:
+    - endpoint (str): The cached endpoint, e.g. `submission_info`.
+
+    Returns:
+    - int: The timeout in `TURNITIN_RESPONSE_CACHE_TIMEOUTS`, or 0 if not cached.
+    """
+    return getattr(settings, "TURNITIN_RESPONSE_CACHE_TIMEOUTS", {}).get(endpoint, 0)
+
+
+def get_viewer_url_cache_timeout() -> int:
+    """
+    Return the seconds a viewer launch URL is reused.
+
+    Returns:
+    - int: `TURNITIN_VIEWER_URL_EXPIRY` minus `TURNITIN_VIEWER_URL_EXPIRY_MARGIN`, or 0
+      if the URLs are not cached.
+    """
+    expiry = getattr(settings, "TURNITIN_VIEWER_URL_EXPIRY", 0)
+    return max(0, expiry - getattr(settings, "TURNITIN_VIEWER_URL_EXPIRY_MARGIN", 10))
+
+
+def _cached_endpoints() -> List[str]:
+    endpoints = list(getattr(settings, "TURNITIN_RESPONSE_CACHE_TIMEOUTS", {}))
+    if get_viewer_url_cache_timeout():
+        endpoints.append(VIEWER_URL)
+    return endpoints
+
+
+def _generation_key(endpoint: str, submission_id: str) -> str:
+    return RESPONSE_CACHE_KEY.format(endpoint=endpoint, submission_id=submission_id, name="generation")
+
+
+def _incr(cache, key: str) -> None:
+    if not getattr(settings, "TURNITIN_RESPONSE_CACHE_STATS", False):
+        return
+
+    cache.add(key, 0, RESPONSE_CACHE_STATS_TIMEOUT)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # The counter was evicted between the add and the increment.
+        cache.add(key, 1, RESPONSE_CACHE_STATS_TIMEOUT)
+
+
+def _serialize(response: requests.Response) -> dict:
+    return {
+        "status_code": response.status_code,
+        "headers": dict(response.headers),
+        "content": response.content,
+        "url": response.url,
+        "encoding": response.encoding,
+    }
+
+
+def _deserialize(stored: dict) -> requests.Response:
+    response = requests.Response()
+    response.status_code = stored["status_code"]
+    response.headers = CaseInsensitiveDict(stored["headers"])
+    response._content = stored["content"]  # pylint: disable=protected-access
+    response.url = stored["url"]
+    response.encoding = stored["encoding"]
+    return response
+
+
+def cached_response(endpoint: str, submission_id: str, send: Callable[[], requests.Response]) -> requests.Response:
+    """
+    Return the cached response of an endpoint for a submission, or send the request.
+
+    Only successful responses are stored, so errors are always retried.
+
+    Parameters:
+    - endpoint (str): The cached endpoint, e.g. `submission_info`.
+    - submission_id (str): The unique identifier for the submission in Turnitin.
+    - send (callable): Sends the request to Turnitin.
+
+    Returns:
+    - Response: The cached response or the response of the request.
+    """
+    timeout = get_response_cache_timeout(endpoint)
+    if not timeout:
+        return send()
+
+    cache = get_response_cache()
+    generation = cache.get(_generation_key(endpoint, submission_id), "")
+    key = RESPONSE_CACHE_KEY.format(endpoint=endpoint, submission_id=submission_id, name=f"response:{generation}")
+
+    stored = cache.get(key)
+    if stored is not None:
+        _incr(cache, RESPONSE_CACHE_STATS_KEY.format(endpoint=endpoint, name="hits"))
+        return _deserialize(stored)
+
+    _incr(cache, RESPONSE_CACHE_STATS_KEY.format(endpoint=endpoint, name="misses"))
+    response = send()
+    if response.status_code == 200:
+        cache.set(key, _serialize(response), timeout)
+    return response
+
+
+def cached_viewer_url_response(
+    submission_id: str, payload: dict, send: Callable[[], requests.Response]
+) -> requests.Response:
+    """
+    Return the cached viewer launch URL of a submission for a payload, or send the request.
+
+    Only one of the concurrent callers for the same key sends the request, while the
+    others wait for its response, at most `VIEWER_URL_LOCK_WAIT` seconds so a slow
+    Turnitin call does not hold the request threads. A caller that is still waiting
+    after that sends the request itself, without the lock.
+
+    Parameters:
+    - submission_id (str): The unique identifier for the submission in Turnitin.
+    - payload (dict): The payload of the viewer launch URL request.
+    - send (callable): Sends the request to Turnitin.
+
+    Returns:
+    - Response: The cached response or the response of the request.
+    """
+    timeout = get_viewer_url_cache_timeout()
+    if not timeout:
+        return send()
+
+    cache = get_response_cache()
+    digest = hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+    key = VIEWER_URL_CACHE_KEY.format(submission_id=submission_id, digest=digest)
+    lock_key = f"{key}:lock"
+    lock_timeout = getattr(settings, "TURNITIN_API_TIMEOUT", 30)
+
+    deadline = time.monotonic() + VIEWER_URL_LOCK_WAIT
+    locked = False
+    stored = cache.get(key)
+    while stored is None:
+        locked = cache.add(lock_key, True, lock_timeout)
+        if locked or time.monotonic() >= deadline:
+            # Another caller may have stored the URL before releasing the lock.
+            stored = cache.get(key)
+            break
+        time.sleep(VIEWER_URL_LOCK_POLL_INTERVAL)
+        stored = cache.get(key)
+
+    if stored is not None:
+        if locked:
+            cache.delete(lock_key)
+        _incr(cache, RESPONSE_CACHE_STATS_KEY.format(endpoint=VIEWER_URL, name="hits"))
+        return _deserialize(stored)
+
+    _incr(cache, RESPONSE_CACHE_STATS_KEY.format(endpoint=VIEWER_URL, name="misses"))
+    try:
+        response = send()
+        if response.ok:
+            cache.set(key, _serialize(response), timeout)
+    finally:
+        if locked:
+            cache.delete(lock_key)
+    return response
+
+
+def invalidate_cached_responses(submission_id: str, endpoints: Iterable[str]) -> None:
+    """
+    Drop the cached responses of some endpoints for a submission.
+
+    Parameters:
+    - submission_id (str): The unique identifier for the submission in Turnitin.
+    - endpoints (iterable): The endpoints whose responses are no longer valid.
+    """
+    cache = get_response_cache()
+    for endpoint in endpoints:
+        if get_response_cache_timeout(endpoint):
+            cache.set(_generation_key(endpoint, submission_id), uuid4().hex, RESPONSE_CACHE_GENERATION_TIMEOUT)
+
+
+def get_response_cache_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Return the hits and misses of the response cache, shared by all the workers.
+
+    The counters stay at zero unless `TURNITIN_RESPONSE_CACHE_STATS` is enabled.
+
+    Returns:
+    - dict: The `hits` and `misses` counted for each cached endpoint.
+    """
+    cache = get_response_cache()
+    stats = {}
+    for endpoint in _cached_endpoints():
+        keys = {name: RESPONSE_CACHE_STATS_KEY.format(endpoint=endpoint, name=name) for name in ("hits", "misses")}
+        values = cache.get_many(keys.values())
+        stats[endpoint] = {name: values.get(key, 0) for name, key in keys.items()}
+    return stats
+
+
+def reset_response_cache_stats() -> None:
+    """
+    Set the hits and misses of every cached endpoint back to zero.
+    """
+    get_response_cache().delete_many(
+        [
+            RESPONSE_CACHE_STATS_KEY.format(endpoint=endpoint, name=name)
+            for endpoint in _cached_endpoints()
+            for name in ("hits", "misses")
+        ]
+    )
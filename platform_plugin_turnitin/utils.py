@@ -1,7 +1,9 @@
 """Utility functions for the Turnitin platform plugin."""
 
 from datetime import datetime, timezone
+from typing import Optional
 
+from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import UsageKey
 
 from platform_plugin_turnitin.edxapp_wrapper.modulestore import modulestore
@@ -34,3 +36,26 @@ def enabled_in_course(block_id: str) -> bool:
     course_key = UsageKey.from_string(block_id).course_key
     course_block = modulestore().get_course(course_key)
     return course_block.other_course_settings.get("ENABLE_TURNITIN_SUBMISSION", False)
+
+
+def get_course_id(block_id: Optional[str]) -> Optional[str]:
+    """
+    Return the key of the course of a block.
+
+    Example:
+        >>> get_course_id("block-v1:edX+DemoX+Demo_Course+type@openassessment+block@ora")
+        'course-v1:edX+DemoX+Demo_Course'
+
+    Args:
+        block_id (str, optional): The block ID.
+
+    Returns:
+        Optional[str]: The course key, or None if the block ID is missing or not valid.
+    """
+    if not block_id:
+        return None
+
+    try:
+        return str(UsageKey.from_string(block_id).course_key)
+    except InvalidKeyError:
+        return None
@@ -0,0 +1,122 @@
+"""Turnitin webhooks integration for the Turnitin plugin."""
+
+import base64
+import hashlib
+import hmac
+from logging import getLogger
+from typing import Optional
+
+from django.conf import settings
+from requests import Response as RequestsResponse
+
+from platform_plugin_turnitin.constants import SIMILARITY_REPORT_INFO, SUBMISSION_INFO, WEBHOOK_EVENT_TYPES
+from platform_plugin_turnitin.pipeline import (
+    request_similarity_report,
+    update_similarity_report_info,
+    update_submission_status,
+)
+from platform_plugin_turnitin.turnitin_client.handlers import get_webhooks, post_create_webhook
+from platform_plugin_turnitin.turnitin_client.response_cache import invalidate_cached_responses
+
+log = getLogger(__name__)
+
+
+def webhooks_enabled() -> bool:
+    """
+    Check if the Turnitin webhooks are configured.
+
+    Returns:
+        bool: True if a signing secret is configured, False otherwise.
+    """
+    return bool(getattr(settings, "TURNITIN_WEBHOOK_SIGNING_SECRET", None))
+
+
+def verify_webhook_signature(body: bytes, signature: Optional[str]) -> bool:
+    """
+    Verify that a webhook request was signed by Turnitin.
+
+    Turnitin signs the raw request body with HMAC-SHA256 using the secret provided
+    when the webhook was registered, and sends the hex digest in the
+    `X-Turnitin-Signature` header.
+
+    Args:
+        body (bytes): The raw body of the request.
+        signature (str): The value of the `X-Turnitin-Signature` header.
+
+    Returns:
+        bool: True if the signature is valid, False otherwise.
+    """
+    if not webhooks_enabled() or not signature:
+        return False
+
+    secret = settings.TURNITIN_WEBHOOK_SIGNING_SECRET.encode("utf-8")
+    expected_signature = hmac.new(secret, body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected_signature, signature)
+
+
+def register_webhook(url: str) -> Optional[RequestsResponse]:
+    """
+    Register the webhook receiver of the plugin in Turnitin.
+
+    Nothing is done if a webhook is already registered for the same URL.
+
+    Args:
+        url (str): The absolute URL of the webhook receiver.
+
+    Returns:
+        Optional[RequestsResponse]: The response from Turnitin, or None if the
+            webhook was already registered.
+    """
+    webhooks_response = get_webhooks()
+    if webhooks_response.ok and any(webhook.get("url") == url for webhook in webhooks_response.json()):
+        log.info(f"A Turnitin webhook is already registered for [{url}].")
+        return None
+
+    secret = settings.TURNITIN_WEBHOOK_SIGNING_SECRET.encode("utf-8")
+    payload = {
+        "url": url,
+        "signing_secret": base64.b64encode(secret).decode("utf-8"),
+        "event_types": WEBHOOK_EVENT_TYPES,
+        "description": "Open edX Turnitin plugin",
+        "allow_insecure": False,
+    }
+    return post_create_webhook(payload)
+
+
+def process_webhook_event(event_type: str, payload: dict) -> None:
+    """
+    Advance the Turnitin pipeline from a webhook event.
+
+    Args:
+        event_type (str): The type of the event, e.g. SUBMISSION_COMPLETE.
+        payload (dict): The body of the webhook request.
+    """
+    if event_type == "SUBMISSION_COMPLETE":
+        process_submission_complete(payload)
+    elif event_type == "SIMILARITY_COMPLETE":
+        log.info(f"Similarity report for Turnitin submission [{payload.get('submission_id')}] is complete.")
+        invalidate_cached_responses(payload.get("submission_id"), [SIMILARITY_REPORT_INFO])
+        update_similarity_report_info(payload.get("submission_id"), payload)
+    else:
+        log.info(f"Ignoring unsupported Turnitin webhook event [{event_type}].")
+
+
+def process_submission_complete(payload: dict) -> None:
+    """
+    Store the status of a submission that finished processing and request its similarity report.
+
+    Args:
+        payload (dict): The submission information sent by Turnitin.
+    """
+    turnitin_submission_id = payload.get("id")
+    invalidate_cached_responses(turnitin_submission_id, [SUBMISSION_INFO])
+
+    if not update_submission_status(turnitin_submission_id, payload):
+        log.info(f"Turnitin submission [{turnitin_submission_id}] is unknown or was already processed.")
+        return
+
+    if payload.get("status") != "COMPLETE":
+        log.info(f"Turnitin submission [{turnitin_submission_id}] finished with status [{payload.get('status')}].")
+        return
+
+    request_similarity_report(turnitin_submission_id)
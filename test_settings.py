@@ -72,4 +72,5 @@ PLATFORM_PLUGIN_TURNITIN_COURSE_OVERVIEWS_BACKEND = (
     "platform_plugin_turnitin.edxapp_wrapper.backends.course_overviews_q_v1_test"
 )
 PLATFORM_PLUGIN_TURNITIN_MODULESTORE_BACKEND = "platform_plugin_turnitin.edxapp_wrapper.backends.modulestore_q_v1_test"
+PLATFORM_PLUGIN_TURNITIN_SUBMISSIONS_BACKEND = "platform_plugin_turnitin.edxapp_wrapper.backends.submissions_q_v1_test"
 TURNITIN_SIMILARITY_REPORT_PAYLOAD = {"test_key": "test_value"}